@@ -58,6 +58,9 @@ echo Card Databases aktualisiert. Starte alle anderen parallel...
 echo ============================================================
 echo.
 
+REM One pipeline run id: pages downloaded by one scraper are shared with the others
+set HAUSI_RUN_ID=run-%RANDOM%%RANDOM%%RANDOM%
+
 REM Start all scrapers with unique process names
 start "1-City-Archetype" "dist\city_league_archetype_scraper.exe"
 start "2-Limitless-Online" "dist\limitless_online_scraper.exe"
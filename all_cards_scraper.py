@@ -16,6 +16,10 @@ from datetime import datetime
 from typing import List, Dict, Optional
 from urllib.parse import urljoin
 
+from browser_pool import create_browser
+from card_enrichment import ALL_FIELDS, CardEnrichment
+from limitless_hosts import limitless_url
+
 # Fix Windows console encoding for Unicode characters (✓, •, etc.)
 if sys.platform == 'win32':
     if hasattr(sys.stdout, 'reconfigure'):
@@ -35,9 +39,7 @@ print("=" * 80)
 print()
 
 try:
-    from selenium import webdriver
     from selenium.webdriver.common.by import By
-    from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     SELENIUM_AVAILABLE = True
@@ -57,7 +59,14 @@ DEFAULT_SETTINGS = {
     "skip_detail_scraping": False,  # True = only scrape list (fast), False = scrape details too
     "list_page_delay_seconds": 1.0,
     "detail_page_wait_seconds": 2.0,
-    "detail_request_delay_seconds": 0.5
+    "detail_request_delay_seconds": 0.5,
+    "detail_fetch_mode": "http",  # "http" = plain GET + HTML parsing (Selenium only as fallback), "selenium" = Chrome only
+    "max_parallel_requests": 4,  # HTTP detail mode
+    "requests_per_second": 2.0,
+    "max_requests_per_second": 4.0,
+    "browser_workers": 2,  # Parallel Chrome instances for Selenium detail pages
+    "browser_page_budget": 1000,  # Pages per browser before it is restarted
+    "lean_browser": True  # Chrome without images / fonts / media / trackers, eager page load
 }
 
 
@@ -122,15 +131,7 @@ def scrape_all_cards_list(settings: Dict[str, object], start_page: int = 1, exis
     """Scrape card names and basic info from the Limitless TCG card list."""
     print("[All Cards Scraper] Starting Selenium WebDriver...")
     
-    chrome_options = Options()
-    if settings.get("headless", True):
-        chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    driver = webdriver.Chrome(options=chrome_options)
+    driver = create_browser(settings.get("headless", True), lean=bool(settings.get("lean_browser", True)))
     all_cards_data = []
     if existing_keys is None:
         existing_keys = set()
@@ -174,7 +175,7 @@ def scrape_all_cards_list(settings: Dict[str, object], start_page: int = 1, exis
             seen_pages.add(next_url)
 
             print(f"[All Cards Scraper] Loading page {page_index}: {next_url}")
-            driver.get(next_url)
+            driver.get(limitless_url(next_url))
 
             # Wait for table rows to appear
             try:
@@ -379,34 +380,34 @@ def load_existing_cards(csv_path: str, rescrape_incomplete: bool = True) -> (Lis
     return complete_cards, existing_keys, incomplete_cards
 
 
+def log_card_details(card: Dict[str, str]):
+    prints = card.get('international_prints', '').split(',')
+    if len(prints) > 1:
+        print(f"   → Found {len(prints)} int. prints: {', '.join(prints[:4])}{'...' if len(prints) > 4 else ''}")
+    else:
+        print(f"   ℹ Single print: {card['name']}")
+    if card.get('cardmarket_url'):
+        print(f"   ✓ Cardmarket link found")
+
+
 def scrape_card_details(settings: Dict[str, object], cards: List[Dict[str, str]], 
                         existing_cards: List[Dict[str, str]], csv_path: str, append_mode: bool) -> List[Dict[str, str]]:
-    """Scrape detail page for each card to get image URL and rarity.
+    """Scrape detail page for each card to get image URL, rarity, int. prints and Cardmarket link.
+    
+    One visit per card page (card_enrichment.CardEnrichment with every field): the EUR price
+    of the same page goes to price_data.csv (price_source 'limitless'). card_price_scraper doesn't
+    open the Limitless page again; with cardmarket_first it rechecks the price on Cardmarket.
+    detail_fetch_mode "http" (default): plain GET + HTML parsing, Chrome (browser pool) only for
+    pages that fail to parse; "selenium": every page in Chrome.
     
     Writes CSV progressively every 100 cards so other tools can use updated data while scraping continues.
-    Browser is restarted every 1000 cards to prevent session timeout issues.
     """
     print(f"\n[All Cards Scraper] Now scraping detail pages for {len(cards)} cards...")
-    print("[All Cards Scraper] This may take a while - opening ~1 page per card...")
     print("[All Cards Scraper] CSV will be updated every 100 cards with latest details...")
-    print("[All Cards Scraper] Browser will restart every 1000 cards to prevent session issues...")
-    
-    def create_browser():
-        """Create a new Chrome browser instance with standard settings."""
-        chrome_options = Options()
-        if settings.get("headless", True):
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        return webdriver.Chrome(options=chrome_options)
-    
-    driver = create_browser()
-    restart_counter = 0  # Track cards processed since last restart
     
     def write_csv_batch():
         """Write all cards (existing + new with current details) to CSV with deduplication."""
+        print(f"[All Cards Scraper] UPDATING CSV: Writing current progress to {csv_path}...")
         all_data = (existing_cards + cards) if append_mode else cards
         
         # Deduplicate by unique key (name::set::number) before writing
@@ -433,227 +434,31 @@ def scrape_card_details(settings: Dict[str, object], cards: List[Dict[str, str]]
                     'international_prints': card.get('international_prints', ''),
                     'cardmarket_url': card.get('cardmarket_url', '')
                 })
+        print(f"[All Cards Scraper] CSV updated! Other tools can now use the cards with details.")
     
-    try:
-        for idx, card in enumerate(cards):
-            try:
-                if not card.get('card_url'):
-                    # Skip cards without URL
-                    continue
-                
-                # Browser restart every 1000 cards to prevent session timeout
-                if restart_counter >= 1000:
-                    print(f"\n[All Cards Scraper] BROWSER RESTART: Processed {restart_counter} cards, restarting browser...")
-                    try:
-                        driver.quit()
-                    except:
-                        pass
-                    driver = create_browser()
-                    restart_counter = 0
-                    print("[All Cards Scraper] Browser restarted successfully!")
-                
-                # Build full URL if relative
-                if card['card_url'].startswith('/'):
-                    full_url = f"https://limitlesstcg.com{card['card_url']}"
-                else:
-                    full_url = card['card_url']
-                
-                print(f"[All Cards Scraper] [{idx+1}/{len(cards)}] {card['name']} ({card['set']} {card['number']})...")
-                
-                # Try to load the page with session recovery
-                max_retries = 3
-                for retry in range(max_retries):
-                    try:
-                        driver.get(full_url)
-                        break  # Success, exit retry loop
-                    except Exception as e:
-                        error_msg = str(e).lower()
-                        
-                        # Handle network errors (DNS resolution, connection errors)
-                        if 'err_name_not_resolved' in error_msg or 'err_connection' in error_msg or 'network' in error_msg:
-                            print(f"[All Cards Scraper] NETWORK ERROR: Cannot reach server")
-                            if retry < max_retries - 1:
-                                wait_time = 10 * (retry + 1)  # Increase wait time with each retry
-                                print(f"   ⏸ Waiting {wait_time} seconds before retry {retry+1}/{max_retries}...")
-                                time.sleep(wait_time)
-                            else:
-                                print(f"[All Cards Scraper] NETWORK FAILED after {max_retries} retries")
-                                print(f"   ⚠ Skipping card: {card['name']}")
-                                raise
-                        
-                        # Handle session errors (browser crashes, session timeouts)
-                        elif 'invalid session id' in error_msg or 'session' in error_msg:
-                            print(f"[All Cards Scraper] SESSION ERROR detected: {e}")
-                            if retry < max_retries - 1:
-                                print(f"[All Cards Scraper] RECOVERING: Restarting browser (retry {retry+1}/{max_retries})...")
-                                try:
-                                    driver.quit()
-                                except:
-                                    pass
-                                driver = create_browser()
-                                restart_counter = 0
-                                time.sleep(2)  # Wait a bit before retrying
-                            else:
-                                print(f"[All Cards Scraper] FAILED after {max_retries} retries, skipping card")
-                                raise
-                        else:
-                            raise  # Re-raise if it's not a known recoverable error
-                
-                # Wait for image to load
-                time.sleep(float(settings.get("detail_page_wait_seconds", 2.0)))
-                
-                # Extract image URL from <img class="card shadow resp-w">
-                try:
-                    img_elem = driver.find_element(By.CSS_SELECTOR, "img.card.shadow.resp-w")
-                    image_url = img_elem.get_attribute('src')
-                    if image_url:
-                        card['image_url'] = image_url
-                except:
-                    pass
-                
-                # Extract rarity from card-prints div
-                try:
-                    # Look for rarity in the prints section
-                    rarity_elem = driver.find_element(By.CSS_SELECTOR, ".card-prints-current .prints-current-details span.text-lg")
-                    rarity_text = rarity_elem.get_attribute('textContent').strip()
-                    # Try to find rarity in second span
-                    rarity_spans = driver.find_elements(By.CSS_SELECTOR, ".card-prints-current .prints-current-details span")
-                    if len(rarity_spans) >= 2:
-                        rarity_info = rarity_spans[1].get_attribute('textContent').strip()
-                        # Extract rarity from format like "· Double Rare"
-                        if '·' in rarity_info:
-                            rarity = rarity_info.split('·')[1].strip()
-                            card['rarity'] = rarity
-                except:
-                    pass
-                
-                # For Promo sets: If rarity is empty, set it to "Promo"
-                # This makes Promo cards easier to track and fixes threshold logic in frontend
-                PROMO_SETS = ['MEP', 'SVP', 'SP', 'SMP', 'XYP', 'BWP', 'HSP', 'DPP', 'NP', 'WP', 
-                              'POP', 'SWSH', 'SWSHP', 'PR-SW', 'PR-SM', 'PR-XY', 'PR-BLW', 'PR-HS', 'PR-DP']
-                if card['set'] in PROMO_SETS and not card.get('rarity'):
-                    card['rarity'] = 'Promo'
-                
-                # Extract International Prints + Cardmarket Link from the prints table
-                # HTML structure: <table class="card-prints-versions"> with rows containing card links and prices
-                try:
-                    int_prints = set()
-                    cardmarket_url = ''
-                    
-                    # Find the card-prints-versions table
-                    try:
-                        table = driver.find_element(By.CSS_SELECTOR, "table.card-prints-versions")
-                        
-                        # Get all rows in the table body
-                        rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
-                        
-                        for row in rows:
-                            # Skip header row
-                            if row.find_elements(By.TAG_NAME, "th"):
-                                continue
-                            
-                            # Extract Int. Print from first column (td with <a href="/cards/SET/NUM">)
-                            try:
-                                first_td = row.find_element(By.CSS_SELECTOR, "td:first-child")
-                                card_link = first_td.find_element(By.CSS_SELECTOR, "a[href*='/cards/']")
-                                href = card_link.get_attribute('href')
-                                
-                                if href and '/cards/' in href:
-                                    # Extract SET/NUM from URL
-                                    # URLs can be: /cards/SET/NUM or /cards/en/SET/NUM (with language prefix)
-                                    path = href.split('/cards/')[-1].strip()
-                                    parts = path.split('/')
-                                    
-                                    # Remove language prefix (en, de, fr, etc.) if present
-                                    if len(parts) >= 3 and parts[0].lower() in ['en', 'de', 'fr', 'es', 'it', 'pt', 'ja', 'ko']:
-                                        # Format: /cards/en/SET/NUM
-                                        set_code = parts[1].upper()
-                                        set_num = parts[2]
-                                    elif len(parts) >= 2:
-                                        # Format: /cards/SET/NUM
-                                        set_code = parts[0].upper()
-                                        set_num = parts[1]
-                                    else:
-                                        continue
-                                    
-                                    # Skip Japanese sets
-                                    if set_code != 'JP':
-                                        card_id = f"{set_code}-{set_num}"
-                                        int_prints.add(card_id)
-                            except:
-                                pass  # Row might not have card link (could be current card without href)
-                            
-                            # Extract Cardmarket URL from current card's row (class="current")
-                            try:
-                                if 'current' in row.get_attribute('class'):
-                                    # Find EUR price column (third td) with Cardmarket link
-                                    eur_link = row.find_element(By.CSS_SELECTOR, "a.card-price.eur")
-                                    cardmarket_url = eur_link.get_attribute('href') or ''
-                            except:
-                                pass
-                        
-                        # Always add current card's ID to int_prints
-                        current_id = f"{card['set']}-{card['number']}"
-                        int_prints.add(current_id)
-                        
-                        # Store results
-                        card['international_prints'] = ','.join(sorted(list(int_prints)))
-                        card['cardmarket_url'] = cardmarket_url
-                        
-                        if len(int_prints) > 1:
-                            print(f"   → Found {len(int_prints)} int. prints: {', '.join(sorted(list(int_prints))[:4])}{'...' if len(int_prints) > 4 else ''}")
-                        else:
-                            print(f"   ℹ Single print: {card['name']}")
-                        
-                        if cardmarket_url:
-                            print(f"   ✓ Cardmarket link found")
-                        
-                    except Exception as e:
-                        # Fallback: use own ID if table not found
-                        card['international_prints'] = f"{card['set']}-{card['number']}"
-                        card['cardmarket_url'] = ''
-                        
-                        # Check for network errors (critical)
-                        error_str = str(e)
-                        if 'ERR_NAME_NOT_RESOLVED' in error_str or 'ERR_CONNECTION' in error_str:
-                            print(f"   ⚠ NETWORK ERROR: {error_str.split('Stacktrace')[0].strip()}")
-                            print(f"   ⏸ Pausing for 10 seconds before retry...")
-                            time.sleep(10)
-                        elif 'no such element' in error_str and 'card-prints-versions' in error_str:
-                            # Table not found - normal for single-print cards
-                            print(f"   ℹ No int. prints table (single print)")
-                        else:
-                            # Other errors
-                            print(f"   ⚠ Could not extract prints: {error_str.split('Stacktrace')[0].strip()[:100]}")
-                    
-                except Exception as e:
-                    # Final fallback
-                    card['international_prints'] = f"{card['set']}-{card['number']}"
-                    card['cardmarket_url'] = ''
-                    error_str = str(e)
-                    print(f"   ERROR: {error_str.split('Stacktrace')[0].strip()[:150]}")
-                
-                # Be nice to the server - small delay between requests
-                time.sleep(float(settings.get("detail_request_delay_seconds", 0.5)))
-                
-                restart_counter += 1  # Increment counter for browser restart logic
-                
-                # Progressive CSV update every 100 cards
-                if (idx + 1) % 100 == 0:
-                    print(f"[All Cards Scraper] OK: Completed {idx + 1} detail pages")
-                    print(f"[All Cards Scraper] UPDATING CSV: Writing current progress to {csv_path}...")
-                    write_csv_batch()
-                    print(f"[All Cards Scraper] CSV updated! Other tools can now use {idx + 1} cards with details.")
-                
-            except Exception as e:
-                print(f"[All Cards Scraper] ERROR scraping {card['name']}: {e}")
-                continue
+    price_csv = os.path.join(os.path.dirname(csv_path), 'price_data.csv')
+    enrichment = CardEnrichment(settings, fields=ALL_FIELDS, price_csv=price_csv, log_prefix="[All Cards Scraper]")
+    todo = sum(1 for card in cards if card.get('card_url'))
+    done = 0
+    started = time.time()
+    for item in enrichment.run(card for card in cards if card.get('card_url')):
+        done += 1
+        card = item.card
+        print(f"[All Cards Scraper] [{done}/{todo}] {card['name']} ({card['set']} {card['number']})")
+        if item.ok:
+            log_card_details(card)
+        else:
+            print(f"   ⚠ Could not extract details: {item.error}")
+        
+        # Progressive CSV update every 100 cards (card DB + prices of the same pages)
+        if done % 100 == 0:
+            elapsed = time.time() - started
+            print(f"[All Cards Scraper] OK: Completed {done} detail pages ({done / elapsed * 60:.0f} cards/min)")
+            write_csv_batch()
+            enrichment.save_prices()
     
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
+    enrichment.save_prices()
+    print(f"[All Cards Scraper] Detail pages: {enrichment.summary()}")
     
     # Count how many got image URLs
     cards_with_images = sum(1 for c in cards if c.get('image_url'))
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Card Database Benchmark
+=======================
+Measures CardDatabaseLookup performance on the shipped data/ CSVs - no network.
+
+Decks are rebuilt from data/current_meta_card_data.csv (archetype + card counts),
+so aggregate_card_data sees the same card mix a real Limitless run produces.
+
+Usage:
+    python benchmark_card_db.py                # default: 500 decks
+    python benchmark_card_db.py --decks 2000   # bigger aggregation workload
+    python benchmark_card_db.py --memory-only  # only the startup + memory report
+"""
+
+import argparse
+import contextlib
+import copy
+import csv
+import io
+import os
+import gc
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+
+# Fix Windows console encoding for Unicode characters
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except AttributeError:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+from card_scraper_shared import CardDatabaseLookup, aggregate_card_data, get_data_dir
+from card_data_manager import CardDataManager, SQLITE_FLAG, REBUILD_FLAG
+
+
+# ============================================================================
+# WORKLOAD
+# ============================================================================
+
+def load_benchmark_decks(max_decks: int = 500) -> List[Dict[str, Any]]:
+    """Rebuild up to max_decks deck dicts (as produced by the scrapers) from current_meta_card_data.csv."""
+    csv_path = os.path.join(get_data_dir(), 'current_meta_card_data.csv')
+    archetypes = defaultdict(lambda: {'total_decks': 0, 'cards': []})
+
+    with open(csv_path, 'r', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            entry = archetypes[(row['meta'], row['archetype'])]
+            entry['total_decks'] = max(entry['total_decks'], int(row['total_decks_in_archetype'] or 0))
+
+            set_code = row.get('set_code', '')
+            set_number = row.get('set_number', '')
+            if not (set_code and set_number):
+                # Rows without DB match still carry "SET NUM" in card_identifier
+                parts = (row.get('card_identifier') or '').split()
+                if len(parts) == 2:
+                    set_code, set_number = parts
+
+            deck_count = max(1, int(row['deck_count'] or 1))
+            entry['cards'].append({
+                'name': row['card_name'],
+                'count': max(1, round(int(row['total_count'] or 1) / deck_count)),
+                'deck_count': deck_count,
+                'set_code': set_code,
+                'set_number': set_number,
+            })
+
+    # Round-robin over archetypes so a capped workload still covers the whole meta
+    decks = []
+    deck_idx = 0
+    while len(decks) < max_decks:
+        added = False
+        for (meta, archetype), entry in archetypes.items():
+            if deck_idx >= entry['total_decks'] or len(decks) >= max_decks:
+                continue
+            cards = [
+                {'name': c['name'], 'count': c['count'], 'set_code': c['set_code'], 'set_number': c['set_number']}
+                for c in entry['cards'] if deck_idx < c['deck_count']
+            ]
+            decks.append({'archetype': archetype, 'meta': meta, 'cards': cards})
+            added = True
+        if not added:
+            break
+        deck_idx += 1
+    return decks
+
+
+def legacy_get_name_by_set_number(card_db: CardDatabaseLookup, set_code: str, card_number: str) -> Optional[str]:
+    """Pre-index implementation (full scan over every variant) kept for comparison."""
+    if not set_code or not card_number:
+        return None
+
+    normalized_set = set_code.strip().upper()
+    normalized_number = card_number.strip().lstrip('0') or card_number.strip()
+
+    for db_name, variants in card_db.cards.items():
+        for variant in variants:
+            variant_set = (variant['set_code'] or '').strip().upper()
+            variant_number = (variant['set_number'] or '').strip()
+            variant_number_norm = variant_number.lstrip('0') or variant_number
+
+            if variant_set == normalized_set and (
+                variant_number == card_number.strip() or variant_number_norm == normalized_number
+            ):
+                return variant['name']
+
+    return None
+
+
+def legacy_find_partial_match(card_db: CardDatabaseLookup, normalized: str) -> Optional[str]:
+    """Pre-index get_card_info partial matching (two full passes) kept for comparison."""
+    for db_name in card_db.cards:
+        if normalized in db_name:
+            return db_name
+    for db_name in card_db.cards:
+        if db_name in normalized and len(db_name) > 3:
+            return db_name
+    return None
+
+
+def partial_match_names(card_db: CardDatabaseLookup, decks: List[Dict[str, Any]]) -> List[str]:
+    """Names that miss the exact index: workload misses, truncated, over-long and unknown names."""
+    names = [c['name'] for d in decks for c in d['cards']
+             if card_db.normalize_name(c['name']) not in card_db.cards]
+    for db_name in list(card_db.cards)[::4]:
+        words = db_name.split()
+        if len(words) > 1:
+            names.append(' '.join(words[:-1]))        # truncated ("Iron Hands" for "Iron Hands ex")
+        names.append(f"{db_name} PAL 123")             # scraped name with trailing set info
+        names.append(f"Unknown {db_name[::-1]}")       # no match at all - worst case for the old scans
+    return names
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+def time_call(func, *args) -> float:
+    """Run func(*args) with its console output suppressed, return seconds."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(*args)
+    return time.perf_counter() - start
+
+
+def bench_set_number_lookup(card_db: CardDatabaseLookup, decks: List[Dict[str, Any]]):
+    """get_name_by_set_number: linear scan vs. (set, number) index."""
+    keys = [(c['set_code'], c['set_number']) for d in decks for c in d['cards'] if c['set_code'] and c['set_number']]
+
+    mismatches = sum(
+        1 for s, n in set(keys)
+        if legacy_get_name_by_set_number(card_db, s, n) != card_db.get_name_by_set_number(s, n)
+    )
+
+    legacy = time_call(lambda: [legacy_get_name_by_set_number(card_db, s, n) for s, n in keys])
+    indexed = time_call(lambda: [card_db.get_name_by_set_number(s, n) for s, n in keys])
+
+    print(f"\n[get_name_by_set_number] {len(keys)} lookups ({len(set(keys))} unique)")
+    print(f"  Linear scan: {legacy:8.3f}s")
+    print(f"  Index:       {indexed:8.3f}s  ({legacy / max(indexed, 1e-9):.0f}x faster)")
+    print(f"  Result mismatches: {mismatches}")
+
+
+def bench_partial_match(card_db: CardDatabaseLookup, decks: List[Dict[str, Any]]):
+    """get_card_info partial-match fallback: two linear passes vs. trigram/substring index."""
+    names = [card_db.normalize_name(n) for n in partial_match_names(card_db, decks)]
+
+    mismatches = sum(
+        1 for n in set(names)
+        if legacy_find_partial_match(card_db, n) != card_db._find_partial_match(n)
+    )
+
+    legacy = time_call(lambda: [legacy_find_partial_match(card_db, n) for n in names])
+    indexed = time_call(lambda: [card_db._find_partial_match(n) for n in names])
+
+    print(f"\n[get_card_info partial match] {len(names)} lookups ({len(set(names))} unique)")
+    print(f"  Linear passes: {legacy:8.3f}s")
+    print(f"  Index:         {indexed:8.3f}s  ({legacy / max(indexed, 1e-9):.0f}x faster)")
+    print(f"  Result mismatches: {mismatches}")
+
+
+def bench_aggregation(card_db: CardDatabaseLookup, decks: List[Dict[str, Any]]):
+    """Full aggregate_card_data run with and without the set/number index."""
+    indexed_lookup = card_db.get_name_by_set_number
+
+    card_db.get_name_by_set_number = lambda s, n: legacy_get_name_by_set_number(card_db, s, n)
+    legacy = time_call(aggregate_card_data, copy.deepcopy(decks), card_db)
+    card_db.get_name_by_set_number = indexed_lookup
+    indexed = time_call(aggregate_card_data, copy.deepcopy(decks), card_db)
+
+    print(f"\n[aggregate_card_data] {len(decks)} decks")
+    print(f"  Before (linear set/number scan): {legacy:8.3f}s")
+    print(f"  After  (set/number index):       {indexed:8.3f}s  ({legacy / max(indexed, 1e-9):.1f}x faster)")
+
+
+def legacy_card_layout() -> tuple:
+    """Pre-CardRecord layout: csv.DictReader dicts + a dict copy per variant in the name index."""
+    english, japanese = [], []
+    for filename, target in (('all_cards_database.csv', english), ('japanese_cards_database.csv', japanese)):
+        with open(os.path.join(get_data_dir(), filename), 'r', encoding='utf-8') as f:
+            target.extend(row for row in csv.DictReader(f) if row.get('name'))
+
+    merged, seen = [], set()
+    for card in english:
+        key = (card.get('set', ''), card.get('number', ''))
+        if key not in seen:
+            merged.append(card)
+            seen.add(key)
+    for card in japanese:
+        key = (card.get('set', ''), card.get('number', ''))
+        if key not in seen:
+            card['_source'] = 'japanese'
+            merged.append(card)
+            seen.add(key)
+
+    names = defaultdict(list)
+    for card in merged:
+        names[CardDatabaseLookup.normalize_name(None, card.get('name', ''))].append({
+            'name': card.get('name', ''),
+            'set_code': card.get('set', ''),
+            'set_number': card.get('number', ''),
+            'rarity': card.get('rarity', ''),
+            'type': card.get('type', ''),
+            'card_type': card.get('type', 'Pokemon'),
+            'image_url': card.get('image_url', ''),
+            '_source': card.get('_source', 'english')
+        })
+    return english, japanese, merged, names
+
+
+def current_card_layout() -> tuple:
+    """CardRecord layout: slotted records, name index holds references to the same records."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = CardDataManager(use_snapshot=False)
+    names = defaultdict(list)
+    for card in manager.get_all_cards():
+        names[CardDatabaseLookup.normalize_name(None, card.get('name', ''))].append(card)
+    return manager, names
+
+
+def measure_memory(func, *args) -> tuple:
+    """(retained bytes, peak bytes) of the objects func builds."""
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return retained, peak
+
+
+def bench_memory(card_db: CardDatabaseLookup, decks: List[Dict[str, Any]]):
+    """Card rows + name index memory: per-card dicts vs. shared CardRecords."""
+    mb = 1024 * 1024
+    legacy_retained, legacy_peak = measure_memory(legacy_card_layout)
+    current_retained, current_peak = measure_memory(current_card_layout)
+
+    print("\n[Memory] card rows + name index")
+    print(f"  Before (dict rows + variant copies): {legacy_retained / mb:7.2f} MB retained, {legacy_peak / mb:7.2f} MB peak")
+    print(f"  After  (shared CardRecords):         {current_retained / mb:7.2f} MB retained, {current_peak / mb:7.2f} MB peak"
+          f"  ({100 * (1 - current_retained / max(legacy_retained, 1)):.0f}% less)")
+
+    if decks:
+        _, aggregation_peak = measure_memory(
+            lambda: time_call(aggregate_card_data, copy.deepcopy(decks), card_db)
+        )
+        print(f"  aggregate_card_data working set ({len(decks)} decks, incl. input copy): {aggregation_peak / mb:7.2f} MB peak")
+
+
+def bench_startup():
+    """CardDataManager startup: English-only (Japanese on first miss) vs. eager Japanese merge."""
+    mb = 1024 * 1024
+
+    def load(use_snapshot, load_japanese):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return CardDataManager(use_snapshot=use_snapshot, load_japanese=load_japanese)
+
+    print("\n[Startup] CardDataManager (time, retained memory)")
+    for use_snapshot in (True, False):
+        source = 'snapshot' if use_snapshot else 'CSV     '
+        for load_japanese in (False, True):
+            label = 'English + Japanese' if load_japanese else 'English only      '
+            start = time.perf_counter()
+            manager = load(use_snapshot, load_japanese)
+            elapsed = time.perf_counter() - start
+            retained, _ = measure_memory(load, use_snapshot, load_japanese)
+            print(f"  {source} {label}: {elapsed * 1000:7.1f} ms, {retained / mb:6.2f} MB ({len(manager.merged_cards)} cards)")
+
+            if not load_japanese:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    manager.require_japanese()
+                print(f"  {source} first miss -> require_japanese(): {(time.perf_counter() - start) * 1000:7.1f} ms")
+            del manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CardDatabaseLookup on shipped data/ CSVs')
+    parser.add_argument('--decks', type=int, default=500, help="Number of decks to aggregate (default: 500)")
+    parser.add_argument('--memory-only', action='store_true', help='Only run the memory report')
+    parser.add_argument(REBUILD_FLAG, action='store_true', help='Rebuild the card DB snapshot from CSV')
+    parser.add_argument(SQLITE_FLAG, action='store_true', help='Use the SQLite card DB storage mode')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("CARD DATABASE BENCHMARK")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        card_db = CardDatabaseLookup()
+    print(f"Card DB load: {time.perf_counter() - start:.3f}s ({len(card_db.cards)} names)")
+
+    decks = load_benchmark_decks(args.decks)
+    print(f"Workload: {len(decks)} decks, {sum(len(d['cards']) for d in decks)} card entries")
+
+    if not args.memory_only:
+        bench_set_number_lookup(card_db, decks)
+        bench_partial_match(card_db, decks)
+        bench_aggregation(card_db, decks)
+    bench_startup()
+    bench_memory(card_db, decks)
+
+    print("\n" + "=" * 80)
+
+
+if __name__ == '__main__':
+    main()
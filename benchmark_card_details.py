@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Card Detail Benchmark
+=====================
+Cards per minute of all_cards_scraper's two detail modes on the same card pages:
+- http:     plain GET (FetchEngine, parallel + rate-controlled) + HTML parsing (card_details.parse_card_page)
+- selenium: headless Chrome, driver.get + detail_page_wait_seconds + read_card_page
+            (browser_pool.BrowserPool, --browsers 1,2,4 compares pool sizes)
+
+Both modes must extract the same fields; differences are counted per field.
+
+--mode extraction: time only the field extraction on already loaded pages (one browser),
+the injected script (read_card_page) against the previous per-element WebDriver calls;
+reports milliseconds and WebDriver commands (round-trips) per page.
+
+--mode lean: load the same pages with the full Chrome profile and the lean profile
+(browser_pool: no images / fonts / media / trackers, eager page load); reports bytes,
+requests and driver.get time per page from Chrome's performance log.
+
+Usage:
+    python benchmark_card_details.py                        # 100 cards from data/all_cards_database.csv
+    python benchmark_card_details.py --cards 300 --parallel 8 --rate 8
+    python benchmark_card_details.py --mode http --limitless-base-url=http://127.0.0.1:8800   (stand-in server)
+    python benchmark_card_details.py --mode selenium --wait 0.5 --browsers 1,2,4 --rate 20
+    python benchmark_card_details.py --mode extraction --cards 50
+    python benchmark_card_details.py --mode lean --cards 30
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# Fix Windows console encoding for Unicode characters
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except AttributeError:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+from browser_pool import BrowserPool, create_browser, quit_browser, selenium_available, short_error
+from card_details import CardDetails, parse_card_page, print_id_from_href, rarity_from_text, read_card_page
+from http_client import FetchEngine, RateController, configure_cache, configure_rate_limit, get_client
+from limitless_hosts import limitless_url
+
+
+def get_data_dir() -> str:
+    """Get the correct data directory path (handles EXE in dist/ folder)."""
+    if getattr(sys, "frozen", False):
+        app_dir = os.path.dirname(sys.executable)
+        if os.path.basename(app_dir).lower() == "dist":
+            return os.path.join(app_dir, "..", "data")
+    return "data"
+
+
+def load_card_urls(count: int) -> List[str]:
+    """Card page URLs of the first `count` cards in all_cards_database.csv."""
+    csv_path = os.path.join(get_data_dir(), 'all_cards_database.csv')
+    urls = []
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if row.get('set') and row.get('number'):
+                urls.append(f"https://limitlesstcg.com/cards/{row['set']}/{row['number']}")
+            if len(urls) >= count:
+                break
+    return urls
+
+
+# ============================================================================
+# MODES
+# ============================================================================
+
+def run_http(urls: List[str], parallel: int, rate: float) -> Dict[str, Optional[CardDetails]]:
+    configure_cache({'http_cache': False})  # Measure downloads, not the response cache
+    configure_rate_limit({'requests_per_second': rate, 'max_requests_per_second': rate * 2})
+    engine = FetchEngine(max_workers=parallel, retries=2)
+    results = {}
+    for outcome in engine.fetch_all(urls):
+        results[outcome.url] = parse_card_page(outcome.text, outcome.url) if outcome.ok else None
+    return results
+
+
+def run_selenium(urls: List[str], wait: float, delay: float, browsers: int,
+                 rate: float) -> Optional[Dict[str, Optional[CardDetails]]]:
+    if not selenium_available():
+        print("Selenium not installed - skipping the selenium mode (pip install selenium)")
+        return None
+
+    # Fresh rate state per pool size, so runs don't inherit each other's adaptive rate
+    pool = BrowserPool(workers=browsers, page_wait=wait, request_delay=delay, rate=RateController(rate, rate * 2))
+    results = {}
+    for outcome in pool.load_all(urls, read_card_page):
+        if not outcome.ok:
+            print(f"  selenium: {outcome.url}: {short_error(outcome.error)}")
+        results[outcome.url] = outcome.result
+    return results
+
+
+# ============================================================================
+# EXTRACTION (injected script vs. per-element WebDriver calls)
+# ============================================================================
+
+def legacy_read_card_page(driver) -> CardDetails:
+    """read_card_page before the injected script: find_element(s) / get_attribute per element and row
+    (+ the EUR price text as card_price_scraper read it)."""
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.webdriver.common.by import By
+
+    image_url = ''
+    try:
+        image_url = driver.find_element(By.CSS_SELECTOR, "img.card.shadow.resp-w").get_attribute('src') or ''
+    except NoSuchElementException:
+        pass
+
+    rarity = ''
+    rarity_spans = driver.find_elements(By.CSS_SELECTOR, ".card-prints-current .prints-current-details span")
+    if len(rarity_spans) >= 2:
+        rarity = rarity_from_text(rarity_spans[1].get_attribute('textContent').strip())
+
+    prints: List[str] = []
+    cardmarket_url = eur_price = ''
+    try:
+        table = driver.find_element(By.CSS_SELECTOR, "table.card-prints-versions")
+    except NoSuchElementException:
+        return CardDetails(image_url, rarity, (), '', False)
+
+    for row in table.find_elements(By.CSS_SELECTOR, "tbody tr"):
+        if row.find_elements(By.TAG_NAME, "th"):
+            continue
+        links = row.find_elements(By.CSS_SELECTOR, "td:first-child a[href*='/cards/']")
+        if links:
+            print_id = print_id_from_href(links[0].get_attribute('href'))
+            if print_id and print_id not in prints:
+                prints.append(print_id)
+        if not cardmarket_url and 'current' in (row.get_attribute('class') or '').split():
+            eur_links = row.find_elements(By.CSS_SELECTOR, "a.card-price.eur")
+            if eur_links:
+                cardmarket_url = eur_links[0].get_attribute('href') or ''
+                eur_price = eur_links[0].text.strip()
+
+    return CardDetails(image_url, rarity, tuple(prints), cardmarket_url, True, eur_price)
+
+
+EXTRACTORS: Dict[str, Callable[[object], CardDetails]] = {
+    'per-element': legacy_read_card_page,
+    'script': read_card_page
+}
+
+
+def count_commands(driver) -> List[int]:
+    """Count WebDriver commands (every find_element / get_attribute / execute_script is one round-trip)."""
+    counter = [0]
+    execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter[0] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counting_execute  # WebElements call their parent driver's execute()
+    return counter
+
+
+def run_extraction(urls: List[str], wait: float):
+    if not selenium_available():
+        print("Selenium not installed - skipping the extraction mode (pip install selenium)")
+        return
+
+    driver = create_browser()
+    counter = count_commands(driver)
+    seconds = {name: 0.0 for name in EXTRACTORS}
+    commands = {name: 0 for name in EXTRACTORS}
+    results: Dict[str, Dict[str, Optional[CardDetails]]] = {name: {} for name in EXTRACTORS}
+    try:
+        for url in urls:
+            driver.get(limitless_url(url))
+            time.sleep(wait)
+            for name, extractor in EXTRACTORS.items():  # Same loaded page for both
+                before = counter[0]
+                start = time.perf_counter()
+                try:
+                    results[name][url] = extractor(driver)
+                except Exception as e:
+                    print(f"  {name}: {url}: {short_error(e)}")
+                    results[name][url] = None
+                seconds[name] += time.perf_counter() - start
+                commands[name] += counter[0] - before
+    finally:
+        quit_browser(driver)
+
+    print(f"{'extractor':<12} {'pages':>6} {'ms/page':>9} {'commands/page':>14}")
+    for name in EXTRACTORS:
+        print(f"{name:<12} {len(urls):>6} {seconds[name] / len(urls) * 1000:>9.1f} {commands[name] / len(urls):>14.1f}")
+    if seconds['script']:
+        print(f"\nInjected script: {seconds['per-element'] / seconds['script']:.1f}x faster per page")
+    compare(results['per-element'], results['script'])
+
+
+# ============================================================================
+# LEAN PROFILE (bytes and page load time, full vs. lean Chrome)
+# ============================================================================
+
+def page_traffic(driver) -> Dict[str, float]:
+    """Bytes / requests / blocked requests since the last call, from the performance log."""
+    traffic = {'bytes': 0, 'requests': 0, 'blocked': 0}
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        method = message.get('method')
+        if method == 'Network.requestWillBeSent':
+            traffic['requests'] += 1
+        elif method == 'Network.loadingFinished':
+            traffic['bytes'] += message['params'].get('encodedDataLength', 0)
+        elif method == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+            traffic['blocked'] += 1
+    return traffic
+
+
+def run_lean(urls: List[str]):
+    if not selenium_available():
+        print("Selenium not installed - skipping the lean mode (pip install selenium)")
+        return
+
+    totals = {}
+    for profile, lean in (('full', False), ('lean', True)):
+        driver = create_browser(lean=lean, capabilities={'goog:loggingPrefs': {'performance': 'ALL'}})
+        total = {'bytes': 0, 'requests': 0, 'blocked': 0, 'seconds': 0.0}
+        try:
+            for url in urls:
+                page_traffic(driver)  # Drop the log of the previous page
+                start = time.perf_counter()
+                driver.get(limitless_url(url))
+                total['seconds'] += time.perf_counter() - start
+                time.sleep(1.0)  # Let late requests (images, trackers) show up in the log
+                for key, value in page_traffic(driver).items():
+                    total[key] += value
+        finally:
+            quit_browser(driver)
+        totals[profile] = total
+
+    print(f"{'profile':<9} {'pages':>6} {'KB/page':>9} {'requests':>9} {'blocked':>8} {'load ms':>9}")
+    for profile, total in totals.items():
+        print(f"{profile:<9} {len(urls):>6} {total['bytes'] / len(urls) / 1024:>9.1f} "
+              f"{total['requests'] / len(urls):>9.1f} {total['blocked'] / len(urls):>8.1f} "
+              f"{total['seconds'] / len(urls) * 1000:>9.0f}")
+    full, lean = totals['full'], totals['lean']
+    print(f"\nLean profile saves {(full['bytes'] - lean['bytes']) / len(urls) / 1024:.1f} KB and "
+          f"{(full['seconds'] - lean['seconds']) / len(urls) * 1000:.0f} ms per page")
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def report(name: str, results: Dict[str, Optional[CardDetails]], seconds: float):
+    ok = sum(1 for details in results.values() if details is not None)
+    print(f"{name:<9} {len(results):>6} {ok:>6} {seconds:>9.1f}s {ok / seconds * 60 if seconds else 0:>11.0f}")
+
+
+def field_value(details: CardDetails, field: str):
+    value = getattr(details, field)
+    return sorted(value) if field == 'international_prints' else value  # Row order doesn't matter
+
+
+def compare(http_results: Dict[str, Optional[CardDetails]], selenium_results: Dict[str, Optional[CardDetails]]):
+    both = [url for url in http_results if http_results[url] is not None and selenium_results.get(url) is not None]
+    print(f"\nField differences on {len(both)} cards read by both modes:")
+    for field in ('image_url', 'rarity', 'international_prints', 'cardmarket_url', 'eur_price'):
+        diffs = [url for url in both if field_value(http_results[url], field) != field_value(selenium_results[url], field)]
+        print(f"  {field:<22} {len(diffs):>4}" + (f"  e.g. {diffs[0]}" if diffs else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cards per minute: HTTP detail mode vs. Selenium')
+    parser.add_argument('--cards', type=int, default=100, help='Number of card pages (default: 100)')
+    parser.add_argument('--mode', choices=['http', 'selenium', 'both', 'extraction', 'lean'], default='both',
+                        help='Modes to run (default: both = http + selenium)')
+    parser.add_argument('--parallel', type=int, default=4, help='HTTP: parallel requests (default: 4)')
+    parser.add_argument('--rate', type=float, default=4.0, help='HTTP: starting requests per second (default: 4)')
+    parser.add_argument('--wait', type=float, default=2.0, help='Selenium: detail_page_wait_seconds (default: 2.0)')
+    parser.add_argument('--delay', type=float, default=0.5, help='Selenium: detail_request_delay_seconds (default: 0.5)')
+    parser.add_argument('--browsers', default='1', help='Selenium: browser pool sizes, e.g. 1,2,4 (default: 1)')
+    args, _ = parser.parse_known_args()  # --limitless-base-url=... is read by http_client / limitless_url
+
+    urls = load_card_urls(args.cards)
+    if not urls:
+        print("No cards in all_cards_database.csv - run all_cards_scraper.py first.")
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        get_client()  # Print-free setup before timing
+
+    print("=" * 60)
+    print(f"CARD DETAIL BENCHMARK ({len(urls)} card pages)")
+    print("=" * 60)
+    if args.mode == 'extraction':
+        run_extraction(urls, args.wait)
+        return
+    if args.mode == 'lean':
+        run_lean(urls)
+        return
+    print(f"{'mode':<9} {'pages':>6} {'parsed':>6} {'time':>10} {'cards/min':>11}")
+
+    http_results = selenium_results = None
+    if args.mode in ('http', 'both'):
+        start = time.perf_counter()
+        http_results = run_http(urls, args.parallel, args.rate)
+        report('http', http_results, time.perf_counter() - start)
+    if args.mode in ('selenium', 'both'):
+        for browsers in [int(value) for value in args.browsers.split(',')]:
+            start = time.perf_counter()
+            selenium_results = run_selenium(urls, args.wait, args.delay, browsers, args.rate)
+            if selenium_results is None:
+                break
+            report(f'sel x{browsers}', selenium_results, time.perf_counter() - start)
+
+    if http_results is not None and selenium_results is not None:
+        compare(http_results, selenium_results)
+
+
+if __name__ == '__main__':
+    main()
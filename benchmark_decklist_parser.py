@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Decklist Parser Benchmark
+=========================
+Single-pass tokenizer (card_scraper_shared.iter_decklist_cards) against the three
+regex parsers it replaced:
+- tournament_scraper_JH.extract_cards_from_page          (tournament card pages)
+- city_league_analysis_scraper.extract_cards_from_deck_html (City League decklists)
+- current_meta_analysis_scraper.extract_cards_from_online_decklist (play decklists)
+
+Only the HTML parsing is timed (no card database). Both sides must find the same cards.
+
+Pages come from a recorded crawl (fetch_archive.py) when there is one, otherwise they
+are generated with the stand-in fixtures (limitless_standin.py), padded with layout markup.
+
+Usage:
+    python benchmark_decklist_parser.py                       # data/fetch_archive or generated
+    python benchmark_decklist_parser.py --archive path/to/archive
+    python benchmark_decklist_parser.py --generated 500 --padding-kb 80 --runs 5
+"""
+
+import argparse
+import html
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+# Fix Windows console encoding for Unicode characters
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except AttributeError:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+from card_scraper_shared import iter_decklist_cards
+from fetch_archive import FetchArchive, archive_dir_from_argv
+
+# (section, set_code, number, count, name) - set / number only for Pokémon
+Card = Tuple[str, str, str, float, str]
+
+
+# ============================================================================
+# PREVIOUS PARSERS (parsing part only, as they were before the tokenizer)
+# ============================================================================
+
+def legacy_tournament_cards(html_content: str) -> List[Card]:
+    """tournament_scraper_JH.parse_cards_page: headings first, then one card regex per section slice."""
+    heading_pattern = re.compile(r'<div[^>]*class="decklist-column-heading"[^>]*>\s*([^<]+?)\s*</div>', re.IGNORECASE)
+    card_pattern = re.compile(r'<div[^>]*class="decklist-card"[^>]*data-set="([A-Z0-9]*)"[^>]*data-number="(\d*)"[^>]*>.*?<span class="card-count">([0-9.]+)</span>\s*<span class="card-name">([^<]+)</span>', re.IGNORECASE | re.DOTALL)
+
+    headings = []
+    for m in heading_pattern.finditer(html_content):
+        title = m.group(1).strip().lower()
+        section_type = 'trainer' if 'trainer' in title else 'energy' if 'energy' in title else 'pokemon'
+        headings.append({'start': m.end(), 'type': section_type})
+    for idx in range(len(headings)):
+        headings[idx]['end'] = headings[idx + 1]['start'] if idx + 1 < len(headings) else len(html_content)
+
+    cards = []
+    for sec in headings if headings else [{'start': 0, 'end': len(html_content), 'type': 'pokemon'}]:
+        block = html_content[sec['start']:sec['end']]
+        for set_code, number, count, name in card_pattern.findall(block):
+            name = html.unescape(name).replace('`', "'").replace('´', "'").replace('ʼ', "'")
+            pokemon = sec['type'] == 'pokemon'
+            cards.append((sec['type'], set_code.upper() if pokemon else '', number if pokemon else '',
+                          float(count), name.strip()))
+    return cards
+
+
+def legacy_city_league(deck_html: str) -> List[Card]:
+    """city_league_analysis_scraper.extract_cards_from_deck_html: one DOTALL section search per heading."""
+    cards = []
+    pokemon_section = re.search(
+        r'<div class="decklist-column-heading">Pokémon[^<]*</div>(.*?)(?=<div class="decklist-column-heading"|$)',
+        deck_html, re.DOTALL | re.IGNORECASE
+    )
+    if pokemon_section:
+        for set_code, number, count, name in re.findall(
+            r'<div[^>]+class="decklist-card"[^>]+data-set="([^"]+)"[^>]+data-number="([^"]+)"[^>]*>.*?'
+            r'<span class="card-count">([^<]+)</span>\s*<span class="card-name">([^<]+)</span>',
+            pokemon_section.group(1), re.DOTALL | re.IGNORECASE
+        ):
+            cards.append(('pokemon', set_code.strip(), number.strip(), float(int(float(count))), name.strip()))
+
+    for section, section_pattern in (
+        ('trainer', r'<div class="decklist-column-heading">Trainer[^<]*</div>(.*?)(?=<div class="decklist-column-heading"|$)'),
+        ('energy', r'<div class="decklist-column-heading">Energy[^<]*</div>(.*?)(?=<div class="decklist-column"|$)'),
+    ):
+        section_match = re.search(section_pattern, deck_html, re.DOTALL | re.IGNORECASE)
+        if not section_match:
+            continue
+        for count, name in re.findall(
+            r'<div[^>]+class="decklist-card"[^>]*>.*?<span class="card-count">([^<]+)</span>\s*<span class="card-name">([^<]+)</span>',
+            section_match.group(1), re.DOTALL | re.IGNORECASE
+        ):
+            cards.append((section, '', '', float(int(float(count))), name.strip()))
+    return cards
+
+
+def legacy_online(list_html: str) -> List[Card]:
+    """current_meta_analysis_scraper.extract_cards_from_online_decklist: one search per section."""
+    cards = []
+    pokemon_match = re.search(r'<div class="cards"><div class="heading">Pokémon[^<]*</div>(.*?)</div>',
+                              list_html, re.DOTALL | re.IGNORECASE)
+    if pokemon_match:
+        for set_code, number, count, name in re.findall(
+            r'<a href="[^"]+/([A-Z0-9]+)/([0-9]+)"[^>]*>([0-9]+)\s+([^<(]+)\s*\([^)]+\)</a>', pokemon_match.group(1)
+        ):
+            cards.append(('pokemon', set_code.strip(), number.strip(), float(count), name.strip()))
+
+    for section in ('trainer', 'energy'):
+        section_match = re.search(rf'<div class="heading">{section.title()}[^<]*</div>(.*?)</div>',
+                                  list_html, re.DOTALL | re.IGNORECASE)
+        if not section_match:
+            continue
+        for count, name in re.findall(r'<a href="[^"]+"[^>]*>([0-9]+)\s+([^<]+)</a>', section_match.group(1)):
+            cards.append((section, '', '', float(count), name.strip()))
+    return cards
+
+
+def tokenizer(page: str, integer_counts: bool = False) -> List[Card]:
+    """The shared tokenizer, reduced to what the scrapers keep."""
+    return [
+        (card.section,
+         card.set_code if card.section == 'pokemon' else '',
+         card.number if card.section == 'pokemon' else '',
+         float(int(card.count)) if integer_counts else card.count,
+         card.name)
+        for card in iter_decklist_cards(page)
+    ]
+
+
+# (legacy parser, tokenizer call) per page kind
+PARSERS: Dict[str, Tuple[Callable[[str], List[Card]], Callable[[str], List[Card]]]] = {
+    'tournament_cards': (legacy_tournament_cards, tokenizer),
+    'city_league': (legacy_city_league, lambda page: tokenizer(page, integer_counts=True)),
+    'online': (legacy_online, lambda page: tokenizer(page, integer_counts=True))
+}
+
+
+# ============================================================================
+# PAGES
+# ============================================================================
+
+def page_kind(url: str) -> str:
+    if 'play.limitlesstcg.com' in url and url.rstrip('/').endswith('/decklist'):
+        return 'online'
+    if re.search(r'/tournaments/\d+/cards\?', url):
+        return 'tournament_cards'
+    if '/decks/list/' in url:
+        return 'city_league'
+    return ''
+
+
+def recorded_pages(archive_dir: str) -> Dict[str, List[str]]:
+    """Decklist pages of a recorded crawl, by page kind."""
+    archive = FetchArchive(archive_dir)
+    pages: Dict[str, List[str]] = {kind: [] for kind in PARSERS}
+    for entry in archive.entries():
+        kind = page_kind(entry.url)
+        if kind and entry.status == 200:
+            pages[kind].append(archive.read_body(entry).decode('utf-8', errors='replace'))
+    return pages
+
+
+def generated_pages(count: int, padding_kb: int) -> Dict[str, List[str]]:
+    """Stand-in fixture pages with layout markup around the list (real pages are mostly layout)."""
+    import limitless_standin as standin
+
+    block = ('<div class="nav-item"><a href="/tournaments">Tournaments</a><a href="/decks">Decks</a>'
+             '<a href="/cards">Cards</a><span class="badge">12</span></div>\n')
+    padding = block * max(0, padding_kb * 1024 // len(block))
+
+    def pad(page: str) -> str:
+        head, _, body = page.partition('<body>')
+        body, _, tail = body.rpartition('</body>')
+        return f"{head}<body>{padding[:len(padding) // 2]}{body}{padding[len(padding) // 2:]}</body>{tail}"
+
+    return {
+        'tournament_cards': [pad(standin.tournament_cards(str(4000 + i), {'deck': f'{i % 6}.5'})) for i in range(count)],
+        'city_league': [pad(standin.decklist(str(900000 + i))) for i in range(count)],
+        'online': [pad(standin.play_decklist(f't{i}', f'player{i}')) for i in range(count)]
+    }
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def time_parser(parser: Callable[[str], List[Card]], pages: List[str], runs: int) -> float:
+    """Best total seconds over `runs` passes through all pages."""
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        for page in pages:
+            parser(page)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single-pass decklist tokenizer vs. the previous regex parsers')
+    parser.add_argument('--archive', help='Fetch archive directory (default: data/fetch_archive)')
+    parser.add_argument('--generated', type=int, default=300,
+                        help='Generated pages per kind if the archive has none (default: 300)')
+    parser.add_argument('--padding-kb', type=int, default=60,
+                        help='Layout markup around generated lists in KB (default: 60)')
+    parser.add_argument('--runs', type=int, default=3, help='Repetitions, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    archive_dir = args.archive or archive_dir_from_argv([])
+    pages = recorded_pages(archive_dir)
+    source = f"recorded ({archive_dir})"
+    if not any(pages.values()):
+        pages = generated_pages(args.generated, args.padding_kb)
+        source = f"generated ({args.padding_kb} KB layout per page)"
+
+    print("=" * 78)
+    print(f"DECKLIST PARSER BENCHMARK - pages: {source}")
+    print("=" * 78)
+    print(f"{'page kind':<17} {'pages':>6} {'avg KB':>7} {'previous':>11} {'tokenizer':>11} {'speedup':>8} {'diff':>5}")
+
+    for kind, (legacy, tokenize) in PARSERS.items():
+        kind_pages = pages[kind]
+        if not kind_pages:
+            print(f"{kind:<17} {0:>6}  (no pages)")
+            continue
+        mismatches = sum(1 for page in kind_pages if legacy(page) != tokenize(page))
+        legacy_time = time_parser(legacy, kind_pages, args.runs)
+        tokenizer_time = time_parser(tokenize, kind_pages, args.runs)
+        avg_kb = sum(len(page) for page in kind_pages) / len(kind_pages) / 1024
+        print(f"{kind:<17} {len(kind_pages):>6} {avg_kb:>7.1f} "
+              f"{legacy_time / len(kind_pages) * 1e6:>8.0f} µs {tokenizer_time / len(kind_pages) * 1e6:>8.0f} µs "
+              f"{legacy_time / (tokenizer_time or 1e-9):>7.1f}x {mismatches:>5}")
+
+    print("\ndiff = pages where the previous parser and the tokenizer found different cards")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Scraper Replay Benchmark
+========================
+End-to-end throughput of the analysis scrapers against a recorded crawl - no network.
+
+Record a crawl once (live), then replay it as often as needed:
+    python city_league_analysis_scraper.py --record-fetches
+    python current_meta_analysis_scraper.py --record-fetches
+
+Usage:
+    python benchmark_replay.py                          # all stages, no latency
+    python benchmark_replay.py --stage city_league      # one stage
+    python benchmark_replay.py --latency 0.2            # simulate 200 ms per response
+    python benchmark_replay.py --archive path/to/archive --runs 3
+
+Each stage reports the fetch + parse time (scrape function) and the aggregation
+time (aggregate_card_data) separately.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+# Fix Windows console encoding for Unicode characters
+if sys.platform == 'win32':
+    try:
+        sys.stdout.reconfigure(encoding='utf-8')
+    except AttributeError:
+        import codecs
+        sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
+
+from fetch_archive import ARCHIVE_OPTION, LATENCY_OPTION, REPLAY_FLAG, archive_dir_from_argv
+
+
+# ============================================================================
+# STAGES
+# ============================================================================
+
+def stage_city_league(card_db) -> List[Dict[str, Any]]:
+    import city_league_analysis_scraper as scraper
+    return scraper.scrape_city_league(scraper.load_settings(), card_db)
+
+
+def stage_meta_live(card_db) -> List[Dict[str, Any]]:
+    import current_meta_analysis_scraper as scraper
+    return scraper.scrape_limitless_online(scraper.load_settings(), card_db)
+
+
+def stage_meta_play(card_db) -> List[Dict[str, Any]]:
+    import current_meta_analysis_scraper as scraper
+    return scraper.scrape_tournaments(scraper.load_settings(), card_db)
+
+
+STAGES: Dict[str, Callable] = {
+    'city_league': stage_city_league,
+    'meta_live': stage_meta_live,
+    'meta_play': stage_meta_play
+}
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def run_stage(name: str, card_db, verbose: bool) -> Dict[str, float]:
+    """Replay one stage; returns timings and counts."""
+    from card_scraper_shared import aggregate_card_data
+    from http_client import get_client
+
+    archive = get_client().archive
+    replayed_before, missing_before = archive.replayed, archive.missing
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    with output:
+        start = time.perf_counter()
+        decks = STAGES[name](card_db)
+        scrape_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = aggregate_card_data(decks, card_db) if decks else []
+        aggregate_time = time.perf_counter() - start
+
+    return {
+        'decks': len(decks),
+        'rows': len(rows),
+        'pages': archive.replayed - replayed_before,
+        'missing': archive.missing - missing_before,
+        'scrape_time': scrape_time,
+        'aggregate_time': aggregate_time
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded crawl through the analysis scrapers')
+    parser.add_argument('--stage', choices=sorted(STAGES) + ['all'], default='all', help='Stage to run (default: all)')
+    parser.add_argument('--archive', help='Fetch archive directory (default: data/fetch_archive)')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated seconds per response (default: 0)')
+    parser.add_argument('--runs', type=int, default=1, help='Repetitions per stage (default: 1)')
+    parser.add_argument('--verbose', action='store_true', help='Show the scraper output')
+    args = parser.parse_args()
+
+    # The shared HTTP client reads its fetch mode from the command line
+    sys.argv = [sys.argv[0], REPLAY_FLAG, f"{LATENCY_OPTION}{args.latency}"]
+    if args.archive:
+        sys.argv.append(f"{ARCHIVE_OPTION}{args.archive}")
+
+    from card_scraper_shared import CardDatabaseLookup
+    from http_client import get_client
+
+    archive = get_client().archive
+    if not len(archive):
+        print(f"No recorded responses in {archive_dir_from_argv()}.")
+        print("Record a crawl first, e.g.: python city_league_analysis_scraper.py --record-fetches")
+        return
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        card_db = CardDatabaseLookup()
+
+    stages = sorted(STAGES) if args.stage == 'all' else [args.stage]
+
+    print("=" * 78)
+    print(f"REPLAY BENCHMARK ({len(archive)} recorded responses, latency {args.latency * 1000:.0f} ms)")
+    print("=" * 78)
+    print(f"{'stage':<12} {'run':>3} {'pages':>6} {'miss':>5} {'decks':>6} "
+          f"{'fetch+parse':>12} {'aggregate':>10} {'pages/s':>8} {'decks/s':>8}")
+
+    for name in stages:
+        for run in range(1, args.runs + 1):
+            result = run_stage(name, card_db, args.verbose)
+            scrape_time = result['scrape_time'] or 1e-9
+            print(f"{name:<12} {run:>3} {result['pages']:>6} {result['missing']:>5} {result['decks']:>6} "
+                  f"{scrape_time:>11.2f}s {result['aggregate_time']:>9.2f}s "
+                  f"{result['pages'] / scrape_time:>8.1f} {result['decks'] / scrape_time:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
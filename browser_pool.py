@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - Parallel Chrome Workers for Card Detail Pages
+============================================================
+One place for the Chrome setup and browser restart logic of the Selenium tools
+(all_cards_scraper, japanese_cards_scraper, update_int_prints, fix_missing_urls).
+
+- N workers (one headless Chrome each) share one work queue of page URLs
+- every page load waits for the shared per-host rate limit (http_client.RateController),
+  so N browsers speed up a run roughly N times until the rate limit is reached
+- session errors (crashed / lost browser) restart that worker's browser and retry the page,
+  network errors wait and retry; other errors are returned with the page (retry_all=True:
+  retried like session errors, without the browser restart)
+- browsers are recycled after page_budget pages (prevents session timeouts in long runs)
+- results are yielded in input order, so callers can write progress as before
+- lean profile (default): images, fonts, media and trackers are never downloaded (Chrome prefs +
+  CDP Network.setBlockedURLs) and driver.get returns at DOMContentLoaded (eager page load);
+  route_lean() applies the same blocking to a Playwright browser context
+
+Usage:
+    pool = BrowserPool.from_settings(settings, log_prefix="[All Cards Scraper]")
+    for outcome in pool.load_all(urls, read_card_page):   # input order
+        if outcome.ok:
+            use(outcome.result)
+"""
+
+import importlib.util
+import queue
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+from urllib.parse import urlsplit
+
+from http_client import RateController, get_client
+from limitless_hosts import limitless_url
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+DEFAULT_BROWSER_WORKERS = 2  # Parallel Chrome instances
+DEFAULT_PAGE_BUDGET = 1000  # Pages per browser before it is restarted
+DEFAULT_PAGE_RETRIES = 3  # Attempts per page (session / network errors)
+NETWORK_RETRY_WAIT = 10.0  # Seconds, multiplied by the attempt number
+SESSION_RETRY_WAIT = 2.0  # Seconds after a browser restart (and before retrying other errors, retry_all)
+
+WORKERS_OPTION = '--browser-workers='  # Command line override of browser_workers
+
+CHROME_ARGUMENTS = ("--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--window-size=1920,1080")
+
+# Lean profile: the scrapers only read the DOM (src / href attributes and text), so nothing
+# else is needed. Stylesheets stay: WebElement.text / innerText depend on CSS visibility.
+LEAN_BLOCKED_RESOURCE_TYPES = ('image', 'font', 'media')  # Playwright request.resource_type
+LEAN_BLOCKED_EXTENSIONS = ('png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico',
+                           'woff', 'woff2', 'ttf', 'otf', 'eot', 'mp4', 'webm', 'mp3', 'ogg')
+TRACKER_HOSTS = ('googletagmanager.com', 'google-analytics.com', 'doubleclick.net', 'googlesyndication.com',
+                 'googleadservices.com', 'adservice.google.com', 'facebook.net', 'hotjar.com',
+                 'scorecardresearch.com', 'quantserve.com', 'cloudflareinsights.com', 'amazon-adsystem.com',
+                 'adnxs.com', 'criteo.com', 'taboola.com', 'outbrain.com', 'pubmatic.com', 'rubiconproject.com')
+LEAN_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,  # 2 = block
+    'profile.default_content_setting_values.notifications': 2
+}
+
+SESSION_ERRORS = ('invalid session', 'session', 'chrome not reachable', 'disconnected', 'target window already closed')
+NETWORK_ERRORS = ('err_name_not_resolved', 'err_connection', 'err_internet_disconnected', 'network', 'timed out')
+
+
+def workers_from_argv(default: int = DEFAULT_BROWSER_WORKERS, argv=None) -> int:
+    """--browser-workers=N from the command line, else default."""
+    for arg in (argv if argv is not None else sys.argv):
+        if arg.startswith(WORKERS_OPTION):
+            try:
+                return max(1, int(arg[len(WORKERS_OPTION):]))
+            except ValueError:
+                print(f"[Browser Pool] ⚠️ Invalid {arg} - using {default}")
+    return default
+
+
+def lean_blocked_urls() -> List[str]:
+    """URL patterns for CDP Network.setBlockedURLs ('*' wildcards)."""
+    patterns = []
+    for extension in LEAN_BLOCKED_EXTENSIONS:
+        patterns += [f"*.{extension}", f"*.{extension}?*"]
+    patterns += [f"*{host}/*" for host in TRACKER_HOSTS]
+    return patterns
+
+
+def is_lean_blocked(resource_type: str, url: str) -> bool:
+    """True for requests the lean profile doesn't load (Playwright resource types)."""
+    if resource_type in LEAN_BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlsplit(url).hostname or ''
+    return any(host == tracker or host.endswith('.' + tracker) for tracker in TRACKER_HOSTS)
+
+
+def selenium_available() -> bool:
+    """Selenium is installed (checked without importing it)."""
+    return importlib.util.find_spec('selenium') is not None
+
+
+def create_browser(headless: bool = True, extra_arguments: Sequence[str] = (), lean: bool = True,
+                   capabilities: Optional[Dict[str, object]] = None):
+    """Create a Chrome WebDriver with the standard scraper options (+ the lean profile)."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    for argument in CHROME_ARGUMENTS + tuple(extra_arguments):
+        chrome_options.add_argument(argument)
+    if lean:
+        chrome_options.page_load_strategy = 'eager'  # driver.get returns at DOMContentLoaded
+        chrome_options.add_experimental_option('prefs', LEAN_CHROME_PREFS)
+    for name, value in (capabilities or {}).items():
+        chrome_options.set_capability(name, value)
+
+    driver = webdriver.Chrome(options=chrome_options)
+    if lean:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': lean_blocked_urls()})
+        except Exception as e:
+            print(f"[Browser Pool] ⚠️ Request blocking not available: {short_error(e)}")
+    return driver
+
+
+async def route_lean(context):
+    """Playwright: abort the requests the lean profile blocks on every page of a browser context."""
+    async def handle(route):
+        if is_lean_blocked(route.request.resource_type, route.request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await context.route('**/*', handle)
+
+
+def quit_browser(driver):
+    """Quit a WebDriver, ignoring errors of an already dead browser."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def is_session_error(error: Exception) -> bool:
+    """Browser crashed or lost its session -> restart the browser."""
+    message = str(error).lower()
+    return any(marker in message for marker in SESSION_ERRORS)
+
+
+def is_network_error(error: Exception) -> bool:
+    """Page could not be reached (DNS, connection, page load timeout) -> wait and retry."""
+    message = str(error).lower()
+    return any(marker in message for marker in NETWORK_ERRORS)
+
+
+def short_error(error: Exception) -> str:
+    """First line of a WebDriver error without the stacktrace."""
+    return str(error).split('Stacktrace')[0].strip().split('\n')[0][:100]
+
+
+class PageOutcome(NamedTuple):
+    index: int  # Position in the URL list
+    url: str
+    result: object  # Return value of read_page (None on error)
+    error: Optional[Exception]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _WorkerStopped(NamedTuple):
+    """Sent by a worker that could not start a browser."""
+    worker: int
+    error: Exception
+
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+class BrowserWorker:
+    """One Chrome instance of the pool, restarted on session errors and after page_budget pages."""
+
+    def __init__(self, number: int, pool: 'BrowserPool'):
+        self.number = number
+        self.pool = pool
+        self.driver = None
+        self.pages = 0  # Pages loaded by the current browser
+
+    def browser(self):
+        if self.driver is not None and self.pages >= self.pool.page_budget:
+            self.pool.log(f"BROWSER RESTART: browser {self.number} loaded {self.pages} pages, restarting...")
+            self.close()
+        for attempt in range(1, self.pool.retries + 1):
+            if self.driver is not None:
+                break
+            try:
+                self.driver = self.pool.browser_factory()
+                self.pages = 0
+            except Exception as e:
+                if attempt == self.pool.retries:
+                    raise
+                self.pool.log(f"Browser {self.number} could not start ({short_error(e)}), retrying...")
+                time.sleep(SESSION_RETRY_WAIT)
+        return self.driver
+
+    def restart(self, reason: str):
+        self.pool.log(f"SESSION ERROR in browser {self.number}: {reason} - restarting browser...")
+        self.close()
+
+    def close(self):
+        if self.driver is not None:
+            quit_browser(self.driver)
+            self.driver = None
+
+
+class BrowserPool:
+    """
+    Load many pages with N Chrome workers sharing one queue.
+
+    read_page(driver) is called on each loaded page (after page_wait seconds) and its return
+    value becomes outcome.result. Each worker sleeps request_delay seconds after a page.
+    retry_all=True retries every error of a page load / read_page, not only session and network errors.
+    """
+
+    def __init__(self, workers: int = DEFAULT_BROWSER_WORKERS, headless: bool = True,
+                 page_budget: int = DEFAULT_PAGE_BUDGET, retries: int = DEFAULT_PAGE_RETRIES,
+                 page_wait: float = 0.0, request_delay: float = 0.0, page_load_timeout: Optional[float] = None,
+                 browser_arguments: Sequence[str] = (), lean: bool = True, rate: Optional[RateController] = None,
+                 browser_factory: Callable[[], object] = None, retry_all: bool = False,
+                 log_prefix: str = "[Browser Pool]"):
+        self.workers = max(1, int(workers))
+        self.page_budget = max(1, int(page_budget))
+        self.retries = max(1, int(retries))
+        self.page_wait = page_wait
+        self.request_delay = request_delay
+        self.page_load_timeout = page_load_timeout
+        self.lean = lean
+        self.rate = rate if rate is not None else get_client().rate
+        self.browser_factory = browser_factory or (lambda: create_browser(headless, browser_arguments, lean))
+        self.retry_all = retry_all
+        self.log_prefix = log_prefix
+
+    @classmethod
+    def from_settings(cls, settings: Dict, **overrides) -> 'BrowserPool':
+        """Build a pool from a scraper settings dict (keys: browser_workers, browser_page_budget,
+        headless, lean_browser, detail_page_wait_seconds, detail_request_delay_seconds).
+        --browser-workers=N on the command line overrides browser_workers."""
+        options = {
+            'workers': workers_from_argv(settings.get('browser_workers', DEFAULT_BROWSER_WORKERS)),
+            'page_budget': settings.get('browser_page_budget', DEFAULT_PAGE_BUDGET),
+            'headless': settings.get('headless', True),
+            'lean': bool(settings.get('lean_browser', True)),
+            'page_wait': float(settings.get('detail_page_wait_seconds', 2.0)),
+            'request_delay': float(settings.get('detail_request_delay_seconds', 0.5))
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    def log(self, message: str):
+        print(f"{self.log_prefix} {message}")
+
+    def describe(self) -> str:
+        return (f"{self.workers} browser(s){' (lean profile)' if self.lean else ''}, "
+                f"restart every {self.page_budget} pages, {self.rate.describe()}")
+
+    def _load(self, worker: BrowserWorker, index: int, url: str,
+              read_page: Callable[[object], object]) -> PageOutcome:
+        """Load one page with retries. Browser start failures are raised to the worker."""
+        host = urlsplit(url).netloc
+        for attempt in range(1, self.retries + 1):
+            driver = worker.browser()
+            try:
+                if self.page_load_timeout:
+                    driver.set_page_load_timeout(self.page_load_timeout)
+                self.rate.wait(host)
+                driver.get(limitless_url(url))
+                worker.pages += 1
+                if self.page_wait:
+                    time.sleep(self.page_wait)
+                result = read_page(driver)
+                self.rate.report(host, 200)
+                return PageOutcome(index, url, result, None)
+            except Exception as e:
+                network = is_network_error(e)
+                session = not network and is_session_error(e)
+                if network:
+                    self.rate.report(host, None)
+                    self.log(f"NETWORK ERROR: {short_error(e)}")
+                elif session:
+                    worker.restart(short_error(e))  # Also on the last attempt - the next page needs a live browser
+                if attempt == self.retries or not (network or session or self.retry_all):
+                    return PageOutcome(index, url, None, e)
+                if network:
+                    wait_time = NETWORK_RETRY_WAIT * attempt
+                    self.log(f"   ⏸ Waiting {wait_time:.0f} seconds before retry {attempt}/{self.retries}...")
+                    time.sleep(wait_time)
+                else:
+                    if not session:
+                        self.log(f"ERROR (retry {attempt}/{self.retries}): {short_error(e)}")
+                    time.sleep(SESSION_RETRY_WAIT)
+
+    def _work(self, worker: BrowserWorker, tasks: queue.Queue, results: queue.Queue,
+              read_page: Callable[[object], object], stop: threading.Event):
+        try:
+            while not stop.is_set():
+                try:
+                    index, url = tasks.get(timeout=0.2)
+                except queue.Empty:
+                    continue  # Pages of a stopped worker may still come back
+                try:
+                    outcome = self._load(worker, index, url, read_page)
+                except Exception as e:
+                    # Browser could not be started - hand the page to the other workers
+                    tasks.put((index, url))
+                    results.put(_WorkerStopped(worker.number, e))
+                    return
+                results.put(outcome)
+                if self.request_delay:
+                    time.sleep(self.request_delay)
+        finally:
+            worker.close()
+
+    def load_all(self, urls: Iterable[str], read_page: Callable[[object], object]) -> Iterator[PageOutcome]:
+        """Load all URLs with the worker pool and yield PageOutcomes in input order.
+
+        Raises the browser start error if no worker could start a browser.
+        """
+        urls = list(urls)
+        if not urls:
+            return
+        tasks: queue.Queue = queue.Queue()
+        for index, url in enumerate(urls):
+            tasks.put((index, url))
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+
+        workers = [BrowserWorker(number, self) for number in range(1, min(self.workers, len(urls)) + 1)]
+        threads = [threading.Thread(target=self._work, args=(worker, tasks, results, read_page, stop),
+                                    name=f"browser-{worker.number}", daemon=True) for worker in workers]
+        for thread in threads:
+            thread.start()
+
+        running = len(threads)
+        pending: Dict[int, PageOutcome] = {}
+        next_index = 0
+        try:
+            while next_index < len(urls):
+                item = results.get()
+                if isinstance(item, _WorkerStopped):
+                    running -= 1
+                    self.log(f"Browser {item.worker} could not start: {short_error(item.error)}")
+                    if not running:
+                        raise item.error
+                    continue
+                pending[item.index] = item
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            # Done or consumer stopped early - let the workers finish their current page and quit
+            stop.set()
+            for thread in threads:
+                thread.join()
+
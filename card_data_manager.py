@@ -16,12 +16,41 @@ Usage:
     
     # Get all cards
     all_cards = manager.get_all_cards()
+
+SQLite mode:
+    CardDataManager(storage='sqlite') (or any tool started with --card-db-sqlite)
+    keeps the merged cards in data/card_db.sqlite with indexes on name, set and
+    (set, number) plus an FTS5 trigram index for name search.
+    Same API - rows are fetched on demand instead of held in memory
+    (CardDatabaseLookup indexes them via iter_card_groups / get_cards_by_ids).
+
+Startup snapshot:
+    The merged cards are cached in data/card_db_snapshot.pkl, the indexes of the
+    lookup layers in data/card_db_snapshot.<section>.pkl (one file each), and
+    reused as long as both source CSVs are unchanged (size, mtime, SHA-1).
+    Start any tool with --rebuild-card-db to force a rebuild from CSV:
+    
+    python card_data_manager.py --rebuild-card-db
+
+Japanese database (lazy):
+    Only the English cards are loaded up front. The Japanese cards are merged on
+    the first lookup miss or an explicit manager.require_japanese(), so tools that
+    only read English cards (CardTypeLookup, prices) start faster with less memory.
+    CardDatabaseLookup always requires them: its per-name selection runs over all
+    EN + JP variants of a name. CardDataManager(load_japanese=True) restores the
+    eager behaviour.
 """
 
 import csv
+import hashlib
+import json
 import os
+import pickle
+import sqlite3
 import sys
-from typing import List, Dict, Optional, Tuple
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
 
@@ -42,41 +71,616 @@ def get_data_dir() -> str:
     return "data"
 
 
+# ============================================================================
+# CARD RECORD
+# ============================================================================
+
+CARD_FIELDS = ('name', 'set', 'number', 'type', 'rarity', 'image_url',
+               'international_prints', 'cardmarket_url', '_source', 'category')
+
+
+class CardRecord:
+    """
+    Compact card row shared by CardDataManager and CardDatabaseLookup.
+    
+    Uses __slots__ instead of a per-card dict, and interns the strings that repeat
+    across thousands of cards (name, set, number, type, rarity, source, category).
+    Keeps dict-style access so existing code (card['name'], card.get('set', ''),
+    'cardmarket_url' in card) works unchanged. A field that is None counts as
+    missing, like a key the CSV row never had.
+    
+    CardDatabaseLookup's old variant keys are aliases:
+    set_code -> set, set_number -> number, card_type -> type
+    card[key] returns the defaults of the old variant dicts for the keys they always
+    had (card_type 'Pokemon', _source 'english', '' for the others) instead of KeyError.
+    """
+    __slots__ = CARD_FIELDS + ('_extra',)
+    
+    _ALIASES = {'set_code': 'set', 'set_number': 'number', 'card_type': 'type'}
+    _FIELD_SET = frozenset(CARD_FIELDS)
+    _INTERNED = frozenset(('name', 'set', 'number', 'type', 'rarity', '_source', 'category'))
+    _DEFAULTS = {'name': '', 'set_code': '', 'set_number': '', 'rarity': '', 'type': '',
+                 'card_type': 'Pokemon', 'image_url': '', '_source': 'english'}
+    
+    def __init__(self, fields: Dict[str, Any] = None):
+        for field in CARD_FIELDS:
+            setattr(self, field, None)
+        self._extra = None  # Columns not in CARD_FIELDS (only if a CSV ever adds some)
+        if fields:
+            for key, value in fields.items():
+                self[key] = value
+    
+    def _lookup(self, key: str) -> Any:
+        attr = self._ALIASES.get(key, key)
+        if attr in self._FIELD_SET:
+            return getattr(self, attr)
+        return self._extra.get(key) if self._extra else None
+    
+    def __getitem__(self, key: str) -> Any:
+        value = self._lookup(key)
+        if value is None:
+            if key in self._DEFAULTS:
+                return self._DEFAULTS[key]
+            raise KeyError(key)
+        return value
+    
+    def __setitem__(self, key: str, value: Any):
+        attr = self._ALIASES.get(key, key)
+        if attr in self._FIELD_SET:
+            if attr in self._INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, attr, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+    
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key) is not None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._lookup(key)
+        return default if value is None else value
+    
+    def keys(self) -> List[str]:
+        keys = [field for field in CARD_FIELDS if getattr(self, field) is not None]
+        if self._extra:
+            keys.extend(k for k, v in self._extra.items() if v is not None)
+        return keys
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in self.keys()]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (CardRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+    
+    __hash__ = None  # Mutable, like the dicts it replaces
+    
+    def __repr__(self) -> str:
+        return f"CardRecord({self.to_dict()!r})"
+    
+    def __reduce__(self):
+        # Compact pickle for the startup snapshot: one tuple of values per card
+        return (_restore_card_record, (tuple(getattr(self, f) for f in CARD_FIELDS), self._extra))
+
+
+def _restore_card_record(values: tuple, extra: Optional[Dict[str, Any]]) -> CardRecord:
+    record = CardRecord.__new__(CardRecord)
+    for field, value in zip(CARD_FIELDS, values):
+        # Re-intern after unpickling so equal strings share one object again
+        if type(value) is str and field in CardRecord._INTERNED:
+            value = sys.intern(value)
+        setattr(record, field, value)
+    record._extra = extra
+    return record
+
+
+# Bump when the snapshot layout or merge rules change - old snapshots are rebuilt
+SNAPSHOT_VERSION = 5
+SNAPSHOT_FILENAME = 'card_db_snapshot.pkl'
+SECTION_FILENAME = 'card_db_snapshot.{name}.pkl'  # One file per dependent layer section
+SOURCE_FILENAMES = ('all_cards_database.csv', 'japanese_cards_database.csv')
+
+# SQLite storage mode
+SQLITE_SCHEMA_VERSION = 4
+SQLITE_FILENAME = 'card_db.sqlite'
+
+# Command-line switches (accepted by every tool that loads the card DB)
+REBUILD_FLAG = '--rebuild-card-db'
+SQLITE_FLAG = '--card-db-sqlite'
+
+
+def card_category(type_code: str) -> str:
+    """
+    Determine card category (Pokemon, Trainer, Energy) from type code.
+    Type codes from all_cards_database.csv like: GBasic, RStage1, Item, Supporter, etc.
+    Stored once per card in the 'category' column of the merged database.
+    """
+    if not type_code:
+        return "Energy"  # Empty type = Basic Energy
+    
+    type_lower = type_code.lower()
+    
+    # Check for Energy
+    if 'energy' in type_lower:
+        return "Energy"
+    
+    # Check for Trainer types
+    trainer_keywords = ['item', 'supporter', 'stadium', 'tool', 'ace spec', 'acespec']
+    if any(keyword in type_lower for keyword in trainer_keywords):
+        return "Trainer"
+    
+    # Pokemon types (GBasic, RStage1, WStage2, PVMAX, Mega, ...) and unknown types
+    return "Pokemon"
+
+
+_shared_manager: Optional['CardDataManager'] = None
+
+
+def get_shared_manager() -> 'CardDataManager':
+    """Process-wide CardDataManager so every lookup layer parses the card data once."""
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = CardDataManager()
+    return _shared_manager
+
+
 class CardDataManager:
     """Unified access to English and Japanese card databases."""
     
-    def __init__(self):
-        """Initialize the manager by loading both databases."""
+    def __init__(self, use_snapshot: bool = True, force_rebuild: bool = False, storage: str = None,
+                 load_japanese: bool = False):
+        """Initialize the manager by loading the English database (Japanese on demand).
+        
+        Args:
+            use_snapshot: Load from / save to the binary startup snapshot
+            force_rebuild: Ignore an existing snapshot / SQLite file (also set by --rebuild-card-db)
+            storage: 'memory' (default) or 'sqlite' (also set by --card-db-sqlite)
+            load_japanese: Merge the Japanese database right away instead of on first miss
+        """
         self.english_cards = []
         self.japanese_cards = []
         self.merged_cards = []
         self.card_index = {}  # (set, number) -> card dict
         
+        self.japanese_loaded = False
+        self._english_count = 0  # merged_cards[:_english_count] is the English part
+        self._japanese_blob = None  # Pickled Japanese part from the snapshot (until required)
+        
+        self.use_snapshot = use_snapshot
+        self._snapshot_sections = {}  # name -> (version, pickled bytes) for dependent layers
+        self._snapshot_sources = None
+        self._sections_on_disk = False  # Section files match this snapshot (False after a rebuild)
+        
+        self.storage = storage or ('sqlite' if SQLITE_FLAG in sys.argv else 'memory')
+        self._db = None  # sqlite3 connection in SQLite mode
+        self._fts_available = False
+        
+        force_rebuild = force_rebuild or REBUILD_FLAG in sys.argv
+        if self.storage == 'sqlite':
+            # Rows live on disk - nothing to defer
+            self._open_sqlite(force_rebuild)
+            self.japanese_loaded = True
+            return
+        
+        start = time.perf_counter()
+        if not (use_snapshot and not force_rebuild and self._load_snapshot()):
+            if use_snapshot:
+                # Fingerprint before reading so a CSV written mid-load invalidates the snapshot
+                self._snapshot_sources = self._source_fingerprints()
+            
+            self._load_english_database()
+            self._merge_english()
+            
+            if use_snapshot:
+                # The snapshot always carries the Japanese part, pickled separately
+                self._japanese_blob = pickle.dumps(self._split_japanese(self._load_japanese_database()),
+                                                   protocol=pickle.HIGHEST_PROTOCOL)
+                self._save_snapshot()
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if load_japanese:
+            self.require_japanese()
+        else:
+            print(f"[CardDataManager] ✓ English index ready: {len(self.merged_cards)} cards in {elapsed_ms:.0f} ms "
+                  f"(Japanese database loads on first miss)")
+    
+    def require_japanese(self) -> bool:
+        """Merge the Japanese database into the index (no-op once loaded).
+        
+        Called automatically on the first lookup miss; call it up front in tools that
+        need Japanese-only cards anyway (City League). Returns True if it was loaded now.
+        """
+        if self.japanese_loaded:
+            return False
+        
+        start = time.perf_counter()
+        if self._japanese_blob is not None:
+            japanese_cards, japanese_only = pickle.loads(self._japanese_blob)
+            self._japanese_blob = None
+        else:
+            japanese_cards, japanese_only = self._split_japanese(self._load_japanese_database())
+        self._attach_japanese(japanese_cards, japanese_only)
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"[CardDataManager] ✓ Merged Japanese database: +{len(japanese_only)} Japanese-only cards "
+              f"in {elapsed_ms:.0f} ms ({len(self.merged_cards)} total)")
+        return True
+    
+    # ========================================================================
+    # STARTUP SNAPSHOT
+    # ========================================================================
+    
+    def _snapshot_path(self) -> Path:
+        return Path(get_data_dir()) / SNAPSHOT_FILENAME
+    
+    @staticmethod
+    def _file_sha1(filepath: Path) -> str:
+        digest = hashlib.sha1()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _source_fingerprints(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Size/mtime/SHA-1 of both source CSVs (None if a file is missing)."""
+        fingerprints = {}
+        for filename in SOURCE_FILENAMES:
+            filepath = Path(get_data_dir()) / filename
+            if filepath.exists():
+                stat = filepath.stat()
+                fingerprints[filename] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sha1': self._file_sha1(filepath)
+                }
+            else:
+                fingerprints[filename] = None
+        return fingerprints
+    
+    def _snapshot_is_current(self, stored: Dict[str, Optional[Dict[str, Any]]]) -> bool:
+        """Compare stored fingerprints with the CSVs on disk.
+        
+        Size change -> stale. Same size + same mtime -> current (no hashing).
+        Same size + new mtime -> hash decides (e.g. file re-copied unchanged).
+        """
+        for filename in SOURCE_FILENAMES:
+            filepath = Path(get_data_dir()) / filename
+            old = stored.get(filename)
+            if not filepath.exists() or old is None:
+                if filepath.exists() or old is not None:
+                    return False
+                continue
+            
+            stat = filepath.stat()
+            if stat.st_size != old['size']:
+                return False
+            if stat.st_mtime_ns != old['mtime_ns'] and self._file_sha1(filepath) != old['sha1']:
+                return False
+        return True
+    
+    def _load_snapshot(self) -> bool:
+        """Load merged cards + indexes from the snapshot. Returns False if missing/stale."""
+        snapshot_path = self._snapshot_path()
+        if not snapshot_path.exists():
+            return False
+        
+        start = time.perf_counter()
+        try:
+            with open(snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"[CardDataManager] ⚠ Could not read snapshot ({e}), rebuilding from CSV")
+            return False
+        
+        if not isinstance(snapshot, dict) or snapshot.get('version') != SNAPSHOT_VERSION:
+            print("[CardDataManager] Snapshot format changed, rebuilding from CSV")
+            return False
+        
+        if not self._snapshot_is_current(snapshot.get('sources', {})):
+            print("[CardDataManager] Card database changed, rebuilding snapshot")
+            return False
+        
+        self.english_cards = snapshot['english_cards']
+        self.merged_cards = snapshot['merged_cards']
+        self._english_count = len(self.merged_cards)
+        self._japanese_blob = snapshot['japanese']
+        self._snapshot_sources = snapshot['sources']
+        self._sections_on_disk = True
+        self._build_index()
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"[CardDataManager] ✓ Loaded snapshot: {len(self.merged_cards)} English cards in {elapsed_ms:.0f} ms")
+        return True
+    
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        """Write via a unique temp file + os.replace (parallel scrapers never share a temp file)."""
+        os.makedirs(path.parent, exist_ok=True)
+        tmp = tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + '.', suffix='.tmp', delete=False)
+        try:
+            with tmp:
+                tmp.write(data)
+            os.replace(tmp.name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp.name)
+            except OSError:
+                pass
+            raise
+    
+    def _save_snapshot(self):
+        """Write the English cards and the pickled Japanese part to the snapshot file."""
+        snapshot_path = self._snapshot_path()
+        japanese_blob = self._japanese_blob
+        if japanese_blob is None:
+            japanese_blob = pickle.dumps((self.japanese_cards, self.merged_cards[self._english_count:]),
+                                         protocol=pickle.HIGHEST_PROTOCOL)
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'sources': self._snapshot_sources,
+            'english_cards': self.english_cards,
+            'merged_cards': self.merged_cards[:self._english_count],
+            'japanese': japanese_blob
+        }
+        
+        try:
+            self._write_atomic(snapshot_path, pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+            print(f"[CardDataManager] ✓ Saved snapshot to {snapshot_path}")
+        except Exception as e:
+            print(f"[CardDataManager] ⚠ Could not save snapshot: {e}")
+    
+    def _section_path(self, name: str) -> Path:
+        return Path(get_data_dir()) / SECTION_FILENAME.format(name=name.replace(':', '-'))
+    
+    def _load_section_file(self, name: str) -> Optional[Tuple[int, bytes]]:
+        """(version, pickled bytes) of a section file written for the current snapshot."""
+        section_path = self._section_path(name)
+        if not self._sections_on_disk or not section_path.exists():
+            return None
+        try:
+            with open(section_path, 'rb') as f:
+                stored = pickle.load(f)
+        except Exception as e:
+            print(f"[CardDataManager] ⚠ Could not read snapshot section '{name}': {e}")
+            return None
+        if stored.get('version') != SNAPSHOT_VERSION or stored.get('sources') != self._snapshot_sources:
+            return None  # Written for other CSVs (e.g. by a tool that rebuilt the snapshot since)
+        return stored['section']
+    
+    def get_snapshot_section(self, name: str, version: int) -> Optional[Any]:
+        """Return data stored by a dependent layer (e.g. CardDatabaseLookup indexes).
+        
+        Each section has its own file next to the snapshot (read on first request),
+        pickled separately so loading the manager never imports their classes.
+        """
+        if self._db is not None:
+            row = self._db.execute("SELECT data FROM sections WHERE name = ?", (name,)).fetchone()
+            section = pickle.loads(row[0]) if row else None
+        else:
+            section = self._snapshot_sections.get(name)
+            if section is None:
+                section = self._load_section_file(name)
+                if section is not None:
+                    self._snapshot_sections[name] = section
+        if not section or section[0] != version:
+            return None
+        try:
+            return pickle.loads(section[1])
+        except Exception as e:
+            print(f"[CardDataManager] ⚠ Could not read snapshot section '{name}': {e}")
+            return None
+    
+    def store_snapshot_section(self, name: str, version: int, data: Any):
+        """Persist prebuilt data of a dependent layer alongside the merged cards (own file per section)."""
+        if not self.use_snapshot:
+            return
+        section = (version, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        if self._db is not None:
+            try:
+                self._db.execute("INSERT OR REPLACE INTO sections VALUES (?, ?)", (name, pickle.dumps(section)))
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"[CardDataManager] ⚠ Could not store snapshot section '{name}': {e}")
+            return
+        self._snapshot_sections[name] = section
+        stored = {'version': SNAPSHOT_VERSION, 'sources': self._snapshot_sources, 'section': section}
+        try:
+            self._write_atomic(self._section_path(name), pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            print(f"[CardDataManager] ⚠ Could not store snapshot section '{name}': {e}")
+    
+    # ========================================================================
+    # SQLITE STORAGE MODE
+    # ========================================================================
+    
+    def _sqlite_path(self) -> Path:
+        return Path(get_data_dir()) / SQLITE_FILENAME
+    
+    @staticmethod
+    def _connect_sqlite(path: Path) -> sqlite3.Connection:
+        db = sqlite3.connect(str(path), check_same_thread=False)
+        # Python's str.lower() (Unicode-aware) so results match the in-memory mode exactly
+        db.create_function('py_lower', 1, lambda v: v.lower() if v is not None else None, deterministic=True)
+        return db
+    
+    def _open_sqlite(self, force_rebuild: bool):
+        """Open data/card_db.sqlite, (re)building it from CSV when missing or stale."""
+        sqlite_path = self._sqlite_path()
+        if not force_rebuild and sqlite_path.exists():
+            start = time.perf_counter()
+            try:
+                db = self._connect_sqlite(sqlite_path)
+                meta = {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM meta")}
+                if (meta.get('schema_version') == SQLITE_SCHEMA_VERSION
+                        and self._snapshot_is_current(meta['sources'])):
+                    self._db = db
+                    self._fts_available = bool(meta['fts'])
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    print(f"[CardDataManager] ✓ Opened SQLite database {sqlite_path} in {elapsed_ms:.0f} ms")
+                    return
+                db.close()
+                print(f"[CardDataManager] Card database changed, rebuilding {sqlite_path}")
+            except (sqlite3.Error, KeyError, ValueError) as e:
+                print(f"[CardDataManager] ⚠ Could not read {sqlite_path} ({e}), rebuilding")
+        
+        self._build_sqlite(sqlite_path)
+    
+    def _build_sqlite(self, sqlite_path: Path):
+        """Load + merge the CSVs once and write them into an indexed SQLite file."""
+        sources = self._source_fingerprints()
         self._load_databases()
         self._merge_and_deduplicate()
-        self._build_index()
+        
+        os.makedirs(sqlite_path.parent, exist_ok=True)
+        # Own temp file per process (tools started together may rebuild at the same time)
+        with tempfile.NamedTemporaryFile(dir=sqlite_path.parent, prefix=sqlite_path.name + '.',
+                                         suffix='.tmp', delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+        
+        db = self._connect_sqlite(tmp_path)
+        db.execute(
+            'CREATE TABLE cards (id INTEGER PRIMARY KEY, name TEXT, "set" TEXT, number TEXT, type TEXT, '
+            'rarity TEXT, image_url TEXT, international_prints TEXT, cardmarket_url TEXT, _source TEXT, '
+            'category TEXT, name_lower TEXT, set_upper TEXT, type_lower TEXT)'
+        )
+        placeholders = ', '.join('?' * (len(CARD_FIELDS) + 4))
+        db.executemany(
+            f'INSERT INTO cards VALUES ({placeholders})',
+            (
+                (i,) + tuple(card.get(col) for col in CARD_FIELDS) + (
+                    card.get('name', '').lower(),
+                    card.get('set', '').upper(),
+                    card['type'].lower() if card.get('type') is not None else None
+                )
+                for i, card in enumerate(self.merged_cards)
+            )
+        )
+        db.execute("CREATE INDEX idx_cards_name ON cards(name_lower)")
+        db.execute("CREATE INDEX idx_cards_set ON cards(set_upper)")
+        db.execute("CREATE INDEX idx_cards_set_number ON cards(set_upper, number)")
+        
+        # Substring name search via FTS5 trigram index (SQLite 3.34+)
+        try:
+            db.execute(
+                "CREATE VIRTUAL TABLE cards_fts USING fts5("
+                "name_lower, content='cards', content_rowid='id', tokenize='trigram')"
+            )
+            db.execute("INSERT INTO cards_fts(cards_fts) VALUES ('rebuild')")
+            self._fts_available = True
+        except sqlite3.OperationalError as e:
+            print(f"[CardDataManager] ⚠ FTS5 trigram not available ({e}), name search uses table scan")
+            self._fts_available = False
+        
+        db.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")  # JSON values
+        db.executemany("INSERT INTO meta VALUES (?, ?)", [
+            (key, json.dumps(value)) for key, value in (
+                ('schema_version', SQLITE_SCHEMA_VERSION),
+                ('sources', sources),
+                ('fts', self._fts_available),
+                ('english_cards', len(self.english_cards)),
+                ('japanese_cards', len(self.japanese_cards))
+            )
+        ])
+        # Prebuilt data of dependent layers (store_snapshot_section): pickled (version, data)
+        db.execute("CREATE TABLE sections (name TEXT PRIMARY KEY, data BLOB)")
+        db.commit()
+        db.close()
+        
+        try:
+            os.replace(tmp_path, sqlite_path)
+        except OSError as e:
+            # Another tool still has the old file open (Windows) - use the fresh copy directly
+            print(f"[CardDataManager] ⚠ Could not replace {sqlite_path} ({e}), using {tmp_path}")
+            sqlite_path = tmp_path
+        
+        self._db = self._connect_sqlite(sqlite_path)
+        print(f"[CardDataManager] ✓ Built SQLite database {sqlite_path} ({len(self.merged_cards)} cards)")
+        
+        # Rows live in SQLite now - don't keep the dicts in memory
+        self.english_cards = []
+        self.japanese_cards = []
+        self.merged_cards = []
+    
+    def _query_cards(self, where: str = '', params: tuple = (), suffix: str = 'ORDER BY id') -> List[CardRecord]:
+        """Run a SELECT on the cards table and return CardRecords shaped like the CSV rows."""
+        columns = ', '.join(f'"{col}"' for col in CARD_FIELDS)
+        sql = f"SELECT {columns} FROM cards {'WHERE ' + where if where else ''} {suffix}"
+        return [_restore_card_record(row, None) for row in self._db.execute(sql, params)]
+    
+    def iter_card_groups(self, key: Callable[[str], str]) -> Iterator[Tuple[str, List[int], List[CardRecord]]]:
+        """SQLite mode: (key(name), ids, cards) per group of cards whose names share a key, ids ascending.
+        
+        Streams one group at a time, so a lookup layer can index every name without
+        holding all rows. Ids are the positions in get_all_cards().
+        """
+        self._db.create_function('group_key', 1, key, deterministic=True)
+        columns = ', '.join(f'"{col}"' for col in CARD_FIELDS)
+        rows = self._db.execute(f"SELECT group_key(name) AS k, id, {columns} FROM cards ORDER BY k, id")
+        group_key, ids, cards = None, [], []
+        for row in rows:
+            if row[0] != group_key and ids:
+                yield group_key, ids, cards
+                ids, cards = [], []
+            group_key = row[0]
+            ids.append(row[1])
+            cards.append(_restore_card_record(row[2:], None))
+        if ids:
+            yield group_key, ids, cards
+    
+    def get_cards_by_ids(self, ids: Iterable[int]) -> List[CardRecord]:
+        """SQLite mode: the cards with these ids (positions in get_all_cards()), in the given order."""
+        ids = list(ids)
+        columns = ', '.join(f'"{col}"' for col in CARD_FIELDS)
+        by_id = {}
+        for start in range(0, len(ids), 500):  # Stay below SQLite's bound-parameter limit
+            chunk = ids[start:start + 500]
+            sql = f"SELECT id, {columns} FROM cards WHERE id IN ({', '.join('?' * len(chunk))})"
+            by_id.update((row[0], _restore_card_record(row[1:], None)) for row in self._db.execute(sql, chunk))
+        return [by_id[i] for i in ids]
+    
+    def _name_filter(self, query_lower: str) -> Tuple[str, tuple]:
+        """WHERE clause for a case-insensitive name substring (FTS narrows, instr verifies)."""
+        if self._fts_available and len(query_lower) >= 3:
+            phrase = '"' + query_lower.replace('"', '""') + '"'
+            return ("id IN (SELECT rowid FROM cards_fts WHERE cards_fts MATCH ?) AND instr(name_lower, ?) > 0",
+                    (phrase, query_lower))
+        return "instr(name_lower, ?) > 0", (query_lower,)
+    
+    # ========================================================================
+    # CSV LOADING
+    # ========================================================================
     
     def _load_databases(self):
         """Load both English and Japanese card databases."""
-        data_dir = get_data_dir()
-        
-        # Load English cards
-        english_path = Path(data_dir) / 'all_cards_database.csv'
+        self._load_english_database()
+        self.japanese_cards = self._load_japanese_database()
+    
+    def _load_english_database(self):
+        """Load the English card database."""
+        english_path = Path(get_data_dir()) / 'all_cards_database.csv'
         if english_path.exists():
             self.english_cards = self._load_csv(english_path)
             print(f"[CardDataManager] ✓ Loaded {len(self.english_cards)} English cards")
         else:
             print(f"[CardDataManager] ⚠ English database not found at {english_path}")
-        
-        # Load Japanese cards
-        japanese_path = Path(data_dir) / 'japanese_cards_database.csv'
-        if japanese_path.exists():
-            self.japanese_cards = self._load_csv(japanese_path)
-            print(f"[CardDataManager] ✓ Loaded {len(self.japanese_cards)} Japanese cards")
-        else:
+    
+    def _load_japanese_database(self) -> List[CardRecord]:
+        """Load the Japanese card database."""
+        japanese_path = Path(get_data_dir()) / 'japanese_cards_database.csv'
+        if not japanese_path.exists():
             print(f"[CardDataManager] ⚠ Japanese database not found at {japanese_path}")
+            return []
+        japanese_cards = self._load_csv(japanese_path)
+        print(f"[CardDataManager] ✓ Loaded {len(japanese_cards)} Japanese cards")
+        return japanese_cards
     
-    def _load_csv(self, filepath: Path) -> List[Dict[str, str]]:
+    def _load_csv(self, filepath: Path) -> List[CardRecord]:
         """Load cards from CSV file."""
         cards = []
         try:
@@ -84,7 +688,7 @@ class CardDataManager:
                 reader = csv.DictReader(f)
                 for row in reader:
                     if row.get('name'):  # Skip empty rows
-                        cards.append(row)
+                        cards.append(CardRecord(row))
         except Exception as e:
             print(f"[CardDataManager] ERROR loading {filepath}: {e}")
         return cards
@@ -94,37 +698,65 @@ class CardDataManager:
         Merge English and Japanese cards with deduplication.
         Priority: English preferred, Japanese as fallback for newer cards.
         """
-        seen_keys = set()
+        self._merge_english()
+        self._attach_japanese(*self._split_japanese(self.japanese_cards))
         
-        # Add English cards first (priority)
+        print(f"[CardDataManager] ✓ Merged to {len(self.merged_cards)} unique cards")
+        print(f"[CardDataManager]   - {len(self.english_cards)} from English DB")
+        print(f"[CardDataManager]   - {len(self.japanese_cards) - (len(self.merged_cards) - len(self.english_cards))} Japanese-only")
+    
+    @staticmethod
+    def _assign_category(card: CardRecord):
+        """Precompute the Pokemon/Trainer/Energy category column for a card."""
+        card['category'] = card_category((card.get('type') or '').strip())
+    
+    def _merge_english(self):
+        """English part of the merged list (first print per set/number wins) + index."""
+        seen_keys = set()
+        self.merged_cards = []
         for card in self.english_cards:
             key = (card.get('set', ''), card.get('number', ''))
             if key and key not in seen_keys:
+                self._assign_category(card)
                 self.merged_cards.append(card)
                 seen_keys.add(key)
-        
-        # Add Japanese cards not already in English
-        for card in self.japanese_cards:
+        self._english_count = len(self.merged_cards)
+        self._build_index()
+    
+    def _split_japanese(self, japanese_cards: List[CardRecord]) -> Tuple[List[CardRecord], List[CardRecord]]:
+        """Pick the Japanese cards not already in the English part (marked '_source' = 'japanese')."""
+        seen_keys = {(card.get('set', ''), card.get('number', '')) for card in self.merged_cards[:self._english_count]}
+        japanese_only = []
+        for card in japanese_cards:
             key = (card.get('set', ''), card.get('number', ''))
             if key and key not in seen_keys:
                 # Mark as Japanese-only
                 card['_source'] = 'japanese'
-                self.merged_cards.append(card)
+                self._assign_category(card)
+                japanese_only.append(card)
                 seen_keys.add(key)
-        
-        print(f"[CardDataManager] ✓ Merged to {len(self.merged_cards)} unique cards")
-        print(f"[CardDataManager]   - {len(self.english_cards)} from English DB")
-        print(f"[CardDataManager]   - {len(self.japanese_cards) - (len(self.merged_cards) - len(self.english_cards))} Japanese-only")
+        return japanese_cards, japanese_only
+    
+    def _attach_japanese(self, japanese_cards: List[CardRecord], japanese_only: List[CardRecord]):
+        """Append the Japanese-only cards after the English part (same order as a full merge)."""
+        self.japanese_cards = japanese_cards
+        self.merged_cards.extend(japanese_only)
+        for card in japanese_only:
+            self._index_card(card)
+        self.japanese_loaded = True
+    
+    def _index_card(self, card: CardRecord):
+        key = (card.get('set', '').upper(), card.get('number', ''))
+        if key[0] and key[1]:
+            self.card_index[key] = card
     
     def _build_index(self):
         """Build lookup index for O(1) card access."""
         self.card_index = {}
         for card in self.merged_cards:
-            key = (card.get('set', '').upper(), card.get('number', ''))
-            if key[0] and key[1]:
-                self.card_index[key] = card
+            self._index_card(card)
     
-    def get_card(self, set_code: str, number: str) -> Optional[Dict[str, str]]:
+    def get_card(self, set_code: str, number: str) -> Optional[CardRecord]:
         """
         Get a specific card by set code and number.
         
@@ -136,9 +768,18 @@ class CardDataManager:
             Card dictionary or None if not found
         """
         key = (set_code.upper(), number)
-        return self.card_index.get(key)
+        if self._db is not None:
+            if not (key[0] and key[1]):
+                return None
+            # Last row wins, like the dict index
+            rows = self._query_cards("set_upper = ? AND number = ?", key, 'ORDER BY id DESC LIMIT 1')
+            return rows[0] if rows else None
+        card = self.card_index.get(key)
+        if card is None and self.require_japanese():
+            card = self.card_index.get(key)
+        return card
     
-    def get_card_by_name_and_set(self, name: str, set_code: str) -> Optional[Dict[str, str]]:
+    def get_card_by_name_and_set(self, name: str, set_code: str) -> Optional[CardRecord]:
         """
         Get a card by name and set code (when number is unknown).
         Returns the first match.
@@ -150,13 +791,22 @@ class CardDataManager:
         Returns:
             Card dictionary or None if not found
         """
+        if self._db is not None:
+            rows = self._query_cards("name_lower = ? AND set_upper = ?",
+                                     (name.lower(), set_code.upper()), 'ORDER BY id LIMIT 1')
+            return rows[0] if rows else None
+        
         for card in self.merged_cards:
             if (card.get('name', '').lower() == name.lower() and 
                 card.get('set', '').upper() == set_code.upper()):
                 return card
+        
+        # Miss in the English part - retry once with the Japanese cards merged
+        if self.require_japanese():
+            return self.get_card_by_name_and_set(name, set_code)
         return None
     
-    def search_cards(self, query: str, field: str = 'name') -> List[Dict[str, str]]:
+    def search_cards(self, query: str, field: str = 'name') -> List[CardRecord]:
         """
         Search for cards by name or other field.
         
@@ -170,6 +820,18 @@ class CardDataManager:
         results = []
         query_lower = query.lower()
         
+        if self._db is not None:
+            field = CardRecord._ALIASES.get(field, field)
+            if field not in CARD_FIELDS:
+                return results
+            if field == 'name':
+                where, params = self._name_filter(query_lower)
+            else:
+                where, params = f'instr(py_lower("{field}"), ?) > 0', (query_lower,)
+            return self._query_cards(where, params)
+        
+        # Substring search can't tell a miss from a partial result - always search everything
+        self.require_japanese()
         for card in self.merged_cards:
             if field in card and query_lower in card[field].lower():
                 results.append(card)
@@ -177,7 +839,7 @@ class CardDataManager:
         return results
     
     def search_cards_advanced(self, name: str = None, set_code: str = None, 
-                             card_type: str = None) -> List[Dict[str, str]]:
+                             card_type: str = None) -> List[CardRecord]:
         """
         Advanced search with multiple criteria.
         
@@ -189,6 +851,21 @@ class CardDataManager:
         Returns:
             List of matching cards
         """
+        if self._db is not None:
+            clauses, params = [], ()
+            if name:
+                where, name_params = self._name_filter(name.lower())
+                clauses.append(where)
+                params += name_params
+            if set_code:
+                clauses.append("set_upper = ?")
+                params += (set_code.upper(),)
+            if card_type:
+                clauses.append("instr(type_lower, ?) > 0")
+                params += (card_type.lower(),)
+            return self._query_cards(' AND '.join(clauses), params)
+        
+        self.require_japanese()
         results = self.merged_cards
         
         if name:
@@ -202,12 +879,37 @@ class CardDataManager:
         
         return results
     
-    def get_all_cards(self) -> List[Dict[str, str]]:
-        """Get all merged cards."""
+    def get_all_cards(self, require_japanese: bool = True) -> List[CardRecord]:
+        """Get all merged cards (SQLite mode: materialized from the database).
+        
+        Args:
+            require_japanese: False returns only what is loaded so far (English part
+                              until require_japanese()) - for layers that index lazily
+        """
+        if self._db is not None:
+            return self._query_cards()
+        if require_japanese:
+            self.require_japanese()
         return self.merged_cards
     
     def get_stats(self) -> Dict[str, int]:
         """Get database statistics."""
+        if self._db is not None:
+            meta = {key: json.loads(value) for key, value in self._db.execute(
+                "SELECT key, value FROM meta WHERE key IN ('english_cards', 'japanese_cards')"
+            )}
+            total, with_image, unique_sets = self._db.execute(
+                "SELECT COUNT(*), COUNT(NULLIF(image_url, '')), COUNT(DISTINCT NULLIF(\"set\", '')) FROM cards"
+            ).fetchone()
+            return {
+                'total_cards': total,
+                'english_cards': meta['english_cards'],
+                'japanese_cards': meta['japanese_cards'],
+                'cards_with_image_url': with_image,
+                'unique_sets': unique_sets
+            }
+        
+        self.require_japanese()
         return {
             'total_cards': len(self.merged_cards),
             'english_cards': len(self.english_cards),
@@ -218,7 +920,8 @@ class CardDataManager:
     
     def export_merged_csv(self, output_path: str = 'data/cards_merged.csv'):
         """Export merged database to CSV."""
-        if not self.merged_cards:
+        cards = self.get_all_cards()
+        if not cards:
             print(f"[CardDataManager] ERROR: No cards to export")
             return False
         
@@ -231,10 +934,10 @@ class CardDataManager:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
                 
-                for card in self.merged_cards:
+                for card in cards:
                     writer.writerow({field: card.get(field, '') for field in fieldnames})
             
-            print(f"[CardDataManager] ✓ Exported {len(self.merged_cards)} cards to {output_path}")
+            print(f"[CardDataManager] ✓ Exported {len(cards)} cards to {output_path}")
             return True
         except Exception as e:
             print(f"[CardDataManager] ERROR exporting CSV: {e}")
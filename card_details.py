@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Card Details - Fields of a Limitless Card Page
+==============================================
+The fields the card tools read from https://limitlesstcg.com/cards/<SET>/<NUMBER>:
+image URL, rarity, international prints and the Cardmarket link + EUR price of the current print.
+
+Two extractors with the same result:
+- parse_card_page(html): plain HTML (HTMLParser) - the page is server-rendered, so a
+  simple GET is enough (used by all_cards_scraper's "http" detail mode)
+- read_card_page(driver): Selenium WebDriver on an already loaded page - one injected
+  script (CARD_PAGE_SCRIPT) returns every field in a single WebDriver round-trip
+
+apply_card_details() writes a result (or a selection of its fields) into a card row of
+all_cards_database.csv.
+"""
+
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urljoin
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+# Language prefixes in print links (/cards/en/SET/NUM)
+PRINT_LANGUAGES = ('en', 'de', 'fr', 'es', 'it', 'pt', 'ja', 'ko')
+
+# Promo sets: cards without a rarity on the page get rarity "Promo"
+PROMO_SETS = ('MEP', 'SVP', 'SP', 'SMP', 'XYP', 'BWP', 'HSP', 'DPP', 'NP', 'WP',
+              'POP', 'SWSH', 'SWSHP', 'PR-SW', 'PR-SM', 'PR-XY', 'PR-BLW', 'PR-HS', 'PR-DP')
+
+
+class CardDetails(NamedTuple):
+    """Fields of one card page ('' / () if the page doesn't show them)."""
+    image_url: str
+    rarity: str  # e.g. "Double Rare" (from "#130 · Double Rare")
+    international_prints: Tuple[str, ...]  # "SET-NUM" of the other prints (JP excluded)
+    cardmarket_url: str  # Cardmarket link of the current print
+    has_prints_table: bool
+    eur_price: str = ''  # Text of the current print's EUR price link, e.g. "2.50€"
+
+
+def print_id_from_href(href: str) -> Optional[str]:
+    """'SET-NUM' from a print link (/cards/SET/NUM or /cards/en/SET/NUM), None for other links / JP prints."""
+    if not href or '/cards/' not in href:
+        return None
+    parts = href.split('/cards/')[-1].split('?')[0].strip().split('/')
+    if len(parts) >= 3 and parts[0].lower() in PRINT_LANGUAGES:
+        set_code, number = parts[1].upper(), parts[2]
+    elif len(parts) >= 2:
+        set_code, number = parts[0].upper(), parts[1]
+    else:
+        return None
+    if set_code == 'JP' or not number:
+        return None
+    return f"{set_code}-{number}"
+
+
+def rarity_from_text(text: str) -> str:
+    """'Double Rare' from the print details line '#130 · Double Rare'."""
+    return text.split('·')[1].strip() if '·' in text else ''
+
+
+# ============================================================================
+# HTML EXTRACTION
+# ============================================================================
+
+class CardPageParser(HTMLParser):
+    """Collects the card page fields in one pass over the HTML.
+
+    Mirrors the Selenium selectors:
+        img.card.shadow.resp-w                                   -> image_url
+        .card-prints-current .prints-current-details span        -> rarity (second span)
+        table.card-prints-versions tbody tr (td:first-child a)   -> international prints
+        tr.current a.card-price.eur                              -> cardmarket_url, eur_price
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.image_url = ''
+        self.detail_spans: List[List[str]] = []  # Text of every span in .prints-current-details
+        self.prints: List[str] = []
+        self.cardmarket_url = ''
+        self.eur_price = ''
+        self.has_prints_table = False
+
+        self._div_depth = 0
+        self._current_div = 0  # Depth of .card-prints-current (0 = outside)
+        self._details_div = 0  # Depth of .prints-current-details inside it
+        self._open_spans: List[int] = []  # Indexes into detail_spans
+        self._table_depth = 0  # Nesting inside table.card-prints-versions
+        self._in_tbody = False
+        self._row: Optional[Dict] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        attributes = dict(attrs)
+        classes = (attributes.get('class') or '').split()
+
+        if tag == 'div':
+            self._div_depth += 1
+            if not self._current_div and 'card-prints-current' in classes:
+                self._current_div = self._div_depth
+            elif self._current_div and not self._details_div and 'prints-current-details' in classes:
+                self._details_div = self._div_depth
+        elif tag == 'span' and self._details_div:
+            self.detail_spans.append([])
+            self._open_spans.append(len(self.detail_spans) - 1)
+        elif tag == 'img' and not self.image_url and {'card', 'shadow', 'resp-w'} <= set(classes):
+            self.image_url = attributes.get('src') or ''
+        elif tag == 'table':
+            if self._table_depth:
+                self._table_depth += 1
+            elif 'card-prints-versions' in classes:
+                self._table_depth = 1
+                self.has_prints_table = True
+        elif self._table_depth == 1:
+            if tag == 'tbody':
+                self._in_tbody = True
+            elif tag == 'tr' and self._in_tbody:
+                self._row = {'current': 'current' in classes, 'has_th': False, 'cells': 0, 'print': None,
+                             'eur': '', 'eur_text': [], 'in_eur': False}
+            elif self._row is not None:
+                if tag == 'th':
+                    self._row['has_th'] = True
+                elif tag == 'td':
+                    self._row['cells'] += 1
+                elif tag == 'a':
+                    href = attributes.get('href') or ''
+                    if self._row['cells'] == 1 and self._row['print'] is None and '/cards/' in href:
+                        self._row['print'] = href
+                    if 'card-price' in classes and 'eur' in classes and not self._row['eur']:
+                        self._row['eur'] = href
+                        self._row['in_eur'] = True
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'div':
+            if self._details_div == self._div_depth:
+                self._details_div = 0
+                self._open_spans.clear()
+            if self._current_div == self._div_depth:
+                self._current_div = 0
+            self._div_depth -= 1
+        elif tag == 'span' and self._open_spans:
+            self._open_spans.pop()
+        elif tag == 'table' and self._table_depth:
+            self._table_depth -= 1
+            self._in_tbody = False
+        elif self._table_depth == 1:
+            if tag == 'tbody':
+                self._in_tbody = False
+            elif tag == 'tr' and self._row is not None:
+                self._finish_row()
+            elif tag == 'a' and self._row is not None:
+                self._row['in_eur'] = False
+
+    def handle_data(self, data: str) -> None:
+        for index in self._open_spans:  # textContent includes nested spans
+            self.detail_spans[index].append(data)
+        if self._row is not None and self._row['in_eur']:
+            self._row['eur_text'].append(data)
+
+    def _finish_row(self):
+        row, self._row = self._row, None
+        if row['has_th']:
+            return
+        print_id = print_id_from_href(row['print'])
+        if print_id and print_id not in self.prints:
+            self.prints.append(print_id)
+        if row['current'] and row['eur'] and not self.cardmarket_url:
+            self.cardmarket_url = row['eur']
+            self.eur_price = ' '.join(''.join(row['eur_text']).split())
+
+    def close(self):
+        super().close()
+        if self._row is not None:
+            self._finish_row()  # Missing </tr> at the end of the table
+
+
+def parse_card_page(html: str, page_url: str = '') -> Optional[CardDetails]:
+    """Card fields from the HTML of a card page. None if it isn't a (complete) card page,
+    e.g. an error page or a page without the card image (-> Selenium fallback)."""
+    parser = CardPageParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.image_url:
+        return None
+
+    rarity = ''
+    if len(parser.detail_spans) >= 2:
+        rarity = rarity_from_text(''.join(parser.detail_spans[1]).strip())
+
+    cardmarket_url = urljoin(page_url, parser.cardmarket_url) if parser.cardmarket_url else ''
+    return CardDetails(urljoin(page_url, parser.image_url), rarity, tuple(parser.prints),
+                       cardmarket_url, parser.has_prints_table, parser.eur_price)
+
+
+# ============================================================================
+# SELENIUM EXTRACTION
+# ============================================================================
+
+# Same selectors as CardPageParser. Returns plain JSON values (strings, list, bool);
+# src / href are the resolved absolute URLs, like WebElement.get_attribute() returns them.
+CARD_PAGE_SCRIPT = """
+const image = document.querySelector('img.card.shadow.resp-w');
+const spans = document.querySelectorAll('.card-prints-current .prints-current-details span');
+const table = document.querySelector('table.card-prints-versions');
+const printLinks = [];
+let cardmarketUrl = '', eurPrice = '';
+if (table) {
+    for (const row of table.querySelectorAll('tbody tr')) {
+        if (row.querySelector('th')) continue;
+        const link = row.querySelector("td:first-child a[href*='/cards/']");
+        if (link) printLinks.push(link.href);
+        if (!cardmarketUrl && row.classList.contains('current')) {
+            const eur = row.querySelector('a.card-price.eur');
+            if (eur && eur.href) {
+                cardmarketUrl = eur.href;
+                eurPrice = eur.textContent.trim().replace(/\\s+/g, ' ');
+            }
+        }
+    }
+}
+return {
+    image_url: (image && image.src) || '',
+    rarity_text: spans.length >= 2 ? spans[1].textContent.trim() : '',
+    print_links: printLinks,
+    cardmarket_url: cardmarketUrl,
+    eur_price: eurPrice,
+    has_prints_table: !!table
+};
+"""
+
+
+def card_details_from_script(data: Dict) -> CardDetails:
+    """CardDetails from the JSON object returned by CARD_PAGE_SCRIPT."""
+    prints: List[str] = []
+    for href in data.get('print_links') or ():
+        print_id = print_id_from_href(href)
+        if print_id and print_id not in prints:
+            prints.append(print_id)
+    return CardDetails(data.get('image_url') or '', rarity_from_text(data.get('rarity_text') or ''), tuple(prints),
+                       data.get('cardmarket_url') or '', bool(data.get('has_prints_table')),
+                       data.get('eur_price') or '')
+
+
+def read_card_page(driver) -> CardDetails:
+    """Card fields from the page loaded in a Selenium WebDriver (same selectors as CardPageParser).
+
+    One execute_script call instead of a find_element / get_attribute round-trip per element
+    and table row. Missing elements give empty fields; WebDriver errors are raised.
+    """
+    return card_details_from_script(driver.execute_script(CARD_PAGE_SCRIPT) or {})
+
+
+# ============================================================================
+# CARD ROWS
+# ============================================================================
+
+# Card DB columns (all_cards_database.csv) filled from a card page
+CARD_FIELDS = ('image_url', 'rarity', 'international_prints', 'cardmarket_url')
+
+
+def apply_card_details(card: Dict[str, str], details: CardDetails, fields: Sequence[str] = CARD_FIELDS):
+    """Write the selected page fields into a card row (default: image_url, rarity,
+    international_prints, cardmarket_url).
+
+    The card's own print is always part of international_prints; promo cards without
+    a rarity get "Promo".
+    """
+    if 'image_url' in fields and details.image_url:
+        card['image_url'] = details.image_url
+    if 'rarity' in fields:
+        if details.rarity:
+            card['rarity'] = details.rarity
+        if card.get('set') in PROMO_SETS and not card.get('rarity'):
+            card['rarity'] = 'Promo'
+
+    if 'international_prints' in fields:
+        prints = set(details.international_prints)
+        prints.add(f"{card['set']}-{card['number']}")
+        card['international_prints'] = ','.join(sorted(prints))
+    if 'cardmarket_url' in fields:
+        card['cardmarket_url'] = details.cardmarket_url
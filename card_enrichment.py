@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Card Enrichment - One Visit per Limitless Card Page
+===================================================
+all_cards_scraper, update_int_prints and card_price_scraper need fields of the same page
+(https://limitlesstcg.com/cards/<SET>/<NUMBER>). This stage opens each page once, reads
+every field (card_details.CardDetails) and writes the selected ones:
+
+- card DB fields (all_cards_database.csv rows): image_url, rarity, international_prints, cardmarket_url
+- price field (price_data.csv rows): eur_price, together with the Cardmarket link, last_updated
+  and price_source 'limitless' (card_price_scraper writes 'cardmarket' for Cardmarket direct prices)
+
+Pages are fetched over plain HTTP (FetchEngine, parallel + rate-controlled) and parsed;
+pages that can't be fetched or parsed are loaded in Chrome by the browser pool.
+detail_fetch_mode "selenium" loads every page in Chrome.
+
+Usage:
+    enrichment = CardEnrichment(settings, fields=('international_prints',), log_prefix="[Int. Prints]")
+    for item in enrichment.run(cards):      # item.card already has the selected fields
+        print(item.card['name'], item.ok)
+
+    enrichment = CardEnrichment(settings, fields=ALL_FIELDS, price_csv='data/price_data.csv')
+    ...
+    enrichment.save_prices()                # price_data.csv (existing rows are kept)
+"""
+
+import csv
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from browser_pool import BrowserPool, selenium_available, short_error
+from card_details import CARD_FIELDS, CardDetails, apply_card_details, parse_card_page, read_card_page
+from http_client import FetchEngine, configure_http, configure_rate_limit, fetch_summary, get_client, save_fetch_telemetry
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+PRICE_FIELDS = ('eur_price',)
+ALL_FIELDS = CARD_FIELDS + PRICE_FIELDS
+
+PRICE_CSV_FIELDS = ['name', 'set', 'number', 'eur_price', 'cardmarket_url', 'last_updated', 'price_source']
+
+# price_source values ('' = row written before the column existed)
+PRICE_SOURCE_LIMITLESS = 'limitless'
+PRICE_SOURCE_CARDMARKET = 'cardmarket'
+
+
+class Enriched(NamedTuple):
+    """One card after its page visit."""
+    card: Dict[str, str]  # Selected fields already written
+    details: Optional[CardDetails]  # None if the page could not be read
+    source: str  # 'http' or 'selenium'
+    error: str = ''
+
+    @property
+    def ok(self) -> bool:
+        return self.details is not None
+
+
+def card_page_url(card: Dict[str, str]) -> str:
+    """Absolute card page URL: card_url (may be relative) or /cards/SET/NUMBER."""
+    card_url = card.get('card_url') or ''
+    if card_url.startswith('/'):
+        return f"https://limitlesstcg.com{card_url}"
+    if card_url:
+        return card_url
+    return f"https://limitlesstcg.com/cards/{card['set']}/{card['number']}"
+
+
+# ============================================================================
+# PRICE DATA (price_data.csv)
+# ============================================================================
+
+def price_key(card: Dict[str, str]) -> str:
+    return f"{card.get('set', '')}_{card.get('number', '')}"
+
+
+def load_price_rows(csv_path: str) -> Dict[str, Dict[str, str]]:
+    """Rows of price_data.csv by SET_NUMBER (file order)."""
+    rows: Dict[str, Dict[str, str]] = {}
+    if not os.path.isfile(csv_path):
+        return rows
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            if row:
+                rows[price_key(row)] = {field: (row.get(field) or '').strip() for field in PRICE_CSV_FIELDS}
+    return rows
+
+
+def save_price_rows(rows: Iterable[Dict[str, str]], csv_path: str) -> int:
+    """Write price_data.csv. Returns the number of rows."""
+    count = 0
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PRICE_CSV_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def price_row(card: Dict[str, str], details: CardDetails) -> Dict[str, str]:
+    """price_data.csv row for a read card page (empty eur_price = page has no price)."""
+    return {
+        'name': card.get('name', ''),
+        'set': card.get('set', ''),
+        'number': card.get('number', ''),
+        'eur_price': details.eur_price,
+        'cardmarket_url': details.cardmarket_url or card.get('cardmarket_url', ''),
+        'last_updated': datetime.now().isoformat(),
+        'price_source': PRICE_SOURCE_LIMITLESS
+    }
+
+
+# ============================================================================
+# ENRICHMENT STAGE
+# ============================================================================
+
+class CardEnrichment:
+    """
+    Visit each card page once and write the selected fields.
+
+    fields: any of ALL_FIELDS. Card DB fields go into the card rows (apply_card_details),
+    eur_price updates self.prices (price_data.csv rows, loaded from price_csv); a page that could
+    not be read writes no price row, so price runs pick the card up again.
+    Settings: detail_fetch_mode, max_parallel_requests, requests_per_second,
+    max_requests_per_second + the browser pool keys (browser_pool.BrowserPool.from_settings).
+    """
+
+    def __init__(self, settings: Dict, fields: Sequence[str] = ALL_FIELDS, price_csv: Optional[str] = None,
+                 log_prefix: str = "[Card Enrichment]"):
+        unknown = set(fields) - set(ALL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown enrichment fields: {', '.join(sorted(unknown))}")
+        self.settings = settings
+        self.fields = tuple(fields)
+        self.card_fields = tuple(field for field in self.fields if field in CARD_FIELDS)
+        self.price_csv = price_csv
+        self.prices = load_price_rows(price_csv) if price_csv and 'eur_price' in self.fields else {}
+        self.log_prefix = log_prefix
+        self.mode = str(settings.get('detail_fetch_mode', 'http')).lower()
+        self.counts = {'http': 0, 'selenium': 0, 'failed': 0}
+
+    def log(self, message: str):
+        print(f"{self.log_prefix} {message}")
+
+    def _apply(self, card: Dict[str, str], details: Optional[CardDetails], source: str, error: str = '') -> Enriched:
+        if details is None:
+            self.counts['failed'] += 1
+            # Own print as int. prints fallback (never overwrite prints found earlier)
+            if 'international_prints' in self.card_fields and not card.get('international_prints'):
+                card['international_prints'] = f"{card['set']}-{card['number']}"
+        else:
+            self.counts[source] += 1
+            apply_card_details(card, details, self.card_fields)
+            if 'eur_price' in self.fields:
+                self.prices[price_key(card)] = price_row(card, details)
+        return Enriched(card, details, source, error)
+
+    def run(self, cards: Iterable[Dict[str, str]]) -> Iterator[Enriched]:
+        """Visit the page of every card (needs card_url or set + number) and yield it once enriched.
+
+        HTTP results come in completion order, the Chrome fallback in card order.
+        """
+        todo = [card for card in cards if card.get('card_url') or (card.get('set') and card.get('number'))]
+        if not todo:
+            return
+        selenium_cards = todo
+        if self.mode == 'http':
+            failed: List[Tuple[int, Dict[str, str]]] = []
+            for index, card, details, error in self._fetch_http(todo):
+                if details is None:
+                    self.log(f"{card['name']} ({card['set']} {card['number']}): {error} - Selenium fallback")
+                    failed.append((index, card))
+                    continue
+                yield self._apply(card, details, 'http')
+            selenium_cards = [card for _, card in sorted(failed, key=lambda item: item[0])]
+        if selenium_cards:
+            yield from self._load_selenium(selenium_cards)
+
+    def _fetch_http(self, cards: List[Dict[str, str]]) -> Iterator[Tuple[int, Dict[str, str], Optional[CardDetails], str]]:
+        configure_http(self.settings)
+        engine = FetchEngine.from_settings(self.settings)
+        self.log(f"HTTP detail mode: {len(cards)} pages, {engine.max_workers} parallel "
+                 f"({get_client().rate.describe()})")
+        started = time.time()
+        done = 0
+        for outcome in engine.fetch_all(card_page_url(card) for card in cards):
+            details = parse_card_page(outcome.text, outcome.url) if outcome.ok else None
+            if details is not None:
+                done += 1
+            error = '' if details is not None else (str(outcome.error) if not outcome.ok else "page did not parse")
+            yield outcome.index, cards[outcome.index], details, error
+
+        elapsed = time.time() - started
+        self.log(f"HTTP detail mode: {done} cards in {elapsed:.0f}s "
+                 f"({done / elapsed * 60 if elapsed else 0:.0f} cards/min), {len(cards) - done} for Selenium")
+        print(fetch_summary())
+        save_fetch_telemetry()
+
+    def _load_selenium(self, cards: List[Dict[str, str]]) -> Iterator[Enriched]:
+        if not selenium_available():
+            self.log(f"Selenium not available - {len(cards)} cards without page details (pip install selenium)")
+            for card in cards:
+                yield self._apply(card, None, 'selenium', "Selenium not available")
+            return
+
+        configure_rate_limit(self.settings)  # Shared by all browsers of the pool
+        pool = BrowserPool.from_settings(self.settings, log_prefix=self.log_prefix)
+        self.log(f"Chrome for {len(cards)} cards - browser pool: {pool.describe()}")
+        for outcome in pool.load_all((card_page_url(card) for card in cards), read_card_page):
+            error = '' if outcome.ok else short_error(outcome.error)
+            yield self._apply(cards[outcome.index], outcome.result if outcome.ok else None, 'selenium', error)
+
+    def save_prices(self) -> int:
+        """Write the price rows to price_csv (no-op without eur_price / price_csv)."""
+        if not self.price_csv or 'eur_price' not in self.fields:
+            return 0
+        count = save_price_rows(self.prices.values(), self.price_csv)
+        self.log(f"OK: Saved {count} prices to {self.price_csv}")
+        return count
+
+    def summary(self) -> str:
+        return (f"{self.counts['http']} pages via HTTP, {self.counts['selenium']} via Chrome, "
+                f"{self.counts['failed']} failed")
@@ -4,6 +4,17 @@ Card Price Scraper - Update EUR prices from Limitless TCG
 ==========================================================
 Fast scraper that only updates Cardmarket EUR prices for existing cards.
 Reads from all_cards_database.csv and updates price_data.csv.
+
+Source order (setting price_source_order):
+- "cardmarket_first" (default): Cardmarket direct (Chrome) for cards with a cardmarket_url,
+  the Limitless card page for all other cards and for cards without a Cardmarket price.
+- "limitless_first": the Limitless card page first, Cardmarket direct only for cards whose
+  Limitless page has no price (saves a Cardmarket page load for most cards).
+The Limitless price is read by card_enrichment (eur_price field: HTTP first, browser pool fallback).
+
+skip_cards_with_prices skips cards whose row has a price. With cardmarket_first (and Selenium),
+Limitless prices of cards with a cardmarket_url (price_source 'limitless', e.g. written by
+all_cards_scraper) are checked again on Cardmarket.
 """
 
 import csv
@@ -12,7 +23,11 @@ import os
 import sys
 import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Set
+
+from browser_pool import create_browser, is_session_error, quit_browser, selenium_available
+from card_enrichment import (PRICE_FIELDS, PRICE_SOURCE_CARDMARKET, PRICE_SOURCE_LIMITLESS, CardEnrichment, price_key,
+                             save_price_rows)
 
 # Fix Windows console encoding for Unicode characters
 if sys.platform == 'win32':
@@ -27,24 +42,40 @@ if sys.platform == 'win32':
         except Exception:
             pass
 
-# Selenium imports (only loaded when needed)
-try:
-    from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.chrome.options import Options
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
+# Selenium (only loaded when needed)
+SELENIUM_AVAILABLE = selenium_available()
+if not SELENIUM_AVAILABLE:
     print("WARNING: Selenium not available. Install with: pip install selenium")
 
+# Cardmarket product page: "From" price in dd.col-6.col-xl-7, fallback .price-container .text-right
+# (innerText = what WebElement.text returns)
+CARDMARKET_PRICE_SCRIPT = """
+for (const dd of document.querySelectorAll('dd.col-6.col-xl-7')) {
+    const text = dd.innerText.trim();
+    if (text.includes('€')) return {eur_price: text, fallback: false};
+}
+const fallback = document.querySelector('.price-container .text-right');
+return {eur_price: fallback ? fallback.innerText.trim() : '', fallback: true};
+"""
+
 # Default settings
 DEFAULT_SETTINGS: Dict[str, object] = {
     "delay_seconds": 0.5,
     "headless": True,
     "batch_size": 100,
-    "skip_cards_with_prices": True
+    "skip_cards_with_prices": True,
+    "lean_browser": True,  # Chrome without images / fonts / media / trackers, eager page load
+    "detail_fetch_mode": "http",  # "http" = plain HTTP + parse, Selenium fallback; "selenium" = browser only
+    "max_parallel_requests": 4,
+    "requests_per_second": 2.0,
+    "max_requests_per_second": 4.0,
+    "browser_workers": 2,
+    "browser_page_budget": 1000,
+    "price_source_order": "cardmarket_first"  # or "limitless_first" (Cardmarket direct only as fallback)
 }
 
+PRICE_SOURCE_ORDERS = ("cardmarket_first", "limitless_first")
+
 def get_app_dir() -> str:
     """Get the directory where the script is located."""
     if getattr(sys, 'frozen', False):
@@ -116,220 +147,136 @@ def load_cards_to_update(csv_path: str) -> List[Dict[str, str]]:
     print(f"[Price Scraper] Loaded {len(cards)} cards from database")
     return cards
 
-def load_existing_prices(csv_path: str) -> Dict[str, Dict[str, str]]:
-    """Load existing prices from price_data.csv."""
-    if not os.path.isfile(csv_path):
-        return {}
-    
-    prices = {}
-    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if not row:
-                continue
-            key = f"{row.get('set', '')}_{row.get('number', '')}"
-            prices[key] = {
-                'eur_price': (row.get('eur_price') or '').strip(),
-                'last_updated': (row.get('last_updated') or '').strip()
-            }
-    
-    return prices
+def has_price(card: Dict[str, str], row: Optional[Dict[str, str]], order: str) -> bool:
+    """The existing price_data.csv row of a card counts as priced (skip_cards_with_prices)."""
+    if not row or not row.get('eur_price'):
+        return False
+    # Cardmarket first: a Limitless price is checked again on Cardmarket (if it can be opened)
+    if order == "cardmarket_first" and SELENIUM_AVAILABLE and card['cardmarket_url']:
+        return row.get('price_source') != PRICE_SOURCE_LIMITLESS
+    return True
+
+def scrape_prices(cards: List[Dict[str, str]], settings: Dict[str, object], csv_path: str) -> List[Dict[str, str]]:
+    """Read EUR prices from Cardmarket direct and the Limitless card pages (order: price_source_order)."""
+    enrichment = CardEnrichment(settings, fields=PRICE_FIELDS, price_csv=csv_path, log_prefix="[Price Scraper]")
+    print(f"[Price Scraper] Found {len(enrichment.prices)} existing prices")
+
+    order = str(settings.get("price_source_order", "cardmarket_first")).lower()
+    if order not in PRICE_SOURCE_ORDERS:
+        print(f"[Price Scraper] WARNING: Unknown price_source_order '{order}', using cardmarket_first")
+        order = "cardmarket_first"
 
-def scrape_prices(cards: List[Dict[str, str]], settings: Dict[str, object], 
-                 existing_prices: Dict[str, Dict[str, str]], csv_path: str) -> List[Dict[str, str]]:
-    """Scrape EUR prices from Limitless card pages."""
-    
-    if not SELENIUM_AVAILABLE:
-        print("[Price Scraper] ERROR: Selenium not available!")
-        return []
-    
-    print(f"\n[Price Scraper] Starting browser...")
-    chrome_options = Options()
-    if settings.get("headless", True):
-        chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    
-    results = []
     skip_existing = bool(settings.get("skip_cards_with_prices", True))
+    todo = [card for card in cards
+            if card['name'] and card['set'] and card['number']
+            and not (skip_existing and has_price(card, enrichment.prices.get(price_key(card)), order))]
+    print(f"[Price Scraper] {len(todo)} cards to update, {len(cards) - len(todo)} skipped")
+
+    # Cardmarket first: cards with a DB Cardmarket link, Limitless for the rest
+    limitless_todo = todo
+    if order == "cardmarket_first":
+        direct = [card for card in todo if card['cardmarket_url']]
+        if direct:
+            priced = scrape_cardmarket_prices(direct, settings, enrichment.prices, save=enrichment.save_prices)
+            limitless_todo = [card for card in todo if price_key(card) not in priced]
+            if priced:
+                enrichment.save_prices()
+            print(f"[Price Scraper] {len(limitless_todo)} cards for Limitless")
+
+    batch_size = int(settings.get("batch_size", 100))
+    for done, item in enumerate(enrichment.run(limitless_todo), 1):
+        card = item.card
+        if not item.ok:
+            print(f"[Price Scraper] [{done}/{len(limitless_todo)}] {card['name']} ({card['set']} {card['number']}): "
+                  f"⚠ Limitless failed: {item.error[:80]}")
+        elif not item.details.has_prints_table:
+            print(f"[Price Scraper] [{done}/{len(limitless_todo)}] {card['name']} ({card['set']} {card['number']}): "
+                  f"ℹ No price table on Limitless")
+        else:
+            print(f"[Price Scraper] [{done}/{len(limitless_todo)}] {card['name']} ({card['set']} {card['number']}): "
+                  f"✓ Limitless ({item.source}): {enrichment.prices[price_key(card)]['eur_price'] or '-'}")
+
+        # Progress save every batch_size cards
+        if done % batch_size == 0:
+            print(f"[Price Scraper] Completed {done} cards, saving progress...")
+            enrichment.save_prices()
+    print(f"[Price Scraper] Card pages: {enrichment.summary()}")
+
+    # Limitless first: Cardmarket direct for cards without a Limitless price
+    missing = [card for card in limitless_todo if order == "limitless_first"
+               if not enrichment.prices.get(price_key(card), {}).get('eur_price')
+               and (card['cardmarket_url'] or enrichment.prices.get(price_key(card), {}).get('cardmarket_url'))]
+    if missing:
+        scrape_cardmarket_prices(missing, settings, enrichment.prices, save=enrichment.save_prices)
+
+    # DB order, cards without a DB row (e.g. removed) at the end
+    rows = [enrichment.prices[price_key(card)] for card in cards if price_key(card) in enrichment.prices]
+    db_keys = {price_key(card) for card in cards}
+    rows.extend(row for key, row in enrichment.prices.items() if key not in db_keys)
+    return rows
+
+def scrape_cardmarket_prices(cards: List[Dict[str, str]], settings: Dict[str, object],
+                             prices: Dict[str, Dict[str, str]], save: Optional[Callable[[], object]] = None) -> Set[str]:
+    """Cardmarket direct (Chrome) for cards with a Cardmarket link. Returns the price keys found.
+
+    Found prices replace the rows in prices; save() is called every batch_size cards.
+    """
+    priced: Set[str] = set()
+    if not SELENIUM_AVAILABLE:
+        print(f"[Price Scraper] Selenium not available - {len(cards)} cards without Cardmarket direct")
+        return priced
+
+    print(f"\n[Price Scraper] Cardmarket direct for {len(cards)} cards...")
+    driver = create_browser(settings.get("headless", True), lean=bool(settings.get("lean_browser", True)))
     delay = float(settings.get("delay_seconds", 0.5))
-    
+    batch_size = int(settings.get("batch_size", 100))
+
     try:
         for idx, card in enumerate(cards):
-            card_key = f"{card['set']}_{card['number']}"
-            
-            # Skip if price already exists
-            if skip_existing and card_key in existing_prices:
-                # Keep existing price
-                results.append({
-                    'name': card['name'],
-                    'set': card['set'],
-                    'number': card['number'],
-                    'eur_price': existing_prices[card_key]['eur_price'],
-                    'cardmarket_url': card['cardmarket_url'],
-                    'last_updated': existing_prices[card_key]['last_updated']
-                })
-                continue
-            
+            if save and idx and idx % batch_size == 0:
+                print(f"[Price Scraper] Completed {idx} Cardmarket pages, saving progress...")
+                save()
+            url = card['cardmarket_url'] or prices.get(price_key(card), {}).get('cardmarket_url', '')
             print(f"[Price Scraper] [{idx+1}/{len(cards)}] {card['name']} ({card['set']} {card['number']})...")
-            
             try:
-                # Strategy: Prefer Cardmarket direct scraping (original source), fallback to Limitless
-                if not card.get('name') or not card.get('set') or not card.get('number'):
-                    continue
-                
-                eur_price = ''
-                cardmarket_url_final = card.get('cardmarket_url', '')
-                
-                # Try Cardmarket first (if URL available)
-                if cardmarket_url_final:
-                    try:
-                        print(f"   → Trying Cardmarket direct...")
-                        driver.get(cardmarket_url_final)
-                        time.sleep(2)
-                        
-                        # Find price in <dd class="col-6 col-xl-7">2,50 €</dd>
-                        try:
-                            # Try multiple selectors for Cardmarket price
-                            price_elem = None
-                            try:
-                                # Primary: dd.col-6.col-xl-7 (often contains the "From" price)
-                                price_elems = driver.find_elements(By.CSS_SELECTOR, "dd.col-6.col-xl-7")
-                                for elem in price_elems:
-                                    text = elem.text.strip()
-                                    if '€' in text:
-                                        eur_price = text
-                                        print(f"   ✓ Cardmarket: {eur_price}")
-                                        break
-                            except:
-                                pass
-                            
-                            if not eur_price:
-                                # Fallback: Try .price-container or other common Cardmarket selectors
-                                try:
-                                    price_elem = driver.find_element(By.CSS_SELECTOR, ".price-container .text-right")
-                                    eur_price = price_elem.text.strip()
-                                    print(f"   ✓ Cardmarket (fallback): {eur_price}")
-                                except:
-                                    pass
-                            
-                        except Exception as e:
-                            print(f"   ⚠ Cardmarket price not found: {str(e)[:80]}")
-                    
-                    except Exception as e:
-                        print(f"   ⚠ Cardmarket error: {str(e)[:80]}")
-                
-                # Fallback: Try Limitless if Cardmarket failed or no URL
-                if not eur_price:
-                    try:
-                        # Build URL (try to use card_url from database if available)
-                        if card.get('card_url'):
-                            if card['card_url'].startswith('/'):
-                                url = f"https://limitlesstcg.com{card['card_url']}"
-                            else:
-                                url = card['card_url']
-                        else:
-                            # Build URL manually (format: /cards/SET/NUM)
-                            url = f"https://limitlesstcg.com/cards/{card['set']}/{card['number']}"
-                        
-                        print(f"   → Trying Limitless: {url}")
-                        driver.get(url)
-                        time.sleep(2)
-                        
-                        # Find the table with prices
-                        cardmarket_url_from_page = ''
-                        
-                        try:
-                            # Find the current card row (class="current")
-                            table = driver.find_element(By.CSS_SELECTOR, "table.card-prints-versions")
-                            current_row = table.find_element(By.CSS_SELECTOR, "tr.current")
-                            
-                            # Extract EUR price from third column
-                            eur_link = current_row.find_element(By.CSS_SELECTOR, "a.card-price.eur")
-                            eur_price = eur_link.text.strip()
-                            cardmarket_url_from_page = eur_link.get_attribute('href') or ''
-                            
-                            print(f"   ✓ Limitless: {eur_price}")
-                            
-                            # Update Cardmarket URL if we got a new one from Limitless
-                            if cardmarket_url_from_page and not cardmarket_url_final:
-                                cardmarket_url_final = cardmarket_url_from_page
-                        except Exception as e:
-                            error_str = str(e)
-                            if 'no such element' in error_str and 'card-prints-versions' in error_str:
-                                print(f"   ℹ No price table on Limitless")
-                            else:
-                                print(f"   ⚠ Limitless error: {error_str.split('Stacktrace')[0].strip()[:80]}")
-                    
-                    except Exception as e:
-                        print(f"   ⚠ Limitless failed: {str(e)[:80]}")
-                
-                # Store result (even if price is empty - we track all attempts)
-                results.append({
-                    'name': card['name'],
-                    'set': card['set'],
-                    'number': card['number'],
-                    'eur_price': eur_price,
-                    'cardmarket_url': cardmarket_url_final,
-                    'last_updated': datetime.now().isoformat()
-                })
-                
-                time.sleep(delay)
-                
-                # Progress save every 100 cards
-                if (idx + 1) % 100 == 0:
-                    print(f"[Price Scraper] Completed {idx + 1} cards, saving progress...")
-                    save_prices(results, csv_path)
-                    print(f"[Price Scraper] Progress saved: {len(results)} prices")
-            
+                driver.get(url)
+                time.sleep(2)
+
+                # Find price in <dd class="col-6 col-xl-7">2,50 €</dd> (one script call for all selectors)
+                price = driver.execute_script(CARDMARKET_PRICE_SCRIPT) or {}
+                if price.get('eur_price'):
+                    prices[price_key(card)] = {
+                        'name': card['name'],
+                        'set': card['set'],
+                        'number': card['number'],
+                        'eur_price': price['eur_price'],
+                        'cardmarket_url': url,
+                        'last_updated': datetime.now().isoformat(),
+                        'price_source': PRICE_SOURCE_CARDMARKET
+                    }
+                    priced.add(price_key(card))
+                    print(f"   ✓ Cardmarket{' (fallback)' if price.get('fallback') else ''}: {price['eur_price']}")
+                else:
+                    print(f"   ℹ No price on Cardmarket")
+
             except Exception as e:
-                error_str = str(e).lower()
-                
-                # Handle session errors - restart browser
-                if 'invalid session' in error_str or 'session' in error_str:
+                if is_session_error(e):
                     print(f"[Price Scraper] SESSION ERROR: Browser crashed, restarting...")
-                    try:
-                        driver.quit()
-                    except:
-                        pass
-                    
-                    # Recreate browser
-                    chrome_options = Options()
-                    if settings.get("headless", True):
-                        chrome_options.add_argument("--headless")
-                    chrome_options.add_argument("--no-sandbox")
-                    chrome_options.add_argument("--disable-dev-shm-usage")
-                    chrome_options.add_argument("--disable-gpu")
-                    chrome_options.add_argument("--window-size=1920,1080")
-                    driver = webdriver.Chrome(options=chrome_options)
-                    
-                    print(f"[Price Scraper] Browser restarted, continuing...")
-                    time.sleep(2)
+                    quit_browser(driver)
+                    driver = create_browser(settings.get("headless", True), lean=bool(settings.get("lean_browser", True)))
                     continue
-                
-                # Other errors - just log and continue
-                print(f"[Price Scraper] ERROR for {card.get('name', 'unknown')}: {str(e)[:100]}")
-                continue
-    
+                print(f"   ⚠ Cardmarket error: {str(e)[:80]}")
+
+            time.sleep(delay)
+
     finally:
-        driver.quit()
-    
-    return results
+        quit_browser(driver)
+    return priced
 
 def save_prices(prices: List[Dict[str, str]], csv_path: str):
     """Save prices to price_data.csv."""
-    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ['name', 'set', 'number', 'eur_price', 'cardmarket_url', 'last_updated']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for price in prices:
-            writer.writerow(price)
-    
-    print(f"[Price Scraper] OK: Saved {len(prices)} prices to {csv_path}")
+    count = save_price_rows(prices, csv_path)
+    print(f"[Price Scraper] OK: Saved {count} prices to {csv_path}")
 
 
 # Main execution
@@ -356,15 +303,12 @@ try:
         input("\nPress ENTER to close...")
         sys.exit(1)
     
-    existing_prices = load_existing_prices(prices_csv)
-    print(f"[Price Scraper] Found {len(existing_prices)} existing prices")
-    
     # Scrape prices
     print("\n" + "=" * 80)
     print("SCRAPING PRICES...")
     print("=" * 80)
     
-    all_prices = scrape_prices(cards, settings, existing_prices, prices_csv)
+    all_prices = scrape_prices(cards, settings, prices_csv)
     
     # Save results
     print("\n" + "=" * 80)
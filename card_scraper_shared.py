@@ -9,6 +9,7 @@ Previously used CardDatabaseLookup which loaded individual CSVs.
 
 Provides:
   - CardDatabaseLookup: Wrapper around CardDataManager for backward compatibility
+  - iter_decklist_cards: single-pass tokenizer for Limitless decklist pages
   - Card aggregation and analysis functions
   - CSV output formatting and saving
   - Helper functions for both single-source and unified scrapers
@@ -25,9 +26,8 @@ Usage:
   save_to_csv(aggregated, 'output.csv')
 """
 
-import urllib.request
-import urllib.parse
 import csv
+import html
 import re
 import time
 import json
@@ -35,12 +35,13 @@ import os
 import sys
 from datetime import datetime, timedelta
 from html.parser import HTMLParser
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterator, NamedTuple
 from collections import defaultdict
+from collections.abc import Mapping
 
 # Import the new unified card data manager
 try:
-    from card_data_manager import CardDataManager
+    from card_data_manager import get_shared_manager
     _CARD_DATA_MANAGER_AVAILABLE = True
 except ImportError:
     _CARD_DATA_MANAGER_AVAILABLE = False
@@ -181,19 +182,6 @@ def get_data_dir() -> str:
     
     return data_dir
 
-def fetch_page(url: str, timeout: int = 30) -> str:
-    """Fetch a webpage and return its HTML content."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            return response.read().decode('utf-8', errors='ignore')
-    except Exception as e:
-        print(f"  Error fetching {url}: {e}")
-        return ""
-
 def normalize_archetype_name(archetype: str) -> str:
     """Normalize archetype names to consistent Title Case format.
     
@@ -223,6 +211,73 @@ def normalize_archetype_name(archetype: str) -> str:
 # CARD DATABASE LOOKUP - Now a Wrapper around CardDataManager
 # ============================================================================
 
+# Standard basic energies are always forced to their SVE EN print
+BASIC_ENERGY_SVE = {
+    'grass energy': ('SVE', '17'),
+    'fire energy': ('SVE', '18'),
+    'water energy': ('SVE', '19'),
+    'lightning energy': ('SVE', '20'),
+    'psychic energy': ('SVE', '21'),
+    'fighting energy': ('SVE', '22'),
+    'darkness energy': ('SVE', '23'),
+    'metal energy': ('SVE', '24'),
+    'fairy energy': ('SVE', '25')
+}
+
+
+class CardInfo(NamedTuple):
+    """One printing of a card (returned by lookup_card / get_latest_low_rarity_version)."""
+    name: str
+    set_code: str
+    number: str
+    rarity: str
+    supertype: str
+
+
+class ResolvedCard(NamedTuple):
+    """Precomputed card selection for one normalized name (built once at load).
+    
+    preferred_print:     get_card_info exact match (first EN print, else JP)
+    partial_print:       get_card_info partial match (Trainer: newest set, Pokemon: lowest rarity)
+    low_rarity_print:    get_latest_low_rarity_version (newest Common/Uncommon/Promo)
+    pokemon_print:       lookup_card (first print, supertype normalized to Pokémon/Trainer/Energy)
+    """
+    preferred_print: CardInfo
+    partial_print: CardInfo
+    low_rarity_print: Optional[CardInfo]
+    low_rarity_fallback: bool
+    pokemon_print: CardInfo
+    is_trainer_or_energy: bool
+    ace_spec: bool
+
+
+class _StoredRows(Mapping):
+    """Read-only mapping to card ids whose CardRecords are read from the manager's SQLite
+    database on access (SQLite storage mode keeps no rows in memory).
+    
+    name -> [ids] returns the variant list, (set, number) -> id a single variant.
+    """
+    
+    def __init__(self, manager, ids: Dict[Any, Any]):
+        self._manager = manager
+        self._ids = ids
+    
+    def __getitem__(self, key):
+        ids = self._ids[key]
+        if isinstance(ids, int):
+            return self._manager.get_cards_by_ids([ids])[0]
+        return self._manager.get_cards_by_ids(ids)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._ids
+    
+    def __iter__(self):
+        return iter(self._ids)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
 class CardDatabaseLookup:
     """
     Wrapper around CardDataManager for backward compatibility.
@@ -290,35 +345,151 @@ class CardDatabaseLookup:
         
         # Load the unified card database
         print("[CardDatabaseLookup] Loading unified card database (English + Japanese)...")
-        self.manager = CardDataManager()
+        self.manager = get_shared_manager()  # Shared with CardTypeLookup - parsed once per process
+        # Every name is resolved over all of its EN + JP variants, so the Japanese cards are
+        # merged before indexing (a lazily grown index would change results mid-run)
+        self.manager.require_japanese()
         self.cards = {}  # name -> list of card variants (for compatibility)
+        self._decklist_name_cache = {}  # raw name -> resolve_decklist name-level result
+        self._decklist_image_cache = {}  # (set, number) -> resolve_decklist image_url
         self._build_name_index()
     
+    # Bump when the structure or selection rules of the prebuilt indexes change
+    INDEX_VERSION = 2
+    _INDEX_ATTRS = ('cards', '_set_number_index', '_name_list', '_name_positions',
+                    '_name_lengths', '_ngram_index', '_resolved')
+    
+    def _index_version(self) -> tuple:
+        """Snapshot key - also covers edits to SET_ORDER / RARITY_PRIORITY."""
+        return (self.INDEX_VERSION, tuple(sorted(self.SET_ORDER.items())),
+                tuple(sorted(self.RARITY_PRIORITY.items())))
+    
     def _build_name_index(self):
-        """Build a name-based index for compatibility with old code."""
-        print("[CardDatabaseLookup] Building name index...")
+        """Build a name-based index for compatibility with old code.
+        
+        The finished indexes are stored in the CardDataManager snapshot, so later
+        startups with unchanged CSVs skip the build entirely.
+        """
+        stored_rows = self.manager.storage == 'sqlite'
+        cached = self.manager.get_snapshot_section('card_lookup', self._index_version())
+        if cached:
+            for attr in self._INDEX_ATTRS:
+                setattr(self, attr, cached[attr])
+            # Variants are stored as positions in get_all_cards() - re-link to the shared records
+            if stored_rows:
+                self.cards = _StoredRows(self.manager, self.cards)  # Positions are the SQLite row ids
+                self._set_number_index = _StoredRows(self.manager, self._set_number_index)
+            else:
+                all_cards = self.manager.get_all_cards()
+                self.cards = {name: [all_cards[i] for i in positions] for name, positions in self.cards.items()}
+                self._set_number_index = {key: all_cards[i] for key, i in self._set_number_index.items()}
+            print(f"[CardDatabaseLookup] ✓ Loaded {len(self.cards)} unique card names from snapshot")
+            return True
         
-        for card in self.manager.get_all_cards():
-            name = card.get('name', '')
-            normalized = self.normalize_name(name)
+        print("[CardDatabaseLookup] Building name index...")
+        if stored_rows:
+            return self._build_name_index_from_sqlite()
+        
+        # Variants are the manager's CardRecords themselves (no per-card dict copies);
+        # old variant keys set_code / set_number / card_type are aliases on the record
+        self.cards = {}
+        all_cards = self.manager.get_all_cards()
+        for card in all_cards:
+            normalized = self.normalize_name(card.get('name', ''))
             
             if normalized not in self.cards:
                 self.cards[normalized] = []
             
-            self.cards[normalized].append({
-                'name': name,
-                'set_code': card.get('set', ''),
-                'set_number': card.get('number', ''),
-                'rarity': card.get('rarity', ''),
-                'type': card.get('type', ''),
-                'card_type': card.get('type', 'Pokemon'),
-                'image_url': card.get('image_url', ''),
-                '_source': card.get('_source', 'english')
-            })
+            self.cards[normalized].append(card)
+        
+        self._build_set_number_index()
+        self._build_partial_match_index()
+        self._build_resolved_index()
         
         print(f"[CardDatabaseLookup] ✓ Indexed {len(self.cards)} unique card names")
+        positions = {id(card): i for i, card in enumerate(all_cards)}
+        section = {attr: getattr(self, attr) for attr in self._INDEX_ATTRS}
+        section['cards'] = {name: [positions[id(v)] for v in variants] for name, variants in self.cards.items()}
+        section['_set_number_index'] = {key: positions[id(v)] for key, v in self._set_number_index.items()}
+        self.manager.store_snapshot_section('card_lookup', self._index_version(), section)
         return True
     
+    def _build_name_index_from_sqlite(self) -> bool:
+        """SQLite storage mode: same indexes, built from one grouped query without loading every row.
+        
+        Each name group is resolved while it streams in and then dropped; only card ids are kept
+        (variants are read back on access). Name order and the first variant per (set, number)
+        follow the row ids, exactly like the in-memory build.
+        """
+        name_ids = {}
+        first_row = {}  # name -> lowest id (position of the name in self.cards order)
+        set_number_ids = {}  # (set, number) -> (lowest id of the owning name, id)
+        self._resolved = {}
+        for normalized, ids, variants in self.manager.iter_card_groups(self.normalize_name):
+            name_ids[normalized] = ids
+            first_row[normalized] = ids[0]
+            self._resolved[normalized] = self._resolve_variants(variants)
+            for card_id, variant in zip(ids, variants):
+                key = self._set_number_key(variant['set_code'], variant['set_number'])
+                rank = (ids[0], card_id)
+                if key not in set_number_ids or rank < set_number_ids[key]:
+                    set_number_ids[key] = rank
+        
+        ids_by_name = {name: name_ids[name] for name in sorted(name_ids, key=first_row.get)}
+        self.cards = _StoredRows(self.manager, ids_by_name)
+        self._set_number_index = _StoredRows(self.manager, {key: rank[1] for key, rank in set_number_ids.items()})
+        self._build_partial_match_index()
+        
+        print(f"[CardDatabaseLookup] ✓ Indexed {len(self.cards)} unique card names")
+        section = {attr: getattr(self, attr) for attr in self._INDEX_ATTRS}
+        section['cards'] = ids_by_name
+        section['_set_number_index'] = self._set_number_index._ids
+        self.manager.store_snapshot_section('card_lookup', self._index_version(), section)
+        return True
+    
+    @staticmethod
+    def _set_number_key(set_code: str, card_number: str) -> tuple:
+        """Normalized (SET, number) key - '006' and '6' map to the same entry."""
+        number = (card_number or '').strip()
+        return ((set_code or '').strip().upper(), number.lstrip('0') or number)
+    
+    def _build_set_number_index(self):
+        """Build (set, number) -> variant reverse index for O(1) lookups.
+        
+        Walks self.cards in the same order the old linear scan did and keeps
+        the first variant per key, so duplicate prints resolve identically.
+        """
+        self._set_number_index = {}
+        for variants in self.cards.values():
+            for variant in variants:
+                key = self._set_number_key(variant['set_code'], variant['set_number'])
+                if key not in self._set_number_index:
+                    self._set_number_index[key] = variant
+    
+    _NGRAM_SIZE = 3
+    
+    @classmethod
+    def _ngrams(cls, text: str) -> set:
+        """All character trigrams of a normalized name."""
+        return {text[i:i + cls._NGRAM_SIZE] for i in range(len(text) - cls._NGRAM_SIZE + 1)}
+    
+    def _build_partial_match_index(self):
+        """Build trigram postings + name positions for get_card_info partial matching.
+        
+        Positions follow self.cards insertion order so the lowest matching position
+        is the same name the old linear scan returned first.
+        """
+        self._name_list = list(self.cards)
+        self._name_positions = {name: pos for pos, name in enumerate(self._name_list)}
+        # Second pass only considers database names longer than 3 characters
+        self._name_lengths = sorted({len(name) for name in self._name_list if len(name) > 3})
+        
+        self._ngram_index = defaultdict(list)
+        for pos, name in enumerate(self._name_list):
+            for gram in self._ngrams(name):
+                self._ngram_index[gram].append(pos)
+        self._ngram_index = dict(self._ngram_index)
+    
     def normalize_name(self, name: str) -> str:
         """Normalize card name for matching."""
         normalized = name.strip().lower()
@@ -343,152 +514,23 @@ class CardDatabaseLookup:
     
     def is_card_trainer_or_energy_by_name(self, card_name: str) -> bool:
         """Check if a card (by name) is a Trainer or Energy card."""
-        normalized = self.normalize_name(card_name)
-        if normalized in self.cards:
-            return self.is_card_trainer_or_energy(self.cards[normalized])
-        return False
-    
-    def is_ace_spec_by_name(self, card_name: str) -> bool:
-        """Check if a card is an Ace Spec."""
-        normalized = self.normalize_name(card_name)
-        if normalized not in self.cards:
-            return False
-        
-        variants = self.cards[normalized]
-        if not variants:
-            return False
-        
-        # Check rarity and type
-        first = variants[0]
-        rarity = first.get('rarity', '').lower()
-        card_type = (first.get('card_type', '') or first.get('type', '')).lower()
-        
-        return ('ultra rare' in rarity or 'special' in rarity) and any(
-            t in card_type for t in ['trainer', 'supporter', 'tool', 'item', 'stadium']
-        )
-    
-    def is_ace_spec(self, variants: List[Dict[str, str]]) -> bool:
-        """Check if card variants represent an Ace Spec."""
-        if not variants:
-            return False
-        
-        for variant in variants:
-            rarity = variant.get('rarity', '').lower()
-            card_type = (variant.get('card_type', '') or variant.get('type', '')).lower()
-            
-            if ('ultra rare' in rarity or 'special' in rarity) and any(
-                t in card_type for t in ['trainer', 'supporter', 'tool', 'item', 'stadium']
-            ):
-                return True
-        
-        return False
-    
-    def get_latest_low_rarity_version(self, card_name: str) -> Optional[Any]:
-        """Get the latest LOW RARITY version of a Trainer/Energy card."""
-        normalized = self.normalize_name(card_name)
-        
-        # Force SVE for basic energies
-        basic_energy_map = {
-            'grass energy': ('SVE', '17'),
-            'fire energy': ('SVE', '18'),
-            'water energy': ('SVE', '19'),
-            'lightning energy': ('SVE', '20'),
-            'psychic energy': ('SVE', '21'),
-            'fighting energy': ('SVE', '22'),
-            'darkness energy': ('SVE', '23'),
-            'metal energy': ('SVE', '24'),
-            'fairy energy': ('SVE', '25')
-        }
-        
-        if normalized in basic_energy_map:
-            set_code, set_number = basic_energy_map[normalized]
-            class CardInfo:
-                def __init__(self):
-                    self.name = card_name
-                    self.set_code = set_code
-                    self.number = set_number
-                    self.rarity = 'Basic Energy'
-                    self.supertype = 'Energy'
-            return CardInfo()
-        
-        if normalized not in self.cards:
-            return None
-        
-        variants = self.cards[normalized]
-        LOW_RARITIES = {'Common', 'Uncommon', 'Promo'}
-        
-        low_rarity_variants = [v for v in variants if v.get('rarity', '') in LOW_RARITIES]
-        if not low_rarity_variants:
-            low_rarity_variants = variants
-        
-        best_card = None
-        best_set_order = -1
-        
-        for variant in low_rarity_variants:
-            set_code = variant.get('set_code', '')
-            set_order = self.SET_ORDER.get(set_code, 0)
-            
-            if set_order > best_set_order:
-                best_card = variant
-                best_set_order = set_order
-        
-        if not best_card:
-            return None
-        
-        class CardInfo:
-            def __init__(self, data):
-                self.name = data.get('name', '')
-                self.set_code = data.get('set_code', '')
-                self.number = data.get('set_number', '')
-                self.rarity = data.get('rarity', '')
-                self.supertype = data.get('card_type', '') or data.get('type', '')
-        
-        return CardInfo(best_card)
-    
-    def lookup_card(self, card_name: str) -> Optional[Any]:
-        """Lookup card in database and return CardInfo object."""
-        normalized = self.normalize_name(card_name)
-        
-        if normalized not in self.cards:
-            return None
-        
-        variants = self.cards[normalized]
-        if not variants:
-            return None
-        
-        best_card = variants[0]
-        
-        class CardInfo:
-            def __init__(self, data):
-                self.name = data.get('name', '')
-                self.set_code = data.get('set_code', '')
-                self.number = data.get('set_number', '')
-                self.rarity = data.get('rarity', '')
-                self.supertype = data.get('card_type', '') or data.get('type', '')
-        
-        return CardInfo(best_card)
+        resolved = self._resolved.get(self.normalize_name(card_name))
+        return resolved.is_trainer_or_energy if resolved else False
     
     def is_ace_spec_by_name(self, card_name: str) -> bool:
         """
         Check if a card (by name) is an Ace Spec card.
         Uses multiple detection methods:
         1. Check known Ace Specs list (most reliable)
-        2. Fallback: Check 'Ultra Rare' rarity with Trainer/Stadium/Tool/Item type
-        3. Fallback: Check for 'ace spec' in card type text
+        2. Fallback: Precomputed database flag (see is_ace_spec_from_variants)
         """
-        normalized = normalize_card_name_for_ace_check(card_name)
-        
         # Method 1: Check known Ace Specs list (most reliable)
-        if normalized in KNOWN_ACE_SPECS:
+        if normalize_card_name_for_ace_check(card_name) in KNOWN_ACE_SPECS:
             return True
         
-        # Method 2: Not in known list - check database with fallback logic
-        normalized_db = self.normalize_name(card_name)
-        if normalized_db in self.cards:
-            variants = self.cards[normalized_db]
-            return self.is_ace_spec_from_variants(variants)
-        
-        return False
+        # Method 2: Not in known list - use flag computed from database variants
+        resolved = self._resolved.get(self.normalize_name(card_name))
+        return resolved.ace_spec if resolved else False
     
     def is_ace_spec(self, variants: List[Dict[str, str]]) -> bool:
         """
@@ -531,7 +573,104 @@ class CardDatabaseLookup:
         
         return False
     
-    def get_latest_low_rarity_version(self, card_name: str) -> Optional[Any]:
+    # ------------------------------------------------------------------------
+    # Precomputed card selection (one ResolvedCard per normalized name)
+    # ------------------------------------------------------------------------
+    
+    @staticmethod
+    def _to_card_info(variant: Dict[str, str], supertype: str) -> CardInfo:
+        return CardInfo(
+            variant.get('name', ''),
+            variant.get('set_code', ''),
+            variant.get('set_number', ''),
+            variant.get('rarity', ''),
+            supertype
+        )
+    
+    @staticmethod
+    def _normalize_supertype(card_type: str) -> str:
+        """Map a raw type column value to Pokémon / Trainer / Energy."""
+        card_type_lower = card_type.lower()
+        if 'pokemon' in card_type_lower or card_type == '':
+            return 'Pokémon'
+        elif 'energy' in card_type_lower:
+            return 'Energy'
+        elif any(x in card_type_lower for x in ['trainer', 'supporter', 'item', 'tool', 'stadium']):
+            return 'Trainer'
+        return 'Pokémon'  # Default
+    
+    def _resolve_variants(self, variants: List[Dict[str, str]]) -> ResolvedCard:
+        """Run every per-name card selection rule once for a list of variants."""
+        first = variants[0]
+        is_trainer_energy = self.is_card_trainer_or_energy(variants)
+        
+        # get_card_info exact match: prefer EN variant (not MC, not numeric set code)
+        en_variant = None
+        jp_variant = None
+        for variant in variants:
+            set_code = variant.get('set_code', '').upper()
+            if set_code and not set_code.startswith('MC') and not set_code.isdigit():
+                en_variant = variant
+                break
+            if set_code.startswith('MC') or set_code.isdigit():
+                jp_variant = variant
+        preferred = en_variant if en_variant else jp_variant if jp_variant else first
+        
+        # get_card_info partial match
+        # Trainer/Energy: Prefer NEWEST set only - Pokemon: Prefer LOWEST rarity, then NEWEST set
+        partial = None
+        best_priority = 999
+        best_set_order = -1
+        for variant in variants:
+            set_order = self.SET_ORDER.get(variant['set_code'], 0)
+            if is_trainer_energy:
+                if set_order > best_set_order:
+                    partial = variant
+                    best_set_order = set_order
+            else:
+                priority = self.RARITY_PRIORITY.get(variant['rarity'], 50)
+                if priority < best_priority or (priority == best_priority and set_order > best_set_order):
+                    partial = variant
+                    best_priority = priority
+                    best_set_order = set_order
+        
+        # get_latest_low_rarity_version: NEWEST set among Common/Uncommon/Promo (else any rarity)
+        LOW_RARITIES = {'Common', 'Uncommon', 'Promo'}
+        low_rarity_variants = [v for v in variants if v.get('rarity', '') in LOW_RARITIES]
+        low_rarity_fallback = not low_rarity_variants
+        if low_rarity_fallback:
+            low_rarity_variants = variants
+        
+        low_rarity = None
+        best_set_order = -1
+        for variant in low_rarity_variants:
+            set_order = self.SET_ORDER.get(variant.get('set_code', ''), 0)
+            if set_order > best_set_order:
+                low_rarity = variant
+                best_set_order = set_order
+        
+        first_type = first.get('card_type', '') or first.get('type', '')
+        
+        return ResolvedCard(
+            preferred_print=self._to_card_info(preferred, preferred.get('type', '')),
+            partial_print=self._to_card_info(partial, partial.get('type', '')),
+            low_rarity_print=self._to_card_info(
+                low_rarity, low_rarity.get('card_type', '') or low_rarity.get('type', '')
+            ) if low_rarity else None,
+            low_rarity_fallback=low_rarity_fallback,
+            pokemon_print=self._to_card_info(first, self._normalize_supertype(first_type)),
+            is_trainer_or_energy=is_trainer_energy,
+            ace_spec=self.is_ace_spec_from_variants(variants)
+        )
+    
+    def _build_resolved_index(self):
+        """Build the normalized name -> ResolvedCard table."""
+        self._resolved = {
+            normalized: self._resolve_variants(variants)
+            for normalized, variants in self.cards.items() if variants
+        }
+    
+    def get_latest_low_rarity_version(self, card_name: str) -> Optional[CardInfo]:
         """
         Get the latest LOW RARITY version of a Trainer/Energy card.
         Returns a CardInfo object with set_code, number, rarity, etc.
@@ -543,104 +682,26 @@ class CardDatabaseLookup:
         normalized = self.normalize_name(card_name)
         
         # Force SVE for basic energies
-        basic_energy_map = {
-            'grass energy': ('SVE', '17'),
-            'fire energy': ('SVE', '18'),
-            'water energy': ('SVE', '19'),
-            'lightning energy': ('SVE', '20'),
-            'psychic energy': ('SVE', '21'),
-            'fighting energy': ('SVE', '22'),
-            'darkness energy': ('SVE', '23'),
-            'metal energy': ('SVE', '24'),
-            'fairy energy': ('SVE', '25')
-        }
+        if normalized in BASIC_ENERGY_SVE:
+            set_code, set_number = BASIC_ENERGY_SVE[normalized]
+            return CardInfo(card_name, set_code, set_number, 'Basic Energy', 'Energy')
         
-        if normalized in basic_energy_map:
-            set_code, set_number = basic_energy_map[normalized]
-            class CardInfo:
-                def __init__(self):
-                    self.name = card_name
-                    self.set_code = set_code
-                    self.number = set_number
-                    self.rarity = 'Basic Energy'
-                    self.supertype = 'Energy'
-            return CardInfo()
-        
-        if normalized not in self.cards:
+        resolved = self._resolved.get(normalized)
+        if not resolved:
             return None
         
-        variants = self.cards[normalized]
-        
-        # Define LOW RARITY values
-        LOW_RARITIES = {'Common', 'Uncommon', 'Promo'}
-        
-        # Filter to only LOW RARITY variants
-        low_rarity_variants = [v for v in variants if v.get('rarity', '') in LOW_RARITIES]
-        
-        # If no low rarity version exists, fallback to ANY rarity (prefer newest set)
-        if not low_rarity_variants:
+        if resolved.low_rarity_fallback:
             print(f"[DEBUG] No low-rarity version for '{card_name}', using any rarity")
-            low_rarity_variants = variants  # Use all variants as fallback
-        
-        # Find the NEWEST set among available variants
-        best_card = None
-        best_set_order = -1
-        
-        for variant in low_rarity_variants:
-            set_code = variant.get('set_code', '')
-            set_order = self.SET_ORDER.get(set_code, 0)
-            
-            if set_order > best_set_order:
-                best_card = variant
-                best_set_order = set_order
-        
-        if not best_card:
-            return None
-        
-        # Return a CardInfo-like object
-        class CardInfo:
-            def __init__(self, data):
-                self.name = data.get('name', '')
-                self.set_code = data.get('set_code', '')
-                self.number = data.get('set_number', '')
-                self.rarity = data.get('rarity', '')
-                self.supertype = data.get('card_type', '') or data.get('type', '')
         
-        return CardInfo(best_card)
+        return resolved.low_rarity_print
     
-    def lookup_card(self, card_name: str) -> Optional[Any]:
+    def lookup_card(self, card_name: str) -> Optional[CardInfo]:
         """
         Lookup card in database and return CardInfo object with supertype, set_code, etc.
         Used for determining card type (Pokemon vs Trainer vs Energy).
         """
-        normalized = self.normalize_name(card_name)
-        
-        if normalized not in self.cards:
-            return None
-        
-        variants = self.cards[normalized]
-        if not variants:
-            return None
-        
-        # Return first variant as CardInfo object
-        class CardInfo:
-            def __init__(self, data):
-                self.name = data.get('name', '')
-                self.set_code = data.get('set_code', '')
-                self.number = data.get('set_number', '')
-                self.rarity = data.get('rarity', '')
-                card_type = data.get('card_type', '') or data.get('type', '')
-                # Normalize supertype
-                if 'pokemon' in card_type.lower() or card_type == '':
-                    self.supertype = 'Pokémon'
-                elif 'energy' in card_type.lower():
-                    self.supertype = 'Energy'
-                elif any(x in card_type.lower() for x in ['trainer', 'supporter', 'item', 'tool', 'stadium']):
-                    self.supertype = 'Trainer'
-                else:
-                    self.supertype = 'Pokémon'  # Default
-        
-        return CardInfo(variants[0])
+        resolved = self._resolved.get(self.normalize_name(card_name))
+        return resolved.pokemon_print if resolved else None
 
     def generate_limitless_image_url(self, set_code: str, card_number: str, rarity: str) -> str:
         """Generate Limitless CDN image URL for EN or JP cards."""
@@ -669,23 +730,28 @@ class CardDatabaseLookup:
         
         return url
     
+    def _card_info_dict(self, card: CardInfo) -> Dict[str, str]:
+        """Convert a CardInfo to the dict format returned by get_card_info."""
+        return {
+            'set_code': card.set_code,
+            'set_name': '',  # Not in CSV
+            'number': card.number,
+            'rarity': card.rarity,
+            'type': card.supertype,
+            'image_url': self.generate_limitless_image_url(card.set_code, card.number, card.rarity)
+        }
+    
     def get_card_info(self, card_name: str) -> Optional[Dict[str, str]]:
-        """Get card info with proper handling of basic energies and card selection."""
+        """Get card info with proper handling of basic energies and card selection.
+        
+        Exact match: first EN print (else JP print)
+        Partial match: Trainer/Energy -> NEWEST set, Pokemon -> LOWEST rarity, then NEWEST set
+        """
+        normalized = self.normalize_name(card_name)
+        
         # Force SVE EN variant for standard basic energies
-        basic_energy_map = {
-            'grass energy': ('SVE', '17'),
-            'fire energy': ('SVE', '18'),
-            'water energy': ('SVE', '19'),
-            'lightning energy': ('SVE', '20'),
-            'psychic energy': ('SVE', '21'),
-            'fighting energy': ('SVE', '22'),
-            'darkness energy': ('SVE', '23'),
-            'metal energy': ('SVE', '24'),
-            'fairy energy': ('SVE', '25')
-        }
-        norm_name = self.normalize_name(card_name)
-        if norm_name in basic_energy_map:
-            set_code, set_number = basic_energy_map[norm_name]
+        if normalized in BASIC_ENERGY_SVE:
+            set_code, set_number = BASIC_ENERGY_SVE[normalized]
             rarity = 'Basic Energy'
             image_url = self.generate_limitless_image_url(set_code, set_number, rarity)
             return {
@@ -697,130 +763,55 @@ class CardDatabaseLookup:
                 'image_url': image_url
             }
         
-        """For Trainer/Energy cards: Use NEWEST set (ASC > MEG > BRS...) regardless of rarity
-        For Pokemon cards: Use LOWEST rarity (Common > Uncommon) regardless of set
-        """
-        normalized = self.normalize_name(card_name)
-        
         # Try exact match first
-        if normalized in self.cards:
-            variants = self.cards[normalized]
-            # Prefer EN variant if available
-            en_variant = None
-            jp_variant = None
-            for variant in variants:
-                set_code = variant.get('set_code', '').upper()
-                # EN cards: set_code is not MC, not a pure number, not JP-only
-                if set_code and not set_code.startswith('MC') and not set_code.isdigit():
-                    en_variant = variant
-                    break
-                # MC or numeric set_code is JP
-                if set_code.startswith('MC') or set_code.isdigit():
-                    jp_variant = variant
-            best_card = en_variant if en_variant else jp_variant if jp_variant else variants[0]
-            image_url = self.generate_limitless_image_url(
-                best_card['set_code'],
-                best_card['set_number'],
-                best_card['rarity']
-            )
-            return {
-                'set_code': best_card['set_code'],
-                'set_name': '',  # Not in CSV
-                'number': best_card['set_number'],
-                'rarity': best_card['rarity'],
-                'type': best_card.get('type', ''),
-                'image_url': image_url
-            }
+        resolved = self._resolved.get(normalized)
+        if resolved:
+            return self._card_info_dict(resolved.preferred_print)
         
         # Try partial match (for cards with ex/V suffixes or truncated names)
-        # First try: cards where input is contained in database name
-        for db_name, variants in self.cards.items():
-            if normalized in db_name:
-                # Determine if this is a Trainer/Energy card
-                is_trainer_energy = self.is_card_trainer_or_energy(variants)
-                
-                best_card = None
-                best_priority = 999
-                best_set_order = -1
-                
-                for variant in variants:
-                    set_order = self.SET_ORDER.get(variant['set_code'], 0)
-                    
-                    if is_trainer_energy:
-                        # For Trainer/Energy: Prefer NEWEST set only
-                        if set_order > best_set_order:
-                            best_card = variant
-                            best_set_order = set_order
-                    else:
-                        # For Pokemon: Prefer LOWEST rarity, then NEWEST set
-                        rarity = variant['rarity']
-                        priority = self.RARITY_PRIORITY.get(rarity, 50)
-                        if priority < best_priority or (priority == best_priority and set_order > best_set_order):
-                            best_card = variant
-                            best_priority = priority
-                            best_set_order = set_order
-                
-                if best_card:
-                    image_url = self.generate_limitless_image_url(
-                        best_card['set_code'],
-                        best_card['set_number'],
-                        best_card['rarity']
-                    )
-                    
-                    return {
-                        'set_code': best_card['set_code'],
-                        'set_name': '',
-                        'number': best_card['set_number'],
-                        'rarity': best_card['rarity'],
-                        'type': best_card.get('type', ''),
-                        'image_url': image_url
-                    }
-        
-        # Second try: database name is contained in input (for cases where scraped name is longer)
-        for db_name, variants in self.cards.items():
-            if db_name in normalized and len(db_name) > 3:  # Only if db_name is meaningful length
-                # Determine if this is a Trainer/Energy card
-                is_trainer_energy = self.is_card_trainer_or_energy(variants)
-                
-                best_card = None
-                best_priority = 999
-                best_set_order = -1
-                
-                for variant in variants:
-                    set_order = self.SET_ORDER.get(variant['set_code'], 0)
-                    
-                    if is_trainer_energy:
-                        # For Trainer/Energy: Prefer NEWEST set only
-                        if set_order > best_set_order:
-                            best_card = variant
-                            best_set_order = set_order
-                    else:
-                        # For Pokemon: Prefer LOWEST rarity, then NEWEST set
-                        rarity = variant['rarity']
-                        priority = self.RARITY_PRIORITY.get(rarity, 50)
-                        if priority < best_priority or (priority == best_priority and set_order > best_set_order):
-                            best_card = variant
-                            best_priority = priority
-                            best_set_order = set_order
-                
-                if best_card:
-                    image_url = self.generate_limitless_image_url(
-                        best_card['set_code'],
-                        best_card['set_number'],
-                        best_card['rarity']
-                    )
-                    
-                    return {
-                        'set_code': best_card['set_code'],
-                        'set_name': '',
-                        'number': best_card['set_number'],
-                        'rarity': best_card['rarity'],
-                        'type': best_card.get('type', ''),
-                        'image_url': image_url
-                    }
+        db_name = self._find_partial_match(normalized)
+        if db_name and db_name in self._resolved:
+            return self._card_info_dict(self._resolved[db_name].partial_print)
         
         return None
     
+    def _find_partial_match(self, normalized: str) -> Optional[str]:
+        """Find the database name for a truncated or over-long card name.
+        
+        First try: input is contained in database name (e.g. "iron hands" -> "iron hands ex")
+        Second try: database name (> 3 chars) is contained in input (scraped name is longer)
+        
+        Both passes return the FIRST name in self.cards order, like the old linear scans,
+        but candidates come from the trigram / name-length indexes instead.
+        """
+        if len(normalized) < self._NGRAM_SIZE:
+            # Too short for the trigram index - rare, scan directly
+            for db_name in self.cards:
+                if normalized in db_name:
+                    return db_name
+        else:
+            postings = sorted(
+                (self._ngram_index.get(gram, ()) for gram in self._ngrams(normalized)),
+                key=len
+            )
+            if postings and postings[0]:
+                candidates = set(postings[0]).intersection(*postings[1:])
+                matches = [pos for pos in candidates if normalized in self._name_list[pos]]
+                if matches:
+                    return self._name_list[min(matches)]
+        
+        # Every substring of the input with a known name length is a dict lookup
+        best_pos = None
+        for length in self._name_lengths:
+            if length > len(normalized):
+                break
+            for start in range(len(normalized) - length + 1):
+                pos = self._name_positions.get(normalized[start:start + length])
+                if pos is not None and (best_pos is None or pos < best_pos):
+                    best_pos = pos
+        
+        return self._name_list[best_pos] if best_pos is not None else None
+    
     def get_card_info_by_set_number(self, card_name: str, set_code: str, card_number: str) -> Optional[Dict[str, str]]:
         """Get card info for a specific set and number.
         
@@ -854,31 +845,210 @@ class CardDatabaseLookup:
         return None
     
     def get_name_by_set_number(self, set_code: str, card_number: str) -> Optional[str]:
-        """Lookup card name by set code and number."""
+        """Lookup card name by set code and number (zero-padded or not)."""
         if not set_code or not card_number:
             return None
 
-        normalized_set = set_code.strip().upper()
-        normalized_number = card_number.strip().lstrip('0') or card_number.strip()
-        
-        # Search through all cards for matching set+number
-        for db_name, variants in self.cards.items():
-            for variant in variants:
-                variant_set = (variant['set_code'] or '').strip().upper()
-                variant_number = (variant['set_number'] or '').strip()
-                variant_number_norm = variant_number.lstrip('0') or variant_number
-
-                if variant_set == normalized_set and (
-                    variant_number == card_number.strip() or variant_number_norm == normalized_number
-                ):
-                    return variant['name']
+        variant = self._set_number_index.get(self._set_number_key(set_code, card_number))
+        if variant:
+            return variant['name']
         
         return None
+    
+    # ------------------------------------------------------------------------
+    # Batch decklist resolution
+    # ------------------------------------------------------------------------
+    
+    def _resolve_name(self, card_name: str) -> tuple:
+        """Name-level part of resolve_decklist, cached per raw name across batches.
+        
+        Returns (normalized, ResolvedCard or None, basic energy (set, number) or None, is_ace_spec)
+        """
+        cached = self._decklist_name_cache.get(card_name)
+        if cached is None:
+            normalized = self.normalize_name(card_name)
+            resolved = self._resolved.get(normalized)
+            if resolved and resolved.low_rarity_fallback:
+                print(f"[DEBUG] No low-rarity version for '{card_name}', using any rarity")
+            cached = (normalized, resolved, BASIC_ENERGY_SVE.get(normalized), self.is_ace_spec_by_name(card_name))
+            self._decklist_name_cache[card_name] = cached
+        return cached
+    
+    def _decklist_image_url(self, set_code: str, set_number: str, rarity: str) -> str:
+        """generate_limitless_image_url, cached per print across batches ('' without set/number)."""
+        if not (set_code and set_number):
+            return ''
+        key = (set_code, set_number)
+        image_url = self._decklist_image_cache.get(key)
+        if image_url is None:
+            image_url = self.generate_limitless_image_url(set_code, set_number, rarity)
+            self._decklist_image_cache[key] = image_url
+        return image_url
+    
+    def resolve_decklist(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Resolve a batch of decklist entries (one deck or all decks of a tournament).
+        
+        Each entry: {'name', 'count', 'section', 'set_code', 'set_number'}
+            section: 'pokemon', 'trainer', 'energy' (from the page heading) or None
+                     to decide by database type (like the copy-button format)
+        
+        Names are normalized once per distinct name and cached on the instance, so the
+        trainers shared by a tournament's 16-128 lists are resolved only once.
+        
+        Returns one row per entry (same order) with the entry fields plus:
+            set_code, set_number, rarity, type, image_url ('' without set/number),
+            is_ace_spec ('Yes'/'No'),
+            resolved (False if the database had no print and source set/number were kept)
+        
+        Rules (same as the single-card methods):
+            Basic Energy:   Force SVE 17-25
+            Pokemon:        Keep source set/number (rarity/type from that exact print)
+            Trainer/Energy: Newest low-rarity print (get_latest_low_rarity_version)
+        """
+        rows = []
+        for entry in entries:
+            card_name = (entry.get('name') or '').strip()
+            normalized, resolved, basic_energy, is_ace_spec = self._resolve_name(card_name)
+            
+            section = entry.get('section')
+            if section is None:
+                if basic_energy:
+                    section = 'energy'
+                elif resolved and resolved.pokemon_print.supertype == 'Pokémon':
+                    section = 'pokemon'
+                else:
+                    section = 'trainer'
+            
+            set_code = entry.get('set_code', '') or ''
+            set_number = entry.get('set_number', '') or ''
+            rarity = ''
+            card_type = ''
+            is_resolved = True
+            
+            if basic_energy and section != 'pokemon':
+                set_code, set_number = basic_energy
+                rarity, card_type = 'Basic Energy', 'Energy'
+            elif section == 'pokemon':
+                exact = self._set_number_index.get(self._set_number_key(set_code, set_number)) if set_code and set_number else None
+                if exact:
+                    rarity, card_type = exact.get('rarity', ''), exact.get('type', '')
+                elif resolved:
+                    card_type = resolved.preferred_print.supertype
+                is_resolved = bool(set_code and set_number)
+            elif resolved and resolved.low_rarity_print:
+                latest = resolved.low_rarity_print
+                set_code, set_number = latest.set_code, latest.number
+                rarity, card_type = latest.rarity, latest.supertype
+            else:
+                is_resolved = False
+            
+            row = dict(entry)
+            row.update({
+                'name': card_name,
+                'section': section,
+                'set_code': set_code,
+                'set_number': set_number,
+                'rarity': rarity,
+                'type': card_type,
+                'image_url': self._decklist_image_url(set_code, set_number, rarity),
+                'is_ace_spec': 'Yes' if is_ace_spec else 'No',
+                'resolved': is_resolved
+            })
+            rows.append(row)
+        
+        return rows
 
 # ============================================================================
 # CARD PARSING
 # ============================================================================
 
+class DecklistCard(NamedTuple):
+    """One card line of a decklist page (iter_decklist_cards)."""
+    section: str  # 'pokemon', 'trainer' or 'energy' (from the column heading)
+    set_code: str  # Upper-case, '' if the page names no print
+    number: str
+    count: float  # Decimal on tournament card pages (average per list, e.g. 3.78)
+    name: str  # HTML entities decoded, apostrophes normalized
+
+
+# All decklist tokens in one pattern, scanned once from start to end. Every token starts
+# with the literal class=" so the regex engine jumps between class attributes instead of
+# trying each alternative at every tag of the (mostly layout) page:
+#   heading:  <div class="decklist-column-heading">Pokémon (21)             (limitlesstcg.com)
+#   card:     <div class="decklist-card" data-set="TWM" data-number="128">...
+#             <span class="card-count">4</span> <span class="card-name">Dreepy</span>
+#   column:   <div class="heading">Pokémon (21)</div><a href=".../cards/TWM/128">4 Dreepy (TWM 128)</a>...</div>
+#             (play.limitlesstcg.com, heading and card links in one token)
+_DECKLIST_TOKEN = re.compile(
+    r'class="(?:'
+    r'decklist-column-heading"[^>]*>\s*(?P<heading>[^<]*)'
+    r'|decklist-card"(?:[^>]*?data-set="(?P<set>[^"]*)")?(?:[^>]*?data-number="(?P<number>[^"]*)")?[^>]*>'
+    r'.*?<span class="card-count">\s*(?P<count>[^<]*?)\s*</span>\s*<span class="card-name">(?P<name>[^<]+)</span>'
+    r'|heading"[^>]*>\s*(?P<column_heading>[^<]*)</div>(?P<column>.*?)</div>'
+    r')',
+    re.DOTALL
+)
+
+# Card link inside a play column
+_DECKLIST_LINK = re.compile(
+    r'<a href="(?:[^"]*/(?P<set>[A-Za-z0-9-]+)/(?P<number>[0-9]+))?[^"]*"[^>]*>'
+    r'\s*(?P<count>[0-9]+)\s+(?P<name>[^<]+?)\s*</a>'
+)
+
+_APOSTROPHES = str.maketrans({'\u2019': "'", '\u2018': "'", '`': "'", '´': "'", 'ʼ': "'"})
+
+
+def _decklist_section(heading: str) -> Optional[str]:
+    title = heading.strip().lower()
+    if title.startswith(('pokémon', 'pokemon')):
+        return 'pokemon'
+    if title.startswith('trainer'):
+        return 'trainer'
+    if title.startswith('energy'):
+        return 'energy'
+    return None
+
+
+def _card_name(raw: str) -> str:
+    name = html.unescape(raw) if '&' in raw else raw
+    if not name.isascii() or '`' in name:
+        name = name.translate(_APOSTROPHES)
+    return name.strip()
+
+
+def iter_decklist_cards(html_content: str) -> Iterator[DecklistCard]:
+    """Yield the cards of a Limitless decklist page in one pass over the HTML.
+
+    Handles both markups: decklist columns of limitlesstcg.com (City League lists,
+    tournament card pages) and the card links of play.limitlesstcg.com decklists.
+    Sections come from the column headings; decklist cards before the first heading
+    count as Pokémon, columns other than Pokémon / Trainer / Energy are skipped.
+    """
+    section = 'pokemon'  # Pages without headings list Pokémon only
+    for match in _DECKLIST_TOKEN.finditer(html_content):
+        kind = match.lastgroup
+        if kind == 'heading':
+            section = _decklist_section(match.group('heading'))
+        elif kind == 'name':
+            if section is None:
+                continue
+            set_code, number, count, name = match.group('set', 'number', 'count', 'name')
+            try:
+                count = float(count)
+            except ValueError:
+                continue
+            yield DecklistCard(section, set_code.upper() if set_code else '', number or '', count, _card_name(name))
+        else:
+            column_section = _decklist_section(match.group('column_heading'))
+            if column_section is None:
+                continue
+            for set_code, number, count, name in _DECKLIST_LINK.findall(match.group('column')):
+                if column_section == 'pokemon' and name.endswith(')') and '(' in name:
+                    name = name[:name.rindex('(')]  # "Dreepy (TWM 128)" -> "Dreepy"
+                yield DecklistCard(column_section, set_code.upper(), number, float(count), _card_name(name))
+
+
 def parse_copy_button_decklist(copy_text: str, card_db: CardDatabaseLookup) -> List[Dict[str, Any]]:
     """Parse decklist from 'Copy to Clipboard' button format.
     
@@ -898,7 +1068,7 @@ def parse_copy_button_decklist(copy_text: str, card_db: CardDatabaseLookup) -> L
     Trainer/Energy: Database lookup for low-rarity version (Common/Uncommon)
     Basic Energy: Force SVE set
     """
-    cards = []
+    entries = []
     lines = copy_text.strip().split('\n')
     
     for line in lines:
@@ -910,61 +1080,24 @@ def parse_copy_button_decklist(copy_text: str, card_db: CardDatabaseLookup) -> L
         # Parse format: "4 Card Name SET 123"
         match = re.match(r'^(\d+)\s+(.+?)\s+([A-Z0-9]+)\s+(\d+)$', line)
         if match:
-            count = int(match.group(1))
-            card_name = match.group(2).strip()
-            set_code = match.group(3).strip()
-            set_number = match.group(4).strip()
-            
-            # Check if basic energy
-            norm_name = card_db.normalize_name(card_name)
-            basic_energies = ['grass energy', 'fire energy', 'water energy', 'lightning energy',
-                            'psychic energy', 'fighting energy', 'darkness energy', 'metal energy', 'fairy energy']
-            
-            if norm_name in basic_energies:
-                # Force SVE set for basic energies
-                basic_energy_map = {
-                    'grass energy': '17', 'fire energy': '18', 'water energy': '19',
-                    'lightning energy': '20', 'psychic energy': '21', 'fighting energy': '22',
-                    'darkness energy': '23', 'metal energy': '24', 'fairy energy': '25'
-                }
-                cards.append({
-                    'name': card_name,
-                    'count': count,
-                    'set_code': 'SVE',
-                    'set_number': basic_energy_map[norm_name]
-                })
-            else:
-                # Check card type
-                db_card = card_db.lookup_card(card_name)
-                
-                if db_card and db_card.supertype == 'Pokémon':
-                    # Pokemon: Keep original set+number from copy button
-                    cards.append({
-                        'name': card_name,
-                        'count': count,
-                        'set_code': set_code,
-                        'set_number': set_number
-                    })
-                else:
-                    # Trainer/Energy: Get low-rarity version from database
-                    latest_card = card_db.get_latest_low_rarity_version(card_name)
-                    if latest_card:
-                        cards.append({
-                            'name': card_name,
-                            'count': count,
-                            'set_code': latest_card.set_code,
-                            'set_number': latest_card.number
-                        })
-                    else:
-                        # Fallback: Keep original if no low-rarity found
-                        cards.append({
-                            'name': card_name,
-                            'count': count,
-                            'set_code': set_code,
-                            'set_number': set_number
-                        })
-    
-    return cards
+            entries.append({
+                'name': match.group(2).strip(),
+                'count': int(match.group(1)),
+                'section': None,  # Decided by database type
+                'set_code': match.group(3).strip(),
+                'set_number': match.group(4).strip()
+            })
+    
+    # Resolve whole deck in one batch (unresolved Trainer/Energy keep original set+number)
+    return [
+        {
+            'name': row['name'],
+            'count': row['count'],
+            'set_code': row['set_code'],
+            'set_number': row['set_number']
+        }
+        for row in card_db.resolve_decklist(entries)
+    ]
 
 # ============================================================================
 # DATA AGGREGATION
@@ -1140,16 +1273,7 @@ def aggregate_card_data(all_decks: List[Dict[str, Any]], card_db: CardDatabaseLo
                     # Trainer/Energy - use latest LOW RARITY version (ignore source set/number)
                     latest_card = card_db.get_latest_low_rarity_version(card_name)
                     if latest_card:
-                        # Convert to dict format
-                        image_url = card_db.generate_limitless_image_url(latest_card.set_code, latest_card.number, latest_card.rarity)
-                        card_info = {
-                            'set_code': latest_card.set_code,
-                            'set_name': '',
-                            'number': latest_card.number,
-                            'rarity': latest_card.rarity,
-                            'type': latest_card.supertype,
-                            'image_url': image_url
-                        }
+                        card_info = card_db._card_info_dict(latest_card)
                         final_set_code = latest_card.set_code
                         final_card_number = latest_card.number
                     else:
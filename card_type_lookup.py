@@ -2,27 +2,56 @@
 """
 Card Type Lookup Module
 Central module for reliable card type detection based on:
-1. all_cards_database.csv (from Card_Database_Scraper) - PRIORITY
+1. CardDataManager 'category' column (all_cards_database.csv + japanese_cards_database.csv) - PRIORITY
+   Shares the process-wide CardDataManager / snapshot with CardDatabaseLookup,
+   so the card CSVs are parsed only once per process.
 2. Alle Karten.txt (fallback)
 3. Japanische extra Karten.txt (fallback)
 NO MORE KEYWORD GUESSING - 100% accurate lookup!
+
+Noisy names (typos, accent variants, truncated "Name..." text from HTML) are resolved
+by a trigram similarity index over the normalized names (find_best_match), built once
+on first use - no network lookups needed.
 """
 
 import os
 import sys
-import csv
-from typing import Dict, Optional, Tuple
+import bisect
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from card_data_manager import CardDataManager, card_category, get_shared_manager
+    _CARD_DATA_MANAGER_AVAILABLE = True
+except ImportError:
+    _CARD_DATA_MANAGER_AVAILABLE = False
+
+# Bump when normalize_card_name or the type map layout changes (snapshot section key)
+TYPE_MAP_VERSION = 2
+
+# Fuzzy matching: minimum Dice similarity of name trigrams to accept a match.
+# 0.8 tolerates a typo or two in normal card names but rejects tournament titles.
+FUZZY_MIN_SCORE = 0.8
+FUZZY_MIN_LENGTH = 4  # Shorter names are too ambiguous for fuzzy matching
 
 class CardTypeLookup:
     """Manages card type lookup from CSV database and fallback text files"""
     
-    def __init__(self, load_japanese: bool = False):
+    def __init__(self, load_japanese: bool = False, manager: 'CardDataManager' = None):
         self.card_database: Dict[str, str] = {}  # normalized name -> type
         self.japanese_database: Dict[str, str] = {}  # normalized name -> type (Japanese extras)
         self.load_japanese = load_japanese
         
-        # Try to load from CSV first (most up-to-date)
-        csv_loaded = self.load_csv_database()
+        # Trigram index for find_best_match (built lazily on first fuzzy lookup)
+        self._fuzzy_names: List[str] = []  # position -> fuzzy key
+        self._fuzzy_targets: List[str] = []  # position -> normalized name in type maps
+        self._fuzzy_trigram_counts: List[int] = []
+        self._fuzzy_postings: Dict[str, List[int]] = {}
+        self._fuzzy_sorted: List[Tuple[str, int]] = []  # (fuzzy key, position) for prefix lookup
+        self._fuzzy_cache: Dict[str, Tuple[Optional[str], float]] = {}
+        
+        # Try to load from the card database first (most up-to-date)
+        csv_loaded = self.load_csv_database(manager)
         
         # Fallback to text files if CSV not available
         if not csv_loaded:
@@ -66,116 +95,73 @@ class CardTypeLookup:
         Determine card category (Pokemon, Trainer, Energy) from type code.
         Type codes from all_cards_database.csv like: GBasic, RStage1, Item, Supporter, etc.
         """
-        if not type_code:
-            return "Energy"  # Empty type = Basic Energy
-        
-        type_lower = type_code.lower()
-        
-        # Check for Energy
-        if 'energy' in type_lower or type_code == '':
-            return "Energy"
-        
-        # Check for Trainer types
-        trainer_keywords = ['item', 'supporter', 'stadium', 'tool', 'ace spec', 'acespec']
-        if any(keyword in type_lower for keyword in trainer_keywords):
-            return "Trainer"
-        
-        # Check for Pokemon types (type codes start with element letter + stage)
-        # Examples: GBasic, RStage1, WStage2, PVMAX, Mega, etc.
-        pokemon_indicators = ['basic', 'stage', 'vmax', 'vstar', 'ex', 'gx', 'v', 'mega', 'break']
-        if any(indicator in type_lower for indicator in pokemon_indicators):
-            return "Pokemon"
-        
-        # Type codes that start with element letters (G, R, W, L, P, F, C, D, M, N)
-        if len(type_code) > 0 and type_code[0] in 'GRWLPFCDMN':
-            return "Pokemon"
-        
-        # Default to Pokemon for unknown types
-        return "Pokemon"
+        return card_category(type_code)
     
-    def load_csv_database(self) -> bool:
+    def load_csv_database(self, manager: 'CardDataManager' = None) -> bool:
         """
-        Load all cards from all_cards_database.csv (created by convert_alle_karten.py).
-        This is the preferred source as it's always up-to-date.
+        Build the type map from an already-loaded CardDataManager (default: the shared one).
+        Uses its precomputed 'category' column - no second CSV parse. The finished maps are
+        stored as snapshot sections, so later startups only unpickle them. The Japanese
+        cards are only merged into the manager when load_japanese is set.
         Returns True if successfully loaded, False otherwise.
         """
-        app_path = self.get_app_path()
-        
-        # Try new location first: data/all_cards_database.csv (relative to workspace root)
-        data_csv = os.path.join(os.path.dirname(app_path), 'data', 'all_cards_database.csv')
-        
-        # Fallback to old location: all_cards_database.csv in app directory
-        app_csv = os.path.join(app_path, 'all_cards_database.csv')
-        
-        # Determine which file to use
-        if os.path.exists(data_csv):
-            csv_file = data_csv
-            print(f"Loading card database from data/: {csv_file}")
-        elif os.path.exists(app_csv):
-            csv_file = app_csv
-            print(f"Loading card database from app dir: {csv_file}")
-        else:
-            print("INFO: all_cards_database.csv not found. Will use fallback text files.")
-            print(f"  Checked locations:")
-            print(f"    - {data_csv}")
-            print(f"    - {app_csv}")
+        if not _CARD_DATA_MANAGER_AVAILABLE:
+            print("INFO: card_data_manager.py not available. Will use fallback text files.")
             return False
         
         try:
-            with open(csv_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f, delimiter=';')
-                
-                card_count = 0
-                pokemon_count = 0
-                trainer_count = 0
-                energy_count = 0
-                
-                for row in reader:
-                    # Support both 'name' and 'card_name' column names
-                    card_name = row.get('card_name') or row.get('name', '')
-                    card_name = card_name.strip()
-                    
-                    # Support both 'type' and 'card_type' column names
-                    card_type_raw = row.get('card_type') or row.get('type', '')
-                    card_type_raw = card_type_raw.strip()
-                    
-                    if not card_name or not card_type_raw:
-                        continue
-                    
-                    # Determine category from type code
-                    # Type codes: GBasic, RBasic, WBasic, etc. = Pokemon
-                    # Empty or 'Energy' = Energy
-                    # Everything else check for keywords
-                    card_type = self._determine_card_category(card_type_raw)
-                    
-                    # Normalize the card name for lookup
-                    normalized_name = self.normalize_card_name(card_name)
-                    
-                    # Store in database
-                    self.card_database[normalized_name] = card_type
-                    card_count += 1
-                    
-                    # Count by type
-                    if card_type == "Pokemon":
-                        pokemon_count += 1
-                    elif card_type == "Trainer":
-                        trainer_count += 1
-                    elif card_type == "Energy":
-                        energy_count += 1
+            manager = manager or get_shared_manager()
             
-            print(f"Loaded {card_count} cards from CSV database:")
-            print(f"  - Pokemon: {pokemon_count}")
-            print(f"  - Trainer: {trainer_count}")
-            print(f"  - Energy: {energy_count}")
+            main_map = manager.get_snapshot_section('card_type_lookup', TYPE_MAP_VERSION)
+            if not main_map:
+                main_map = self._build_type_map(manager.get_all_cards(require_japanese=False), japanese=False)
+                manager.store_snapshot_section('card_type_lookup', TYPE_MAP_VERSION, main_map)
+            
+            japanese_map = {}
+            if self.load_japanese:
+                japanese_map = manager.get_snapshot_section('card_type_lookup:jp', TYPE_MAP_VERSION)
+                if japanese_map is None:
+                    japanese_map = self._build_type_map(manager.get_all_cards(), japanese=True)
+                    # Japanese extras only for names the main database doesn't know
+                    japanese_map = {k: v for k, v in japanese_map.items() if k not in main_map}
+                    manager.store_snapshot_section('card_type_lookup:jp', TYPE_MAP_VERSION, japanese_map)
+            
+            if not main_map:
+                print("INFO: Card database is empty. Will use fallback text files.")
+                return False
+            
+            self.card_database = main_map
+            if self.load_japanese:
+                self.japanese_database = japanese_map
+            
+            categories = list(self.card_database.values())
+            print(f"Loaded {len(self.card_database)} cards from card database:")
+            print(f"  - Pokemon: {categories.count('Pokemon')}")
+            print(f"  - Trainer: {categories.count('Trainer')}")
+            print(f"  - Energy: {categories.count('Energy')}")
+            if self.load_japanese:
+                print(f"  - Japanese exclusive: {len(self.japanese_database)}")
             
             return True
             
         except Exception as e:
-            print(f"ERROR loading CSV database: {e}")
+            print(f"ERROR loading card database: {e}")
             import traceback
             traceback.print_exc()
             return False
     
+    def _build_type_map(self, cards, japanese: bool) -> Dict[str, str]:
+        """normalized name -> category for the English (or Japanese-only) cards."""
+        type_map = {}
+        for card in cards:
+            if (card.get('_source') == 'japanese') != japanese:
+                continue
+            card_name = (card.get('name') or '').strip()
+            if not card_name or not (card.get('type') or '').strip():
+                continue
+            type_map[self.normalize_card_name(card_name)] = card['category']
+        return type_map
+    
     def load_card_database(self):
         """Load all cards from Alle Karten.txt"""
         app_path = self.get_app_path()
@@ -343,6 +329,113 @@ class CardTypeLookup:
             import traceback
             traceback.print_exc()
     
+    # ========================================================================
+    # FUZZY MATCHING (trigram index)
+    # ========================================================================
+    
+    def _fuzzy_key(self, name: str) -> str:
+        """Normalized name with accents folded (Pokémon -> pokemon) and ellipsis removed."""
+        folded = unicodedata.normalize('NFKD', self.normalize_card_name(name))
+        folded = ''.join(ch for ch in folded if not unicodedata.combining(ch))
+        return folded.replace('…', '').rstrip('. ').strip()
+    
+    @staticmethod
+    def _trigrams(key: str) -> set:
+        """Set of padded character trigrams ('  a', ' ab', 'abc', ..., 'yz ')."""
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def _build_fuzzy_index(self):
+        """Build the trigram postings over all known names (main + Japanese database)."""
+        seen = {}
+        for normalized in list(self.card_database) + list(self.japanese_database):
+            key = self._fuzzy_key(normalized)
+            if not key or key in seen:
+                continue
+            seen[key] = len(self._fuzzy_names)
+            self._fuzzy_names.append(key)
+            self._fuzzy_targets.append(normalized)
+            
+            trigrams = self._trigrams(key)
+            self._fuzzy_trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self._fuzzy_postings.setdefault(trigram, []).append(seen[key])
+        
+        self._fuzzy_sorted = sorted(seen.items())
+    
+    def find_best_match(self, card_name: str, min_score: float = FUZZY_MIN_SCORE) -> Tuple[Optional[str], float]:
+        """
+        Find the closest known card name for a noisy name (typo, accents, truncation).
+        
+        Args:
+            card_name: The scraped name
+            min_score: Minimum similarity (0.0-1.0) to accept a match
+            
+        Returns:
+            (normalized name as used in the type maps, score) or (None, best score found)
+            Exact matches return score 1.0; truncated names ("Professor's Rese...")
+            that are a unique prefix of a known name return 0.95.
+        """
+        normalized = self.normalize_card_name(card_name)
+        if normalized in self.card_database or normalized in self.japanese_database:
+            return normalized, 1.0
+        
+        cache_key = f"{normalized}|{min_score}"
+        if cache_key in self._fuzzy_cache:
+            return self._fuzzy_cache[cache_key]
+        
+        if not self._fuzzy_names and (self.card_database or self.japanese_database):
+            self._build_fuzzy_index()
+        
+        key = self._fuzzy_key(card_name)
+        result: Tuple[Optional[str], float] = (None, 0.0)
+        
+        if len(key) >= FUZZY_MIN_LENGTH:
+            # Accent/punctuation variants normalize to the same key
+            pos = bisect.bisect_left(self._fuzzy_sorted, (key,))
+            if pos < len(self._fuzzy_sorted) and self._fuzzy_sorted[pos][0] == key:
+                result = (self._fuzzy_targets[self._fuzzy_sorted[pos][1]], 1.0)
+            else:
+                result = self._best_trigram_match(key)
+                
+                # Truncated names: unique known name starting with the text
+                if card_name.rstrip().endswith(('...', '…')) and result[1] < min_score:
+                    prefix_matches = self._fuzzy_sorted[pos:pos + 2]
+                    prefix_matches = [p for p in prefix_matches if p[0].startswith(key)]
+                    if len(prefix_matches) == 1:
+                        result = (self._fuzzy_targets[prefix_matches[0][1]], 0.95)
+        
+        if result[1] < min_score:
+            result = (None, result[1])
+        
+        self._fuzzy_cache[cache_key] = result
+        return result
+    
+    def _best_trigram_match(self, key: str) -> Tuple[Optional[str], float]:
+        """Best Dice coefficient over the trigram postings (only names sharing a trigram are scored)."""
+        query = self._trigrams(key)
+        overlaps: Dict[int, int] = {}
+        for trigram in query:
+            for position in self._fuzzy_postings.get(trigram, ()):
+                overlaps[position] = overlaps.get(position, 0) + 1
+        
+        if not overlaps:
+            return None, 0.0
+        
+        query_count = len(query)
+        counts = self._fuzzy_trigram_counts
+        best_position, best_score = None, 0.0
+        for position, overlap in overlaps.items():
+            score = 2.0 * overlap / (query_count + counts[position])
+            if score > best_score:
+                best_position, best_score = position, score
+        
+        return self._fuzzy_targets[best_position], best_score
+    
+    def _lookup_category(self, normalized: str) -> Optional[str]:
+        """Category for an exact normalized name (main database first)."""
+        return self.card_database.get(normalized) or self.japanese_database.get(normalized)
+    
     def get_card_type(self, card_name: str) -> str:
         """
         Get the type of a card (Pokemon, Trainer, or Energy).
@@ -385,6 +478,11 @@ class CardTypeLookup:
             if variant in self.card_database:
                 return self.card_database[variant]
         
+        # Noisy HTML name (typo, accents, truncation): closest known name
+        match, _score = self.find_best_match(card_name)
+        if match:
+            return self._lookup_category(match)
+        
         # Not found - return Pokemon as safe default
         # (Most cards are Pokemon, and it's safer to include an extra Pokemon
         # than to accidentally classify a Pokemon as Trainer/Energy)
@@ -443,7 +541,9 @@ class CardTypeLookup:
                 if variant in self.card_database:
                     return True
         
-        return False
+        # Noisy HTML name (typo, accents, truncation): closest known name
+        match, _score = self.find_best_match(card_name)
+        return match is not None
 
 
 # Global singleton instances
@@ -549,3 +649,19 @@ if __name__ == "__main__":
         card_type = lookup.get_card_type(card)
         is_trainer = lookup.is_trainer_or_energy(card)
         print(f"{card:30} -> {card_type:10} (Trainer/Energy: {is_trainer})")
+    
+    print("\n=== Testing Fuzzy Matching ===")
+    
+    noisy_cards = [
+        "Ultra Bal",
+        "Profesor's Research",
+        "Pokégear 3.0",
+        "Pokegear 3.0",
+        "Boss's Ord...",
+        "CUT WILL GET COAL",
+        "January 2025"
+    ]
+    
+    for card in noisy_cards:
+        match, score = lookup.find_best_match(card)
+        print(f"{card:30} -> {str(match):30} (score: {score:.2f}, valid: {lookup.is_valid_card(card)})")
@@ -18,7 +18,6 @@ import os
 import sys
 import json
 import re
-import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 from collections import defaultdict
@@ -39,8 +38,11 @@ if sys.platform == 'win32':
 # Import shared scraper utilities
 from card_scraper_shared import (
     get_app_path, get_data_dir, CardDatabaseLookup, 
-    aggregate_card_data, save_to_csv, fetch_page, normalize_archetype_name
+    aggregate_card_data, save_to_csv, normalize_archetype_name, iter_decklist_cards
 )
+from http_cache import parse_page_date
+from http_client import (FetchEngine, configure_http, configure_rate_limit, fetch_summary, get_client,
+                         safe_fetch, save_fetch_telemetry)
 
 # Try to import city_league_module for tournament scraping
 try:
@@ -65,12 +67,17 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
             "max_tournaments": 0,
             "request_timeout": 20,
             "max_retries": 2,
-            "retry_delay": 1.0
+            "retry_delay": 1.0,
+            "max_parallel_requests": 4,
+            "requests_per_second": 2.0,
+            "max_requests_per_second": 4.0
         }
     },
     "output_file": "city_league_analysis.csv",
     "append_mode": True,
     "delay_between_requests": 1.5,
+    "http_cache": True,
+    "cache_immutable_after_days": 14,
     "_comment": "Scrapes City League tournaments and extracts card data by archetype. append_mode=True keeps old tournament dates when adding new data."
 }
 
@@ -127,19 +134,6 @@ def resolve_date_range(start_date: str, end_date: str) -> Tuple[datetime, dateti
     return start_dt, end_dt
 
 
-def safe_fetch(url: str, timeout: int, retries: int, retry_delay: float) -> str:
-    """Fetch a URL with retries and a configurable timeout."""
-    attempts = retries + 1
-    for attempt in range(1, attempts + 1):
-        print(f"  Fetching: {url} (attempt {attempt}/{attempts})", flush=True)
-        html = fetch_page(url, timeout=timeout)
-        if html:
-            return html
-        print(f"  [WARN] Fetch failed (attempt {attempt}/{attempts}): {url}")
-        time.sleep(retry_delay)
-    return ""
-
-
 def fetch_city_league_tournaments(start_dt: datetime, end_dt: datetime) -> List[Dict[str, Any]]:
     """
     Fetch City League tournaments from limitlesstcg.com for given date range.
@@ -150,7 +144,7 @@ def fetch_city_league_tournaments(start_dt: datetime, end_dt: datetime) -> List[
         return []
     
     print("Fetching City League tournaments...")
-    tournaments = city_league_module.get_tournaments_in_date_range("jp", start_dt, end_dt, 1.5)
+    tournaments = city_league_module.get_tournaments_in_date_range("jp", start_dt, end_dt)
     print(f"Found {len(tournaments)} tournaments in date range")
     
     return tournaments
@@ -161,91 +155,43 @@ def extract_cards_from_deck_html(deck_html: str, card_db: CardDatabaseLookup) ->
     Extract Pokemon, Trainer, and Energy cards from a deck HTML page.
     Returns list of cards with: name, count, set_code, set_number
     """
-    cards = []
-    
-    # ========== POKEMON CARDS ==========
-    pokemon_section = re.search(
-        r'<div class="decklist-column-heading">Pokémon[^<]*</div>(.*?)(?=<div class="decklist-column-heading"|$)',
-        deck_html, re.DOTALL | re.IGNORECASE
-    )
-    
-    if pokemon_section:
-        pokemon_cards = re.findall(
-            r'<div[^>]+class="decklist-card"[^>]+data-set="([^"]+)"[^>]+data-number="([^"]+)"[^>]*>.*?'
-            r'<span class="card-count">([^<]+)</span>\s*<span class="card-name">([^<]+)</span>',
-            pokemon_section.group(1), re.DOTALL | re.IGNORECASE
-        )
-        
-        for set_code, set_number, count, card_name in pokemon_cards:
-            cards.append({
-                'name': card_name.strip(),
-                'count': int(float(count)),
-                'set_code': set_code.strip(),
-                'set_number': set_number.strip()
-            })
-    
-    # ========== TRAINER CARDS ==========
-    trainer_section = re.search(
-        r'<div class="decklist-column-heading">Trainer[^<]*</div>(.*?)(?=<div class="decklist-column-heading"|$)',
-        deck_html, re.DOTALL | re.IGNORECASE
-    )
-    
-    if trainer_section:
-        trainer_cards = re.findall(
-            r'<div[^>]+class="decklist-card"[^>]*>.*?<span class="card-count">([^<]+)</span>\s*<span class="card-name">([^<]+)</span>',
-            trainer_section.group(1), re.DOTALL | re.IGNORECASE
-        )
-        
-        for count, card_name in trainer_cards:
-            card_name = card_name.strip()
-            latest_card = card_db.get_latest_low_rarity_version(card_name)
-            if latest_card:
-                cards.append({
-                    'name': card_name,
-                    'count': int(float(count)),
-                    'set_code': latest_card.set_code,
-                    'set_number': latest_card.number
-                })
-    
-    # ========== ENERGY CARDS ==========
-    energy_section = re.search(
-        r'<div class="decklist-column-heading">Energy[^<]*</div>(.*?)(?=<div class="decklist-column"|$)',
-        deck_html, re.DOTALL | re.IGNORECASE
-    )
-    
-    if energy_section:
-        energy_cards = re.findall(
-            r'<div[^>]+class="decklist-card"[^>]*>.*?<span class="card-count">([^<]+)</span>\s*<span class="card-name">([^<]+)</span>',
-            energy_section.group(1), re.DOTALL | re.IGNORECASE
-        )
-        
-        for count, card_name in energy_cards:
-            card_name = card_name.strip()
-            latest_card = card_db.get_latest_low_rarity_version(card_name)
-            if latest_card:
-                cards.append({
-                    'name': card_name,
-                    'count': int(float(count)),
-                    'set_code': latest_card.set_code,
-                    'set_number': latest_card.number
-                })
-    
-    return cards
+    entries = [
+        {
+            'name': card.name,
+            'count': int(card.count),
+            'section': card.section,
+            'set_code': card.set_code if card.section == 'pokemon' else '',
+            'set_number': card.number if card.section == 'pokemon' else ''
+        }
+        for card in iter_decklist_cards(deck_html)
+    ]
+    
+    # Resolve whole deck in one batch; Trainer/Energy without low-rarity print are skipped
+    return [
+        {
+            'name': row['name'],
+            'count': row['count'],
+            'set_code': row['set_code'],
+            'set_number': row['set_number']
+        }
+        for row in card_db.resolve_decklist(entries)
+        if row['resolved'] or row['section'] == 'pokemon'
+    ]
 
 
 def process_tournament_decklists(
     tournament_html: str,
     max_decklists: int,
     tournament_info: Dict[str, Any],
-    delay: float,
     request_timeout: int,
     max_retries: int,
-    retry_delay: float,
-    card_db: CardDatabaseLookup
+    card_db: CardDatabaseLookup,
+    engine: Optional[FetchEngine] = None
 ) -> List[Dict[str, Any]]:
     """
     Process a single tournament's decklists.
-    Extract deck links and names from tournament page, then fetch and parse each deck.
+    Extract deck links and names from tournament page, then fetch all decks in parallel
+    (FetchEngine: adaptive per-host rate control) and parse each one as it arrives.
     """
     tournament_id = tournament_info.get('tournament_id') or tournament_info.get('id', 'unknown')
     tournament_date = tournament_info.get('date_str', '')
@@ -282,37 +228,35 @@ def process_tournament_decklists(
     deck_names = deck_names[:max_decklists]
     print(f"  Found {len(list_links)} decklist links", flush=True)
     
-    # Process each decklist
-    for list_url_suffix, deck_name in zip(list_links, deck_names):
+    if engine is None:
+        engine = FetchEngine(timeout=request_timeout, retries=max_retries)
+    
+    # Build absolute URLs
+    deck_urls = [
+        suffix if suffix.startswith('http') else f"https://limitlesstcg.com{suffix}"
+        for suffix in list_links
+    ]
+    
+    # Fetch all decklists in parallel, parse each as soon as it arrives
+    parsed: Dict[int, Dict[str, Any]] = {}
+    for outcome in engine.fetch_all(deck_urls, parse_page_date(tournament_date)):
+        if not outcome.ok:
+            print(f"  [WARN] Fetch failed ({outcome.error}): {outcome.url}", flush=True)
+            continue
         try:
-            # Build absolute URL
-            if list_url_suffix.startswith('http'):
-                deck_url = list_url_suffix
-            else:
-                deck_url = f"https://limitlesstcg.com{list_url_suffix}"
-            
-            # Fetch deck HTML
-            deck_html = safe_fetch(deck_url, request_timeout, max_retries, retry_delay)
-            if not deck_html:
-                continue
-            
-            # Extract cards
-            cards = extract_cards_from_deck_html(deck_html, card_db)
-            
+            cards = extract_cards_from_deck_html(outcome.text, card_db)
             if cards:
-                decks.append({
-                    'archetype': normalize_archetype_name(deck_name),
+                parsed[outcome.index] = {
+                    'archetype': normalize_archetype_name(deck_names[outcome.index]),
                     'cards': cards,
                     'source': 'City League',
                     'tournament_date': tournament_date
-                })
-            
-            time.sleep(0.3)
-        
+                }
         except Exception as e:
             print(f"  [WARN] Decklist error (tournament {tournament_id}): {e}", flush=True)
-            continue
     
+    # Keep standings order
+    decks = [parsed[index] for index in sorted(parsed)]
     return decks
 
 
@@ -338,7 +282,9 @@ def scrape_city_league(settings: Dict[str, Any], card_db: CardDatabaseLookup) ->
     request_timeout = config.get('request_timeout', 20)
     max_retries = config.get('max_retries', 2)
     retry_delay = config.get('retry_delay', 1.0)
-    delay = settings.get('delay_between_requests', 1.5)
+    configure_rate_limit(config)
+    engine = FetchEngine.from_settings(config)
+    print(f"Parallel requests: {engine.max_workers} ({get_client().rate.describe()})", flush=True)
     
     # Resolve date range
     start_dt, end_dt = resolve_date_range(start_date_str, end_date_str)
@@ -379,8 +325,9 @@ def scrape_city_league(settings: Dict[str, Any], card_db: CardDatabaseLookup) ->
                 print(f"  [WARN] Missing tournament URL (ID: {tournament_id})", flush=True)
                 continue
             
-            # Fetch tournament page
-            html = safe_fetch(tournament_url, request_timeout, max_retries, retry_delay)
+            # Fetch tournament page (finished tournaments come from the response cache)
+            html = safe_fetch(tournament_url, request_timeout, max_retries, retry_delay,
+                              content_date=parse_page_date(tournament.get('date_str', '')))
             if not html:
                 print(f"  [WARN] Failed to fetch tournament page (ID: {tournament_id})", flush=True)
                 continue
@@ -391,16 +338,14 @@ def scrape_city_league(settings: Dict[str, Any], card_db: CardDatabaseLookup) ->
                 html,
                 max_decklists,
                 tournament,
-                delay,
                 request_timeout,
                 max_retries,
-                retry_delay,
-                card_db
+                card_db,
+                engine
             )
             print(f"  Extracted {len(decklists)} decklists", flush=True)
             all_decks.extend(decklists)
-            
-            time.sleep(delay)
+
         
         except Exception as e:
             print(f"  [WARN] Tournament error (ID: {tournament_id}): {e}", flush=True)
@@ -423,6 +368,7 @@ def main():
     
     # Load settings
     settings = load_settings()
+    configure_http(settings)
     
     # Initialize Card Database (now uses unified CardDataManager)
     print("Loading unified card database (English + Japanese)...")
@@ -464,6 +410,8 @@ def main():
     print("\n" + "="*60)
     print("SCRAPING COMPLETE!")
     print("="*60)
+    print(fetch_summary())
+    save_fetch_telemetry()
     input("\nPress Enter to exit...")
 
 
@@ -5,11 +5,8 @@ Scrapes archetype data from limitlesstcg.com Japanese City League tournaments
 No external dependencies required - uses only Python standard library
 """
 
-import urllib.request
-import urllib.parse
 import csv
 import re
-import time
 import json
 import os
 import sys
@@ -17,6 +14,10 @@ from datetime import datetime
 from html.parser import HTMLParser
 from typing import List, Dict, Optional, Tuple, Any
 
+from http_cache import parse_page_date
+from http_client import (configure_http, feed_page, fetch_page, fetch_summary, get_client,
+                         save_fetch_telemetry)
+
 # Fix Windows console encoding for Unicode characters (✓, ×, •, etc.)
 if sys.platform == 'win32':
     if hasattr(sys.stdout, 'reconfigure'):
@@ -137,19 +138,6 @@ def parse_date(date_str: str) -> datetime:
         print(f"Error parsing date: {date_str}. Using format DD.MM.YYYY")
         raise
 
-def fetch_page(url: str) -> str:
-    """Fetch a webpage and return its HTML content."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return response.read().decode('utf-8', errors='ignore')
-    except Exception as e:
-        print(f"Error fetching {url}: {type(e).__name__}: {str(e)[:50]}")
-        return ""
-
 class TournamentListParser(HTMLParser):
     """Parser to extract tournament information from the list page."""
     def __init__(self):
@@ -280,7 +268,7 @@ def extract_tournament_data_regex(html: str) -> List[Dict[str, str]]:
     
     return archetypes
 
-def get_tournaments_in_date_range(region: str, start_date: datetime, end_date: datetime, delay: float = 1.5) -> List[Dict[str, str]]:
+def get_tournaments_in_date_range(region: str, start_date: datetime, end_date: datetime) -> List[Dict[str, str]]:
     """
     Fetch all tournaments from limitlesstcg.com for the given region and date range.
     """
@@ -288,16 +276,21 @@ def get_tournaments_in_date_range(region: str, start_date: datetime, end_date: d
     url = f"https://limitlesstcg.com/tournaments/{region}?show=500"
     
     print(f"Fetching tournament list from: {url}")
-    html = fetch_page(url)
     
-    if not html:
+    # Parse the list while it downloads - it is sorted newest first, so stop at the
+    # first tournament older than start_date instead of loading all 500 rows
+    parser = TournamentListParser()
+    
+    def reached_start_date() -> bool:
+        if not parser.tournaments:
+            return False
+        oldest = parse_page_date(parser.tournaments[-1]['date_str'])
+        return oldest is not None and oldest < start_date
+    
+    if not feed_page(url, parser, stop=reached_start_date) and not parser.tournaments:
         print("Failed to fetch tournament list.")
         return []
     
-    # Parse the HTML to extract tournament links and dates
-    parser = TournamentListParser()
-    parser.feed(html)
-    
     tournaments_in_range = []
     
     print(f"\nFound {len(parser.tournaments)} tournaments total.")
@@ -320,14 +313,14 @@ def get_tournaments_in_date_range(region: str, start_date: datetime, end_date: d
     print(f"\nFound {len(tournaments_in_range)} tournaments in the specified date range.")
     return tournaments_in_range
 
-def scrape_tournament_archetypes(tournament_url: str, tournament_info: Dict[str, str], delay: float = 1.5) -> List[Dict[str, str]]:
+def scrape_tournament_archetypes(tournament_url: str, tournament_info: Dict[str, str]) -> List[Dict[str, str]]:
     """
     Scrape all deck archetypes from a single tournament.
     """
     print(f"\nScraping tournament: {tournament_url}")
-    time.sleep(delay)
     
-    html = fetch_page(tournament_url)
+    # Finished tournaments are served from the response cache on later runs
+    html = fetch_page(tournament_url, content_date=parse_page_date(tournament_info.get('date_str', '')))
     if not html:
         print(f"  Failed to fetch tournament page.")
         return []
@@ -870,6 +863,7 @@ def main():
     
     # Load settings
     settings = load_settings()
+    configure_http(settings)
     
     # Calculate dates (end_date can be 'auto' for today-2)
     start_date_str, end_date_str = calculate_date_range(settings['start_date'], settings['end_date'])
@@ -888,14 +882,13 @@ def main():
         print(f"    (End date auto-calculated: today - 2 days)")
     print(f"  Region: {settings['region']}")
     print(f"  Output File: {settings['output_file']}")
-    print(f"  Delay: {settings['delay_between_requests']}s")
+    print(f"  Request rate: {get_client().rate.describe()}")
     
     # Get tournaments in date range
     tournaments = get_tournaments_in_date_range(
         settings['region'],
         start_date,
-        end_date,
-        settings['delay_between_requests']
+        end_date
     )
     
     if not tournaments:
@@ -913,8 +906,7 @@ def main():
         
         archetypes = scrape_tournament_archetypes(
             tournament['url'],
-            tournament,
-            settings['delay_between_requests']
+            tournament
         )
         
         all_data.extend(archetypes)
@@ -922,6 +914,8 @@ def main():
     # Save results
     print("\n" + "=" * 60)
     print(f"Scraping complete! Total entries collected: {len(all_data)}")
+    print(fetch_summary())
+    save_fetch_telemetry()
     
     if all_data:
         # Load old data for comparison (if exists)
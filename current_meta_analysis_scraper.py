@@ -10,8 +10,6 @@ import os
 import sys
 import json
 import re
-import time
-import urllib.request
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
@@ -21,10 +19,13 @@ from card_scraper_shared import (
     CardDatabaseLookup,
     aggregate_card_data,
     save_to_csv,
-    fetch_page,
     normalize_archetype_name,
-    parse_copy_button_decklist
+    parse_copy_button_decklist,
+    iter_decklist_cards
 )
+from http_cache import parse_page_date
+from http_client import (FetchEngine, LinkCollector, configure_http, feed_page, fetch_page, fetch_summary, get_client,
+                         safe_fetch, save_fetch_telemetry, set_content_date)
 
 # Fix Windows console encoding for Unicode characters (✓, ×, •, etc.)
 if sys.platform == 'win32':
@@ -46,8 +47,6 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
             "enabled": True,
             "max_decks": 60,
             "max_lists_per_deck": 20,
-            "delay_between_lists": 4.0,
-            "delay_between_decks": 8.0,
             "format_filter": "PFL"
         },
         "tournaments": {
@@ -58,8 +57,13 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
             "format_filter": ["Standard", "Standard (JP)"]
         }
     },
-    "delay_between_requests": 3.0,
+    "requests_per_second": 2.0,
+    "host_requests_per_second": {"play.limitlesstcg.com": 0.25},  # Limitless Online lists: old pace (1 / 4.0 s)
+    "max_requests_per_second": 4.0,
     "request_timeout": 20,
+    "max_parallel_requests": 4,
+    "http_cache": True,
+    "cache_immutable_after_days": 14,
     "max_retries": 2,
     "retry_delay": 1.0,
     "append_mode": True,
@@ -68,19 +72,6 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 }
 
 
-def safe_fetch(url: str, timeout: int, retries: int, retry_delay: float) -> str:
-    """Fetch a URL with retries and a configurable timeout."""
-    attempts = retries + 1
-    for attempt in range(1, attempts + 1):
-        print(f"  Fetching: {url} (attempt {attempt}/{attempts})", flush=True)
-        html = fetch_page(url, timeout=timeout)
-        if html:
-            return html
-        print(f"  [WARN] Fetch failed (attempt {attempt}/{attempts}): {url}", flush=True)
-        time.sleep(retry_delay)
-    return ""
-
-
 def load_settings() -> Dict[str, Any]:
     """Load settings from dist/current_meta_analysis_settings.json."""
     app_path = get_app_path()
@@ -144,6 +135,34 @@ def fix_mega_pokemon_name(name: str) -> str:
 # LIMITLESS ONLINE (Meta Live)
 # ============================================================
 
+def extract_cards_from_online_decklist(list_html: str, card_db: CardDatabaseLookup) -> List[Dict[str, Any]]:
+    """Extract cards from a play.limitlesstcg.com decklist page (Pokémon / Trainer / Energy headings)."""
+    entries = [
+        {
+            "name": card.name,
+            "count": int(card.count),
+            "section": card.section,
+            "set_code": card.set_code if card.section == "pokemon" else "",
+            "set_number": card.number if card.section == "pokemon" else ""
+        }
+        for card in iter_decklist_cards(list_html)
+    ]
+
+    # One batch per decklist; Trainer/Energy without low-rarity print are skipped
+    cards = [
+        {
+            "name": row["name"],
+            "count": row["count"],
+            "set_code": row["set_code"],
+            "set_number": row["set_number"]
+        }
+        for row in card_db.resolve_decklist(entries)
+        if row["resolved"] or row["section"] == "pokemon"
+    ]
+
+    return cards
+
+
 def scrape_limitless_online(settings: Dict[str, Any], card_db: CardDatabaseLookup) -> List[Dict[str, Any]]:
     """Scrape Limitless Online deck data from tournament pages."""
     config = settings.get("sources", {}).get("limitless_online", {})
@@ -157,13 +176,15 @@ def scrape_limitless_online(settings: Dict[str, Any], card_db: CardDatabaseLooku
 
     max_decks = config.get("max_decks", 60)
     max_lists_per_deck = config.get("max_lists_per_deck", 20)
-    delay_lists = config.get("delay_between_lists", settings.get("delay_between_requests", 1.5))
-    delay_decks = config.get("delay_between_decks", settings.get("delay_between_requests", 1.5))
     format_filter = config.get("format_filter", "PFL")
     request_timeout = settings.get("request_timeout", 20)
     max_retries = settings.get("max_retries", 2)
     retry_delay = settings.get("retry_delay", 1.0)
 
+    # Decklists are fetched in parallel, paced by the adaptive per-host rate control
+    lists_engine = FetchEngine.from_settings(settings)
+    print(f"Parallel requests: {lists_engine.max_workers} ({get_client().rate.describe()})", flush=True)
+
     decks_url = "https://play.limitlesstcg.com/decks?game=PTCG"
     print(f"Fetching decks page: {decks_url}", flush=True)
 
@@ -223,98 +244,34 @@ def scrape_limitless_online(settings: Dict[str, Any], card_db: CardDatabaseLooku
             unique_list_links = unique_list_links[:max_to_try]
             print(f"  Found {len(unique_list_links)} tournament decklists available", flush=True)
 
+            list_urls = [f"https://play.limitlesstcg.com{list_href}" for list_href in unique_list_links]
             successful_lists = 0
-
-            for list_idx, list_href in enumerate(unique_list_links, 1):
-                if successful_lists >= max_lists_per_deck:
-                    break
-
-                list_url = f"https://play.limitlesstcg.com{list_href}"
-                try:
-                    list_html = safe_fetch(list_url, request_timeout, max_retries, retry_delay)
-                    if not list_html:
+            next_index = 0
+
+            # Fetch only as many lists in parallel as are still needed, next batch if some fail
+            while successful_lists < max_lists_per_deck and next_index < len(list_urls):
+                batch_start = next_index
+                batch = list_urls[next_index:next_index + max_lists_per_deck - successful_lists]
+                next_index += len(batch)
+
+                for outcome in lists_engine.fetch_ordered(batch):
+                    if successful_lists >= max_lists_per_deck:
+                        break
+                    if not outcome.ok:
                         continue
-
-                    cards = []
-
-                    pokemon_match = re.search(
-                        r'<div class="cards"><div class="heading">Pokémon[^<]*</div>(.*?)</div>',
-                        list_html,
-                        re.DOTALL | re.IGNORECASE
-                    )
-
-                    if pokemon_match:
-                        pokemon_links = re.findall(
-                            r'<a href="[^"]+/([A-Z0-9]+)/([0-9]+)"[^>]*>([0-9]+)\s+([^<(]+)\s*\([^)]+\)</a>',
-                            pokemon_match.group(1)
-                        )
-                        for set_code, set_number, count, card_name in pokemon_links:
-                            cards.append({
-                                "name": card_name.strip(),
-                                "count": int(count),
-                                "set_code": set_code.strip(),
-                                "set_number": set_number.strip()
+                    try:
+                        cards = extract_cards_from_online_decklist(outcome.text, card_db)
+                        if cards:
+                            all_decks.append({
+                                "archetype": normalize_archetype_name(deck_name),
+                                "deck_slug": deck_slug,
+                                "cards": cards,
+                                "source": "limitless_online"
                             })
-
-                    trainer_match = re.search(
-                        r'<div class="heading">Trainer[^<]*</div>(.*?)</div>',
-                        list_html,
-                        re.DOTALL | re.IGNORECASE
-                    )
-
-                    if trainer_match:
-                        trainer_links = re.findall(
-                            r'<a href="[^"]+"[^>]*>([0-9]+)\s+([^<]+)</a>',
-                            trainer_match.group(1)
-                        )
-                        for count, card_name in trainer_links:
-                            card_name = card_name.strip()
-                            latest_card = card_db.get_latest_low_rarity_version(card_name)
-                            if latest_card:
-                                cards.append({
-                                    "name": card_name,
-                                    "count": int(count),
-                                    "set_code": latest_card.set_code,
-                                    "set_number": latest_card.number
-                                })
-
-                    energy_match = re.search(
-                        r'<div class="heading">Energy[^<]*</div>(.*?)</div>',
-                        list_html,
-                        re.DOTALL | re.IGNORECASE
-                    )
-
-                    if energy_match:
-                        energy_links = re.findall(
-                            r'<a href="[^"]+"[^>]*>([0-9]+)\s+([^<]+)</a>',
-                            energy_match.group(1)
-                        )
-                        for count, card_name in energy_links:
-                            latest_card = card_db.get_latest_low_rarity_version(card_name)
-                            if latest_card:
-                                cards.append({
-                                    "name": card_name.strip(),
-                                    "count": int(count),
-                                    "set_code": latest_card.set_code,
-                                    "set_number": latest_card.number
-                                })
-
-                    if cards:
-                        all_decks.append({
-                            "archetype": normalize_archetype_name(deck_name),
-                            "deck_slug": deck_slug,
-                            "cards": cards,
-                            "source": "limitless_online"
-                        })
-                        successful_lists += 1
-                        print(f"    [{list_idx}] {deck_name}: Extracted {len(cards)} cards", flush=True)
-
-                    time.sleep(delay_lists)
-
-                except Exception:
-                    continue
-
-            time.sleep(delay_decks)
+                            successful_lists += 1
+                            print(f"    [{batch_start + outcome.index + 1}] {deck_name}: Extracted {len(cards)} cards", flush=True)
+                    except Exception:
+                        continue
 
         except Exception as e:
             print(f"  Error processing {deck_name}: {e}", flush=True)
@@ -335,18 +292,22 @@ def get_tournament_links(base_url: str, max_tournaments: int) -> List[Dict[str,
     tournaments = []
     
     print(f"  Loading tournaments from {base_url}...")
-    html = fetch_page(base_url)
-    if not html:
+    
+    # Extract tournament IDs from links like /0050/standings while the page downloads,
+    # stop as soon as max_tournaments different IDs were seen
+    links = LinkCollector(r'/(\d+)/standings')
+    
+    def enough_tournaments() -> bool:
+        return len({match.group(1) for match in links.matches}) >= max_tournaments
+    
+    if not feed_page(base_url, links, stop=enough_tournaments) and not links.matches:
         print(f"  [DEBUG] Failed to fetch {base_url}")
         return []
-    
-    # Extract tournament IDs from links like /0050/standings
-    matches = re.findall(r'/(\d+)/standings', html)
-    print(f"  [DEBUG] Found {len(matches)} tournament links in HTML")
+    print(f"  [DEBUG] Found {len(links.matches)} tournament links in HTML")
     
     seen_ids = set()
     
-    for tournament_id in matches:
+    for tournament_id in (match.group(1) for match in links.matches):
         if tournament_id not in seen_ids:
             seen_ids.add(tournament_id)
             tournaments.append({
@@ -475,7 +436,11 @@ def extract_cards_from_tournament_decklist(decklist_url: str, card_db: CardDatab
     html_content = fetch_page(decklist_url)
     if not html_content:
         return []
+    return parse_tournament_decklist(html_content)
 
+
+def parse_tournament_decklist(html_content: str) -> List[Dict[str, Any]]:
+    """Parse the embedded JSON card data of a labs.limitlesstcg.com decklist page."""
     cards: List[Dict] = []
     
     # Try to find JSON data in script tags
@@ -551,8 +516,9 @@ def scrape_tournaments(settings: Dict[str, Any], card_db: CardDatabaseLookup) ->
 
     max_tournaments = config.get("max_tournaments", 150)
     max_decks_per_tournament = config.get("max_decks_per_tournament", 128)
-    delay_between_requests = settings.get("delay_between_requests", 3.0)
     request_timeout = settings.get("request_timeout", 20)
+    engine = FetchEngine.from_settings(settings)
+    print(f"Parallel requests: {engine.max_workers} ({get_client().rate.describe()})", flush=True)
     
     base_url = "https://labs.limitlesstcg.com/"
     all_decks = []
@@ -571,6 +537,10 @@ def scrape_tournaments(settings: Dict[str, Any], card_db: CardDatabaseLookup) ->
             info = get_tournament_info(tournament['url'])
             print(f"  {info['name']}", flush=True)
             
+            # Pages of finished tournaments are cached for good (see http_cache)
+            tournament_date = parse_page_date(info['date'])
+            set_content_date(tournament['url'], tournament_date)
+            
             # Get deck links from standings
             deck_links = get_deck_links_from_standings(tournament['id'], max_decks_per_tournament)
             if not deck_links:
@@ -579,23 +549,28 @@ def scrape_tournaments(settings: Dict[str, Any], card_db: CardDatabaseLookup) ->
             
             print(f"  Found {len(deck_links)} decks, scraping...", flush=True)
             
-            for j, deck_info in enumerate(deck_links, 1):
-                if j % 20 == 0:
-                    print(f"    Processed {j}/{len(deck_links)} decks...", flush=True)
+            # Fetch all decklists of the tournament in parallel, parse each as it arrives
+            tournament_decks: Dict[int, Dict[str, Any]] = {}
+            for done, outcome in enumerate(engine.fetch_all((deck['url'] for deck in deck_links), tournament_date), 1):
+                j = outcome.index + 1
+                if done % 20 == 0:
+                    print(f"    Processed {done}/{len(deck_links)} decks...", flush=True)
+                if not outcome.ok:
+                    continue
                 
                 try:
                     # Extract cards from tournament decklist (using JSON format)
-                    cards = extract_cards_from_tournament_decklist(deck_info['url'], card_db)
+                    cards = parse_tournament_decklist(outcome.text)
                     
                     # Validate deck has exactly 60 cards
                     total_cards = sum(card['count'] for card in cards)
                     
                     if cards and total_cards == 60:
-                        all_decks.append({
-                            'archetype': normalize_archetype_name(deck_info['archetype']),
+                        tournament_decks[outcome.index] = {
+                            'archetype': normalize_archetype_name(deck_links[outcome.index]['archetype']),
                             'cards': cards,
                             'source': 'Tournament'
-                        })
+                        }
                     elif cards:
                         if j <= 3:
                             print(f"    ⚠️ Warning: Tournament deck has {total_cards} instead of 60 cards - skipped", flush=True)
@@ -604,11 +579,11 @@ def scrape_tournaments(settings: Dict[str, Any], card_db: CardDatabaseLookup) ->
                     if j <= 3:
                         print(f"    Error extracting deck {j}: {e}", flush=True)
                     continue
-                
-                time.sleep(delay_between_requests / 10)  # Shorter delay between decks
+            
+            # Keep standings order
+            all_decks.extend(tournament_decks[index] for index in sorted(tournament_decks))
             
             print(f"  Collected {len(all_decks)} complete decks so far", flush=True)
-            time.sleep(delay_between_requests)
             
         except Exception as e:
             print(f"  Error processing tournament {tournament['id']}: {e}", flush=True)
@@ -648,6 +623,7 @@ def main():
     print("=" * 60, flush=True)
 
     settings = load_settings()
+    configure_http(settings)
     print("[DEBUG] Settings loaded", flush=True)
 
     print("Loading unified card database (English + Japanese)...", flush=True)
@@ -685,6 +661,8 @@ def main():
     print("\n" + "=" * 60)
     print("SCRAPING COMPLETE!")
     print("=" * 60)
+    print(fetch_summary())
+    save_fetch_telemetry()
     input("\nPress Enter to exit...")
 
 
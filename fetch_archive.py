@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Fetch Archive - Record / Replay of Scraper Network Traffic
+==========================================================
+Fixture archive for http_client.HTTPClient so every scraper can run fully
+offline against a recorded crawl (repeatable parser / aggregation benchmarks).
+
+Layout (data/fetch_archive/ by default):
+    index.jsonl          one JSON line per response: url, final_url, status, headers, file
+    bodies/<sha1>.gz     gzip-compressed response body
+
+Start any scraper with
+    --record-fetches                 fetch live and write every response to the archive
+    --replay-fetches                 serve all responses from the archive (no network)
+    --fetch-archive=<dir>            archive directory (default data/fetch_archive)
+    --replay-latency=<seconds>       simulated latency per replayed response (default 0)
+
+Usage:
+    python city_league_analysis_scraper.py --record-fetches
+    python city_league_analysis_scraper.py --replay-fetches --replay-latency=0.2
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from http_cache import get_data_dir
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+RECORD_FLAG = '--record-fetches'
+REPLAY_FLAG = '--replay-fetches'
+ARCHIVE_OPTION = '--fetch-archive='
+LATENCY_OPTION = '--replay-latency='
+
+ARCHIVE_DIR_NAME = 'fetch_archive'
+INDEX_FILE_NAME = 'index.jsonl'
+BODIES_DIR_NAME = 'bodies'
+
+# Response headers kept in the archive
+ARCHIVED_HEADERS = ('content-type', 'etag', 'last-modified', 'retry-after')
+
+
+def _option_value(prefix: str, argv=None) -> Optional[str]:
+    for arg in (argv if argv is not None else sys.argv):
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return None
+
+
+def mode_from_argv(argv=None) -> str:
+    """'record', 'replay' or 'live' from the command line flags."""
+    argv = argv if argv is not None else sys.argv
+    if REPLAY_FLAG in argv:
+        return 'replay'
+    if RECORD_FLAG in argv:
+        return 'record'
+    return 'live'
+
+
+def archive_dir_from_argv(argv=None) -> str:
+    return _option_value(ARCHIVE_OPTION, argv) or os.path.join(get_data_dir(), ARCHIVE_DIR_NAME)
+
+
+def latency_from_argv(argv=None) -> float:
+    value = _option_value(LATENCY_OPTION, argv)
+    try:
+        return max(0.0, float(value)) if value else 0.0
+    except ValueError:
+        print(f"[FetchArchive] ⚠️ Invalid {LATENCY_OPTION}{value} - using 0")
+        return 0.0
+
+
+# ============================================================================
+# ARCHIVE
+# ============================================================================
+
+class ArchivedResponse(NamedTuple):
+    """One recorded response."""
+    url: str  # Request URL
+    final_url: str  # URL after redirects
+    status: int
+    headers: Dict[str, str]  # ARCHIVED_HEADERS only, lower-case names
+    file: str  # Body file, relative to the archive directory
+
+
+class FetchArchive:
+    """Thread-safe fixture archive (index.jsonl + gzip bodies)."""
+
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(get_data_dir(), ARCHIVE_DIR_NAME)
+        self.index_file = os.path.join(self.path, INDEX_FILE_NAME)
+        self._entries: Dict[str, ArchivedResponse] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+        # Statistics for this run
+        self.recorded = 0
+        self.replayed = 0
+        self.missing = 0
+
+    def _load(self):
+        """Read the index once (later lines win, so re-recorded URLs are updated)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                    entry = ArchivedResponse(data['url'], data['final_url'], data['status'],
+                                             data.get('headers', {}), data['file'])
+                except (ValueError, KeyError):
+                    continue  # Truncated last line after an aborted recording
+                self._entries[entry.url] = entry
+        print(f"[FetchArchive] ✓ Loaded {len(self._entries)} recorded responses from {self.path}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    def entries(self) -> List[ArchivedResponse]:
+        """All recorded responses (e.g. to benchmark parsers on real pages)."""
+        with self._lock:
+            self._load()
+            return list(self._entries.values())
+
+    def lookup(self, url: str) -> Optional[ArchivedResponse]:
+        with self._lock:
+            self._load()
+            return self._entries.get(url)
+
+    def note_replay(self, found: bool):
+        with self._lock:
+            if found:
+                self.replayed += 1
+            else:
+                self.missing += 1
+
+    def read_body(self, entry: ArchivedResponse) -> bytes:
+        with open(os.path.join(self.path, entry.file), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def record(self, url: str, final_url: str, status: int, headers: Dict[str, str], body: bytes = b''):
+        """Write one response (body file first, then the index line)."""
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest() + '.gz'
+        file = f"{BODIES_DIR_NAME}/{name}"
+        kept = {key: headers[key] for key in ARCHIVED_HEADERS if key in headers}
+        entry = ArchivedResponse(url, final_url, status, kept, file)
+        with self._lock:
+            self._load()
+            os.makedirs(os.path.join(self.path, BODIES_DIR_NAME), exist_ok=True)
+            with open(os.path.join(self.path, file), 'wb') as f:
+                f.write(gzip.compress(body, compresslevel=6, mtime=0))
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry._asdict(), ensure_ascii=False) + '\n')
+            self._entries[url] = entry
+            self.recorded += 1
+
+    def summary(self) -> str:
+        """One-line statistics for the end of a scraper run."""
+        return (f"[FetchArchive] {self.recorded} recorded, {self.replayed} replayed, "
+                f"{self.missing} missing ({self.path})")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Fetch Telemetry - Where a Scraper Run Spends its Time
+=====================================================
+Counters of http_client.HTTPClient per host and per URL pattern:
+requests, bytes, status codes, errors, retries, latency (p50 / p95 / p99 + histogram),
+cache hits, 304s, coalesced duplicates and the seconds spent waiting
+(rate control, downloads of other scrapers, simulated replay latency).
+
+At the end of a run each scraper writes data/fetch_telemetry_<scraper>.json
+(http_client.save_fetch_telemetry), e.g. to tune max_parallel_requests /
+requests_per_second or to spot slow endpoints.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from http_cache import get_data_dir
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+TELEMETRY_FILE_PATTERN = 'fetch_telemetry_{name}.json'
+
+# Upper bounds (seconds) of the latency histogram buckets, the last bucket is open
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+# Wait reasons
+WAIT_RATE_LIMIT = 'rate_limit'  # RateController slot / backoff
+WAIT_OTHER_DOWNLOAD = 'other_download'  # Same URL downloaded by another thread / scraper
+WAIT_REPLAY_LATENCY = 'replay_latency'  # Simulated latency in replay mode
+
+# Path segments that name a player (decklist URLs) rather than a page type
+_NAME_AFTER = ('player',)
+
+
+def telemetry_path(name: str) -> str:
+    return os.path.join(get_data_dir(), TELEMETRY_FILE_PATTERN.format(name=name))
+
+
+def url_pattern(url: str) -> str:
+    """Group URLs by page type: host + path with IDs, slugs and player names replaced.
+
+    https://limitlesstcg.com/tournaments/jp/3021         -> limitlesstcg.com/tournaments/jp/{id}
+    https://limitlesstcg.com/cards/SVI/86?x=1           -> limitlesstcg.com/cards/SVI/{id}?
+    .../tournament/abc123/player/someone/decklist        -> .../tournament/{id}/player/{name}/decklist
+    """
+    parts = urlsplit(url)
+    segments = []
+    previous = ''
+    for segment in parts.path.split('/'):
+        if previous in _NAME_AFTER and segment:
+            segments.append('{name}')
+        elif re.search(r'\d', segment) and not re.fullmatch(r'[A-Z]{2,4}\d?[a-z]?', segment):
+            segments.append('{id}')  # Set codes like SV3a / PAR stay, IDs and slugs don't
+        else:
+            segments.append(segment)
+        previous = segment.lower()
+    return (parts.hostname or '') + '/'.join(segments) + ('?' if parts.query else '')
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# ============================================================================
+# COUNTERS
+# ============================================================================
+
+class FetchStats:
+    """Counters of one host or URL pattern."""
+
+    def __init__(self):
+        self.requests = 0  # Network requests (incl. redirects, 304s and failures)
+        self.errors = 0  # Connection failures / timeouts
+        self.retries = 0
+        self.bytes = 0  # Response bytes as received (compressed)
+        self.statuses: Dict[str, int] = {}
+        self.cache_hits = 0  # Fresh cache entries, no request
+        self.not_modified = 0  # Revalidated with a 304
+        self.coalesced = 0  # Duplicates of a download earlier in this pipeline run
+        self.latencies: List[float] = []  # Seconds from request to complete body
+        self.waited: Dict[str, float] = {}
+
+    def to_dict(self) -> Dict:
+        latencies = sorted(self.latencies)
+        histogram = {}
+        lower = 0
+        for bound in LATENCY_BUCKETS:
+            upper = lower
+            while upper < len(latencies) and latencies[upper] <= bound:
+                upper += 1
+            histogram[f"<={bound:g}s"] = upper - lower
+            lower = upper
+        histogram[f">{LATENCY_BUCKETS[-1]:g}s"] = len(latencies) - lower
+
+        total = sum(latencies)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes': self.bytes,
+            'status_codes': dict(sorted(self.statuses.items())),
+            'cache_hits': self.cache_hits,
+            'not_modified': self.not_modified,
+            'coalesced': self.coalesced,
+            'latency': {
+                'count': len(latencies),
+                'total': round(total, 3),
+                'mean': round(total / len(latencies), 3) if latencies else 0.0,
+                'p50': round(percentile(latencies, 0.50), 3),
+                'p95': round(percentile(latencies, 0.95), 3),
+                'p99': round(percentile(latencies, 0.99), 3),
+                'max': round(latencies[-1], 3) if latencies else 0.0,
+                'histogram': histogram
+            },
+            'waited': {reason: round(seconds, 3) for reason, seconds in sorted(self.waited.items())}
+        }
+
+
+class FetchTelemetry:
+    """Thread-safe fetch counters of one scraper run (per host, per URL pattern, total)."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.total = FetchStats()
+        self.hosts: Dict[str, FetchStats] = {}
+        self.patterns: Dict[str, FetchStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, url: str) -> List[FetchStats]:
+        host = (urlsplit(url).hostname or '').lower()
+        pattern = url_pattern(url)
+        if host not in self.hosts:
+            self.hosts[host] = FetchStats()
+        if pattern not in self.patterns:
+            self.patterns[pattern] = FetchStats()
+        return [self.total, self.hosts[host], self.patterns[pattern]]
+
+    def request(self, url: str, status: Optional[int], size: int, latency: float):
+        """One network request (status None = connection failure)."""
+        with self._lock:
+            for stats in self._stats(url):
+                stats.requests += 1
+                stats.bytes += size
+                stats.latencies.append(latency)
+                if status is None:
+                    stats.errors += 1
+                else:
+                    stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+
+    def retry(self, url: str):
+        with self._lock:
+            for stats in self._stats(url):
+                stats.retries += 1
+
+    def cache_hit(self, url: str, coalesced: bool = False):
+        with self._lock:
+            for stats in self._stats(url):
+                if coalesced:
+                    stats.coalesced += 1
+                else:
+                    stats.cache_hits += 1
+
+    def not_modified(self, url: str):
+        with self._lock:
+            for stats in self._stats(url):
+                stats.not_modified += 1
+
+    def waited(self, url: str, seconds: float, reason: str):
+        if seconds <= 0:
+            return
+        with self._lock:
+            for stats in self._stats(url):
+                stats.waited[reason] = stats.waited.get(reason, 0.0) + seconds
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            finished = time.time()
+            return {
+                'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'finished': datetime.fromtimestamp(finished).isoformat(timespec='seconds'),
+                'duration_seconds': round(finished - self.started, 1),
+                'total': self.total.to_dict(),
+                'hosts': {host: stats.to_dict() for host, stats in sorted(self.hosts.items())},
+                'patterns': {pattern: stats.to_dict() for pattern, stats in sorted(self.patterns.items())}
+            }
+
+    def save(self, path: str, **run_info) -> bool:
+        """Write the JSON summary (run_info: scraper, run_id, mode, ... at the top)."""
+        data = dict(run_info)
+        data.update(self.to_dict())
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            return True
+        except OSError as e:
+            print(f"[Telemetry] ⚠️ Could not write {path}: {e}")
+            return False
+
+    def summary(self) -> str:
+        """One line for the end of a run: totals and the slowest URL pattern (by p95)."""
+        with self._lock:
+            total = self.total.to_dict()
+            slowest = max(self.patterns.items(), default=None,
+                          key=lambda item: percentile(sorted(item[1].latencies), 0.95))
+        if not total['requests'] and not total['cache_hits'] and not total['coalesced']:
+            return ""
+        line = (f"[Telemetry] {total['requests']} requests, {total['bytes'] / 1024 / 1024:.1f} MB, "
+                f"latency p50 {total['latency']['p50']:.2f}s / p95 {total['latency']['p95']:.2f}s, "
+                f"{total['retries']} retries, {total['errors']} errors")
+        if slowest is not None and slowest[1].latencies:
+            line += f"; slowest: {slowest[0]} (p95 {percentile(sorted(slowest[1].latencies), 0.95):.2f}s)"
+        return line
@@ -6,11 +6,20 @@ Re-scrapes detail pages for cards that are missing image_url or rarity.
 """
 
 import csv
-import time
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+
+from browser_pool import BrowserPool, short_error
+from card_details import PROMO_SETS, read_card_page
+
+# Browser pool settings (--browser-workers=N overrides browser_workers)
+SETTINGS = {
+    "headless": True,
+    "browser_workers": 2,
+    "browser_page_budget": 1000,
+    "lean_browser": True,  # No images / fonts / media / trackers, eager page load
+    "detail_page_wait_seconds": 2.0,
+    "detail_request_delay_seconds": 0.5
+}
 
 def load_cards_from_csv(csv_path):
     """Load all cards from CSV."""
@@ -46,93 +55,47 @@ def scrape_card_details_fix(cards):
     """Scrape missing details for incomplete cards."""
     print(f"\nScraping details for {len(cards)} incomplete cards...")
     
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--dns-prefetch-disable")
-    
-    driver = webdriver.Chrome(options=chrome_options)
+    # Every error is retried (3 attempts per card, as before the browser pool)
+    pool = BrowserPool.from_settings(SETTINGS, page_load_timeout=15, browser_arguments=["--dns-prefetch-disable"],
+                                     retry_all=True, log_prefix="   ")
+    print(f"Browser pool: {pool.describe()}")
     
     fixed_count = 0
     failed_count = 0
-    max_retries = 3
     
-    try:
-        for idx, card in enumerate(cards):
-            retry_count = 0
-            success = False
+    # Limitless URL pattern: /cards/{SET}/{NUMBER}
+    urls = [f"https://limitlesstcg.com/cards/{card['set']}/{card['number']}" for card in cards]
+    for outcome in pool.load_all(urls, read_card_page):
+        card = cards[outcome.index]
+        print(f"[{outcome.index+1}/{len(cards)}] Scraping {card['name']} ({card['set']} {card['number']})...", end=" ")
+        
+        if not outcome.ok:
+            print(f"FAILED: {short_error(outcome.error)[:50]}")
+            failed_count += 1
+        else:
+            details = outcome.result
+            if details.image_url:
+                card['image_url'] = details.image_url
+            
+            # Rarity (only for non-Basic Energy)
+            if card.get('type') != 'Basic Energy':
+                if details.rarity:
+                    card['rarity'] = details.rarity
+                
+                # For Promo sets: If rarity is empty, set it to "Promo"
+                if card['set'] in PROMO_SETS and not card.get('rarity'):
+                    card['rarity'] = 'Promo'
             
-            while retry_count < max_retries and not success:
-                try:
-                    # Build URL from set and number
-                    set_code = card['set']
-                    set_number = card['number']
-                    
-                    # Limitless URL pattern: /cards/{SET}/{NUMBER}
-                    url = f"https://limitlesstcg.com/cards/{set_code}/{set_number}"
-                    
-                    print(f"[{idx+1}/{len(cards)}] Scraping {card['name']} ({set_code} {set_number})...", end=" ")
-                    
-                    driver.set_page_load_timeout(15)
-                    driver.get(url)
-                    time.sleep(2.0)
-                    
-                    # Extract image URL
-                    try:
-                        img_elem = driver.find_element(By.CSS_SELECTOR, "img.card.shadow.resp-w")
-                        image_url = img_elem.get_attribute('src')
-                        if image_url:
-                            card['image_url'] = image_url
-                    except:
-                        pass
-                    
-                    # Extract rarity (only for non-Basic Energy)
-                    if card.get('type') != 'Basic Energy':
-                        try:
-                            rarity_spans = driver.find_elements(By.CSS_SELECTOR, ".card-prints-current .prints-current-details span")
-                            if len(rarity_spans) >= 2:
-                                rarity_info = rarity_spans[1].get_attribute('textContent').strip()
-                                if '·' in rarity_info:
-                                    rarity = rarity_info.split('·')[1].strip()
-                                    card['rarity'] = rarity
-                        except:
-                            pass
-                        
-                        # For Promo sets: If rarity is empty, set it to "Promo"
-                        PROMO_SETS = ['MEP', 'SVP', 'SP', 'SMP', 'XYP', 'BWP', 'HSP', 'DPP', 'NP', 'WP', 
-                                      'POP', 'SWSH', 'SWSHP', 'PR-SW', 'PR-SM', 'PR-XY', 'PR-BLW', 'PR-HS', 'PR-DP']
-                        if card['set'] in PROMO_SETS and not card.get('rarity'):
-                            card['rarity'] = 'Promo'
-                    
-                    # Check if we got the data
-                    if card.get('image_url'):
-                        fixed_count += 1
-                        print(f"OK")
-                        success = True
-                    else:
-                        print(f"No URL found")
-                        failed_count += 1
-                        success = True  # Don't retry if page loaded but no image
-                    
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        print(f"ERROR (retry {retry_count}/{max_retries}): {str(e)[:50]}")
-                        time.sleep(2.0)
-                    else:
-                        print(f"FAILED after {max_retries} retries: {str(e)[:50]}")
-                        failed_count += 1
-                        
-            if (idx + 1) % 100 == 0:
-                print(f"\n--- Progress: {idx+1}/{len(cards)} | Fixed: {fixed_count} | Failed: {failed_count} ---\n")
-    
-    finally:
-        driver.quit()
+            # Check if we got the data
+            if card.get('image_url'):
+                fixed_count += 1
+                print(f"OK")
+            else:
+                print(f"No URL found")
+                failed_count += 1
+        
+        if (outcome.index + 1) % 100 == 0:
+            print(f"\n--- Progress: {outcome.index+1}/{len(cards)} | Fixed: {fixed_count} | Failed: {failed_count} ---\n")
     
     print(f"\nFixed {fixed_count}/{len(cards)} cards (Failed: {failed_count})")
     return cards
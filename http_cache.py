@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache - Persistent Conditional-GET Cache for all Scrapers
+==============================================================
+On-disk response cache used by http_client.HTTPClient.
+
+- One SQLite file (data/http_cache.sqlite), keyed by request URL
+- Bodies stored zlib-compressed, with ETag / Last-Modified
+- Expired entries are revalidated with If-None-Match / If-Modified-Since
+  (a 304 answer costs no body download)
+- Per-URL-pattern TTLs (CACHE_RULES); pages of tournaments that took place more
+  than `immutable_after_days` ago never expire (finished results don't change)
+- Pipeline runs: scrapers started with the same HAUSI_RUN_ID (RUN_ALL_SCRAPERS.bat)
+  share every page downloaded in that run, and a URL being downloaded by one
+  scraper is claimed (inflight table) so the others wait for it instead of
+  downloading it again (single-flight)
+
+Usage:
+    from http_cache import get_cache
+
+    cache = get_cache()
+    entry = cache.lookup(url)
+    if entry and cache.is_fresh(entry):
+        html = entry.text
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Pattern, Union
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+CACHE_FILE_NAME = 'http_cache.sqlite'
+RUN_ID_ENV = 'HAUSI_RUN_ID'  # Set once per pipeline run, inherited by all scrapers
+CLAIM_TIMEOUT = 90.0  # Seconds after which an in-flight claim counts as abandoned
+CLAIM_POLL_INTERVAL = 0.2
+DEFAULT_IMMUTABLE_AFTER_DAYS = 14  # Tournaments older than this are final
+COMPRESSION_LEVEL = 6
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Response headers kept with the body
+STORED_HEADERS = ('content-type', 'etag', 'last-modified')
+
+ContentDate = Union[date, datetime, float, None]
+
+
+class CacheRule(NamedTuple):
+    """TTL policy for URLs matching `pattern` (first matching rule wins)."""
+    pattern: Pattern
+    ttl: float  # Seconds an entry is used without asking the server (0 = always revalidate)
+    immutable_when_finished: bool  # Never expires once its content date is old enough
+
+
+def _rule(pattern: str, ttl: float, immutable_when_finished: bool = False) -> CacheRule:
+    return CacheRule(re.compile(pattern, re.IGNORECASE), ttl, immutable_when_finished)
+
+
+CACHE_RULES: List[CacheRule] = [
+    # Decklists (City League, Limitless tournaments, labs, Limitless Online)
+    _rule(r'^https?://limitlesstcg\.com/decks/list/', 1 * DAY, True),
+    _rule(r'^https?://labs\.limitlesstcg\.com/[^/]+/player/[^/]+/decklist', 1 * DAY, True),
+    _rule(r'^https?://play\.limitlesstcg\.com/tournament/[^/]+/player/[^/]+/decklist', 1 * DAY, True),
+    # Tournament pages (standings, cards / deck pages)
+    _rule(r'^https?://limitlesstcg\.com/tournaments/(jp/)?\d+', 1 * HOUR, True),
+    _rule(r'^https?://labs\.limitlesstcg\.com/[^/?]+/standings', 1 * HOUR, True),
+    # Card pages and card searches
+    _rule(r'^https?://limitlesstcg\.com/cards/[^?]+$', 7 * DAY),
+    _rule(r'^https?://limitlesstcg\.com/cards\?', 1 * DAY),
+    # Listings (tournament lists, meta decks, matchups) - always revalidated
+    _rule(r'.*', 0),
+]
+
+
+def get_data_dir() -> str:
+    """Get the correct data directory path (handles EXE in dist/ folder)."""
+    if getattr(sys, "frozen", False):
+        app_dir = os.path.dirname(sys.executable)
+        if os.path.basename(app_dir).lower() == "dist":
+            return os.path.join(app_dir, "..", "data")
+    return "data"
+
+
+def parse_page_date(date_str: str) -> Optional[datetime]:
+    """Parse tournament dates as shown on Limitless pages ('12th March 2026', '24 Jan 26', '24.01.2026')."""
+    cleaned = re.sub(r'(\d)(st|nd|rd|th)\b', r'\1', (date_str or '').strip())
+    for fmt in ("%d %B %Y", "%d %b %Y", "%d %b %y", "%d.%m.%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(cleaned, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def current_run_id() -> str:
+    """Pipeline run id from HAUSI_RUN_ID, else one run per process."""
+    return os.environ.get(RUN_ID_ENV) or f"pid-{os.getpid()}-{int(time.time())}"
+
+
+def to_timestamp(value: ContentDate) -> Optional[float]:
+    """date / datetime / unix timestamp -> unix timestamp."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    return float(value)
+
+
+# ============================================================================
+# CACHE ENTRY
+# ============================================================================
+
+class CacheEntry(NamedTuple):
+    """One cached response."""
+    url: str  # Request URL (cache key)
+    final_url: str  # URL after redirects
+    status: int
+    headers: Dict[str, str]  # STORED_HEADERS only, lower-case names
+    body: bytes  # Decompressed
+    fetched_at: float  # Last download or successful revalidation
+    content_date: Optional[float]  # Date of the tournament the page belongs to
+    run_id: Optional[str] = None  # Pipeline run that downloaded / revalidated it
+    fetched_by: Optional[int] = None  # Process id of that scraper
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='ignore')
+
+    @property
+    def etag(self) -> str:
+        return self.headers.get('etag', '')
+
+    @property
+    def last_modified(self) -> str:
+        return self.headers.get('last-modified', '')
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+class ResponseCache:
+    """Thread-safe SQLite response cache."""
+
+    def __init__(self, path: str = None, rules: List[CacheRule] = None,
+                 immutable_after_days: float = DEFAULT_IMMUTABLE_AFTER_DAYS):
+        self.path = path or os.path.join(get_data_dir(), CACHE_FILE_NAME)
+        self.rules = rules if rules is not None else CACHE_RULES
+        self.immutable_after_days = immutable_after_days
+        self.run_id = current_run_id()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.disabled = False  # Set after an unrecoverable SQLite error
+
+        # Statistics for this run
+        self.hits = 0  # Served from cache without a request
+        self.revalidated = 0  # 304 Not Modified
+        self.stored = 0  # Downloaded and written
+        self.coalesced_local = 0  # Duplicate requests of this scraper avoided
+        self.coalesced_shared = 0  # Pages another scraper of this run downloaded
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open (and create) the database on first use."""
+        if self._conn is not None or self.disabled:
+            return self._conn
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    final_url TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    content_date REAL,
+                    run_id TEXT,
+                    fetched_by INTEGER
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+            for column, column_type in (('run_id', 'TEXT'), ('fetched_by', 'INTEGER')):
+                if column not in columns:  # Cache file from before pipeline runs
+                    conn.execute(f"ALTER TABLE responses ADD COLUMN {column} {column_type}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS inflight (
+                    url TEXT PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    pid INTEGER NOT NULL,
+                    started_at REAL NOT NULL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error as e:
+            print(f"[HTTPCache] ⚠️ Cache disabled, could not open {self.path}: {e}")
+            self.disabled = True
+        return self._conn
+
+    def rule_for(self, url: str) -> CacheRule:
+        for rule in self.rules:
+            if rule.pattern.search(url):
+                return rule
+        return CacheRule(re.compile('.*'), 0, False)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Cached entry for `url` (fresh or not), None if unknown."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT final_url, status, headers, body, fetched_at, content_date, run_id, fetched_by "
+                    "FROM responses WHERE url = ?", (url,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[HTTPCache] ⚠️ Lookup failed for {url}: {e}")
+                return None
+        if row is None:
+            return None
+        final_url, status, headers, body, fetched_at, content_date, run_id, fetched_by = row
+        try:
+            body = zlib.decompress(body)
+        except zlib.error:
+            return None  # Corrupt entry - refetch and overwrite
+        return CacheEntry(url, final_url, status, json.loads(headers), body, fetched_at, content_date,
+                          run_id, fetched_by)
+
+    def is_fresh(self, entry: CacheEntry, content_date: ContentDate = None, now: float = None) -> bool:
+        """True if the entry may be used without contacting the server."""
+        if entry.run_id == self.run_id:
+            return True  # Already downloaded in this pipeline run
+        now = now or time.time()
+        rule = self.rule_for(entry.url)
+        content_ts = to_timestamp(content_date) or entry.content_date
+        if rule.immutable_when_finished and content_ts is not None:
+            if now - content_ts >= self.immutable_after_days * DAY:
+                return True
+        return now - entry.fetched_at < rule.ttl
+
+    def store(self, url: str, final_url: str, status: int, headers: Dict[str, str],
+              body: bytes, content_date: ContentDate = None):
+        """Write a downloaded 200 response."""
+        if 'no-store' in headers.get('cache-control', '').lower():
+            return
+        kept = {name: headers[name] for name in STORED_HEADERS if name in headers}
+        compressed = zlib.compress(body, COMPRESSION_LEVEL)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(url, final_url, status, headers, body, fetched_at, content_date, run_id, fetched_by) "
+                    "VALUES (?, ?, ?, ?, ?, ?, "
+                    "COALESCE(?, (SELECT content_date FROM responses WHERE url = ?)), ?, ?)",
+                    (url, final_url, status, json.dumps(kept), compressed, time.time(),
+                     to_timestamp(content_date), url, self.run_id, os.getpid())
+                )
+                conn.commit()
+                self.stored += 1
+            except sqlite3.Error as e:
+                print(f"[HTTPCache] ⚠️ Could not store {url}: {e}")
+
+    def touch(self, url: str, headers: Dict[str, str] = None, content_date: ContentDate = None):
+        """Mark an entry as just revalidated (after a 304), refreshing changed validators."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                if headers and any(name in headers for name in ('etag', 'last-modified')):
+                    row = conn.execute("SELECT headers FROM responses WHERE url = ?", (url,)).fetchone()
+                    if row:
+                        kept = json.loads(row[0])
+                        kept.update({name: headers[name] for name in ('etag', 'last-modified') if name in headers})
+                        conn.execute("UPDATE responses SET headers = ? WHERE url = ?", (json.dumps(kept), url))
+                conn.execute(
+                    "UPDATE responses SET fetched_at = ?, content_date = COALESCE(?, content_date), "
+                    "run_id = ?, fetched_by = ? WHERE url = ?",
+                    (time.time(), to_timestamp(content_date), self.run_id, os.getpid(), url)
+                )
+                conn.commit()
+                self.revalidated += 1
+            except sqlite3.Error as e:
+                print(f"[HTTPCache] ⚠️ Could not update {url}: {e}")
+
+    def record_hit(self, entry: CacheEntry):
+        """Count a response served from cache (same-run entries are duplicates avoided)."""
+        with self._lock:
+            if entry.run_id != self.run_id:
+                self.hits += 1
+            elif entry.fetched_by == os.getpid():
+                self.coalesced_local += 1
+            else:
+                self.coalesced_shared += 1
+
+    # ------------------------------------------------------------------
+    # Single-flight across the scrapers of a pipeline run
+    # ------------------------------------------------------------------
+
+    def claim(self, url: str) -> bool:
+        """Claim the download of `url`. False if another scraper is downloading it right now."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return True
+            try:
+                conn.execute("DELETE FROM inflight WHERE url = ? AND started_at < ?", (url, now - CLAIM_TIMEOUT))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO inflight (url, run_id, pid, started_at) VALUES (?, ?, ?, ?)",
+                    (url, self.run_id, os.getpid(), now)
+                )
+                conn.commit()
+                return cursor.rowcount == 1
+            except sqlite3.Error as e:
+                print(f"[HTTPCache] ⚠️ Could not claim {url}: {e}")
+                return True
+
+    def release(self, url: str):
+        """Drop this process's claim on `url` (download finished or failed)."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM inflight WHERE url = ? AND pid = ?", (url, os.getpid()))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[HTTPCache] ⚠️ Could not release {url}: {e}")
+
+    def wait_for_claim(self, url: str, timeout: float = CLAIM_TIMEOUT):
+        """Wait until another scraper's claim on `url` is released (or abandoned)."""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            with self._lock:
+                conn = self._connect()
+                if conn is None:
+                    return
+                try:
+                    row = conn.execute("SELECT 1 FROM inflight WHERE url = ?", (url,)).fetchone()
+                except sqlite3.Error:
+                    return
+            if row is None:
+                return
+            time.sleep(CLAIM_POLL_INTERVAL)
+
+    def set_content_date(self, url: str, content_date: ContentDate):
+        """Remember the tournament date of an already cached page."""
+        content_ts = to_timestamp(content_date)
+        if content_ts is None:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("UPDATE responses SET content_date = ? WHERE url = ?", (content_ts, url))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[HTTPCache] ⚠️ Could not update {url}: {e}")
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for revalidating an entry."""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def clear(self):
+        """Delete all entries."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def summary(self) -> str:
+        """One-line statistics for the end of a scraper run."""
+        return (f"[HTTPCache] {self.hits} cache hits, {self.revalidated} not modified (304), "
+                f"{self.stored} downloaded; duplicate requests avoided: {self.coalesced_local} in this scraper, "
+                f"{self.coalesced_shared} shared from other scrapers (run {self.run_id})")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """Process-wide ResponseCache (data/http_cache.sqlite)."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -0,0 +1,1094 @@
+#!/usr/bin/env python3
+"""
+HTTP Client - Shared Keep-Alive Fetching for all Scrapers
+==========================================================
+One HTTP client for card_scraper_shared, limitless_online_scraper,
+tournament_scraper_JH, city_league_archetype_scraper and the analysis scrapers.
+
+- Persistent per-host connections (http.client pools, keep-alive)
+  -> one TLS handshake per host instead of one per page
+- Accept-Encoding gzip/deflate with transparent decoding
+- Shared headers and timeouts
+- Typed errors (FetchStatusError, FetchConnectionError) instead of ""
+- Adaptive per-host rate control (RateController): speeds up while responses are
+  healthy, backs off exponentially with jitter on 429 / 5xx, honors Retry-After
+- FetchEngine: batch fetching with a thread pool, results are yielded as they complete
+- Persistent conditional-GET cache (http_cache.py, data/http_cache.sqlite):
+  fresh pages are served from disk, stale ones revalidated with ETag / Last-Modified
+- Single-flight: a URL is downloaded once per pipeline run, concurrent requests for it
+  (other threads or other scrapers) wait for that download
+- Record / replay (fetch_archive.py): --record-fetches writes every response to
+  data/fetch_archive/, --replay-fetches [--replay-latency=0.2] runs fully offline
+- Streaming (HTTPClient.stream, feed_page): large listing pages are parsed while they
+  download, the caller can stop as soon as it has what it needs
+- Telemetry (fetch_telemetry.py): per host / URL pattern requests, bytes, status codes,
+  retries, latency percentiles, cache hits and waiting time -> save_fetch_telemetry()
+  writes data/fetch_telemetry_<scraper>.json at the end of a run
+- Stand-in (limitless_hosts.py): --limitless-base-url=<url> / HAUSI_LIMITLESS_BASE_URL
+  sends all Limitless requests to a local stand-in server (load tests without network)
+
+Usage:
+    from http_client import get_client, fetch_page, safe_fetch, FetchEngine, FetchError
+
+    html = get_client().get_text('https://limitlesstcg.com/tournaments')  # raises FetchError
+    html = fetch_page(url)                                  # "" on error (old behaviour)
+    html = safe_fetch(url, timeout=20, retries=2, retry_delay=1.0)
+    html = fetch_page(url, content_date=tournament_date)    # finished tournaments never expire
+
+    parser = TournamentListParser()
+    feed_page(url, parser, stop=lambda: len(parser.tournaments) >= 50)  # parse while downloading
+
+    engine = FetchEngine(max_workers=4, requests_per_second=2.0)
+    for outcome in engine.fetch_all(decklist_urls):          # completion order
+        if outcome.ok:
+            parse(outcome.text)
+"""
+
+import codecs
+import gzip
+import http.client
+import os
+import random
+import re
+import socket
+import ssl
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, Iterator, List, Match, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from fetch_archive import FetchArchive, archive_dir_from_argv, latency_from_argv, mode_from_argv
+from fetch_telemetry import (WAIT_OTHER_DOWNLOAD, WAIT_RATE_LIMIT, WAIT_REPLAY_LATENCY, FetchTelemetry,
+                             telemetry_path)
+from http_cache import DEFAULT_IMMUTABLE_AFTER_DAYS, ContentDate, ResponseCache, current_run_id, get_cache
+from limitless_hosts import base_url_from_argv, standin_url
+
+
+# ============================================================================
+# SETTINGS
+# ============================================================================
+
+DEFAULT_TIMEOUT = 30  # seconds (connect + each read)
+MAX_REDIRECTS = 5
+MAX_IDLE_PER_HOST = 8  # idle keep-alive connections kept per host
+STREAM_CHUNK_SIZE = 16 * 1024  # bytes read per chunk by HTTPClient.stream()
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# FetchEngine defaults (scrapers override them from their settings files)
+DEFAULT_MAX_WORKERS = 4  # parallel requests
+
+# Adaptive rate control (per host, scrapers override them from their settings files)
+DEFAULT_REQUESTS_PER_SECOND = 2.0  # Starting rate
+MIN_REQUESTS_PER_SECOND = 0.1
+DEFAULT_MAX_REQUESTS_PER_SECOND = 4.0
+RATE_INCREASE = 0.05  # req/s added per healthy response (additive increase)
+RATE_DECREASE_FACTOR = 0.5  # Rate multiplier on 429 / 5xx (multiplicative decrease)
+DEFAULT_BACKOFF_BASE = 1.0  # Seconds, doubled per consecutive failure
+MAX_BACKOFF = 60.0
+MAX_RETRY_AFTER = 300.0  # Ignore absurd Retry-After values
+THROTTLE_STATUSES = (429, 503)  # Server asks us to slow down
+
+# A reused keep-alive connection may have been closed by the server meanwhile
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                            ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+class FetchError(Exception):
+    """Base class for all fetch errors."""
+
+    def __init__(self, url: str, message: str):
+        super().__init__(message)
+        self.url = url
+
+
+class FetchStatusError(FetchError):
+    """Server answered with an HTTP error status (4xx / 5xx)."""
+
+    def __init__(self, url: str, status: int, reason: str = '', headers: Dict[str, str] = None):
+        super().__init__(url, f"HTTP {status} {reason}".strip())
+        self.status = status
+        self.headers = headers or {}
+
+
+class FetchConnectionError(FetchError):
+    """Network level failure: DNS, connect, TLS, timeout, broken connection, bad encoding."""
+
+
+# ============================================================================
+# RESPONSE
+# ============================================================================
+
+class FetchResult(NamedTuple):
+    """Decoded response of a GET request."""
+    url: str  # Final URL (after redirects)
+    status: int
+    headers: Dict[str, str]  # Lower-case header names
+    body: bytes  # Decompressed body
+    from_cache: bool = False  # Served from the response cache without a download
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='ignore')
+
+
+def decode_body(body: bytes, content_encoding: str) -> bytes:
+    """Undo gzip / deflate Content-Encoding."""
+    encoding = (content_encoding or '').strip().lower()
+    if encoding in ('', 'identity'):
+        return body
+    if encoding in ('gzip', 'x-gzip'):
+        return gzip.decompress(body)
+    if encoding == 'deflate':
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            # Some servers send raw deflate without zlib header
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+
+
+class StreamDecoder:
+    """Incremental decode_body + UTF-8 decoding for a body that arrives in chunks."""
+
+    def __init__(self, content_encoding: str):
+        encoding = (content_encoding or '').strip().lower()
+        if encoding in ('', 'identity'):
+            self._decompressor = None
+        elif encoding in ('gzip', 'x-gzip'):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            self._decompressor = zlib.decompressobj()
+        else:
+            raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+        self._raw_deflate_fallback = encoding == 'deflate'
+        self._text = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._decompressor is None:
+            return data
+        try:
+            body = self._decompressor.decompress(data)
+        except zlib.error:
+            if not self._raw_deflate_fallback:
+                raise
+            # Some servers send raw deflate without zlib header
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            body = self._decompressor.decompress(data)
+        self._raw_deflate_fallback = False
+        return body
+
+    def flush(self) -> bytes:
+        return self._decompressor.flush() if self._decompressor is not None else b''
+
+    def text(self, body: bytes, final: bool = False) -> str:
+        """Decoded text of `body` (a UTF-8 sequence split between chunks is kept for the next call)."""
+        return self._text.decode(body, final)
+
+
+def _text_chunks(body: bytes, chunk_size: int) -> Iterator[str]:
+    """A complete body as text chunks (cached / replayed responses in stream())."""
+    text = body.decode('utf-8', errors='ignore')
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+
+class ConnectionPool:
+    """Idle keep-alive connections for one (scheme, host, port)."""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int],
+                 ssl_context: ssl.SSLContext, max_idle: int = MAX_IDLE_PER_HOST):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.max_idle = max_idle
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def acquire(self, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        """(connection, reused) - reuses an idle connection if there is one."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self.connections_opened += 1
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        if self.scheme == 'https':
+            conn = http.client.HTTPSConnection(self.host, self.port, timeout=timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+        return conn, False
+
+    def release(self, conn: http.client.HTTPConnection):
+        """Return a connection whose response was fully read."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+# ============================================================================
+# RATE CONTROL
+# ============================================================================
+
+def parse_retry_after(value: Optional[str], now: float = None) -> Optional[float]:
+    """Retry-After header (delta-seconds or HTTP-date) -> seconds to wait."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - (now or time.time())
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return None
+    return min(max(0.0, seconds), MAX_RETRY_AFTER)
+
+
+class HostRate:
+    """Rate state and statistics of one host."""
+
+    def __init__(self, rate: float):
+        self.rate = rate  # Current allowed requests per second
+        self.next_slot = 0.0  # Monotonic time of the next allowed request
+        self.blocked_until = 0.0  # Backoff / Retry-After end (monotonic)
+        self.failures = 0  # Consecutive 429 / 5xx / connection failures
+
+        # Statistics for this run
+        self.requests = 0
+        self.throttled = 0  # 429 / 5xx / connection failures
+        self.waited = 0.0  # Seconds spent waiting for a slot
+        self.first_request = 0.0
+        self.last_request = 0.0
+
+
+class RateController:
+    """
+    Thread-safe adaptive per-host rate limit (AIMD).
+
+    - every request waits for its host's next slot (1 / rate apart)
+    - each host starts at initial_rate, or at its own rate from host_rates
+    - healthy response: rate += RATE_INCREASE (up to max_rate)
+    - 429 / 5xx / connection failure: rate *= RATE_DECREASE_FACTOR and the host is paused
+      for max(Retry-After, exponential backoff with jitter)
+    """
+
+    def __init__(self, initial_rate: float = DEFAULT_REQUESTS_PER_SECOND,
+                 max_rate: float = DEFAULT_MAX_REQUESTS_PER_SECOND,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, host_rates: Optional[Dict[str, float]] = None):
+        self.initial_rate = initial_rate
+        self.max_rate = max_rate
+        self.backoff_base = backoff_base
+        self.host_rates: Dict[str, float] = dict(host_rates or {})  # Starting rate per host (overrides initial_rate)
+        self._hosts: Dict[str, HostRate] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host: str) -> HostRate:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostRate(max(self.host_rates.get(host, self.initial_rate), MIN_REQUESTS_PER_SECOND))
+            self._hosts[host] = state
+        return state
+
+    def wait(self, host: str) -> float:
+        """Block until the host's next request slot. Returns the seconds waited."""
+        with self._lock:
+            state = self._host(host)
+            now = time.monotonic()
+            slot = max(now, state.next_slot, state.blocked_until)
+            state.next_slot = slot + 1.0 / state.rate
+            state.requests += 1
+            state.waited += slot - now
+            state.first_request = state.first_request or slot
+            state.last_request = slot
+        if slot > now:
+            time.sleep(slot - now)
+        return slot - now
+
+    def report(self, host: str, status: Optional[int], retry_after: Optional[str] = None):
+        """Feed back a response status (None = connection failure)."""
+        failed = status is None or status in THROTTLE_STATUSES or status >= 500
+        with self._lock:
+            state = self._host(host)
+            if not failed:
+                state.failures = 0
+                state.rate = min(self.max_rate, state.rate + RATE_INCREASE)
+                return
+            state.failures += 1
+            state.throttled += 1
+            state.rate = max(MIN_REQUESTS_PER_SECOND, state.rate * RATE_DECREASE_FACTOR)
+            # Exponential backoff with jitter (half fixed, half random) so workers don't retry in lockstep
+            backoff = min(MAX_BACKOFF, self.backoff_base * (2 ** (state.failures - 1)))
+            pause = backoff / 2 + random.uniform(0, backoff / 2)
+            server_pause = parse_retry_after(retry_after)
+            if server_pause is not None:
+                pause = max(pause, server_pause)
+            now = time.monotonic()
+            state.blocked_until = max(state.blocked_until, now + pause)
+            state.next_slot = max(state.next_slot, state.blocked_until)
+
+    def describe(self) -> str:
+        hosts = ''.join(f", {host} {rate:.2f}" for host, rate in sorted(self.host_rates.items()))
+        return f"{self.initial_rate:.2f} req/s per host at start{hosts}, adaptive up to {self.max_rate:.2f} req/s"
+
+    def summary(self) -> str:
+        """Effective request rate per host for the end of a run."""
+        with self._lock:
+            hosts = sorted(self._hosts.items())
+        lines = []
+        for host, state in hosts:
+            if not state.requests:
+                continue
+            span = state.last_request - state.first_request
+            effective = state.requests / span if span > 0 else float(state.requests)
+            lines.append(f"[RateControl] {host}: {state.requests} requests, {effective:.2f} req/s effective, "
+                         f"limit now {state.rate:.2f} req/s, {state.throttled} throttled/failed, "
+                         f"{state.waited:.1f}s waited")
+        return "\n".join(lines)
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+class HTTPClient:
+    """Thread-safe GET client with per-host keep-alive pools."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, headers: Dict[str, str] = None,
+                 cache: Optional[ResponseCache] = None, archive: Optional[FetchArchive] = None,
+                 mode: str = 'live', replay_latency: float = 0.0, base_url: Optional[str] = None):
+        """
+        Args:
+            cache: Persistent response cache (None = always download)
+            archive: Fixture archive for mode 'record' (write every response) or
+                     'replay' (serve only from the archive, no network)
+            replay_latency: Simulated seconds per replayed response
+            base_url: Stand-in server for the Limitless hosts (limitless_standin.py);
+                      cache, archive and telemetry keep the original URLs
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        self.mode = mode if archive is not None else 'live'
+        self.replay_latency = replay_latency
+        self.base_url = base_url
+        self.rate = RateController()
+        self.telemetry = FetchTelemetry()
+        self.headers = dict(DEFAULT_HEADERS)
+        if headers:
+            self.headers.update(headers)
+        self._ssl_context = ssl.create_default_context()
+        self._pools: Dict[Tuple[str, str, Optional[int]], ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}  # URL -> set when its download is done
+        self._inflight_lock = threading.Lock()
+
+    def _pool(self, scheme: str, host: str, port: Optional[int]) -> ConnectionPool:
+        key = (scheme, host, port)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(scheme, host, port, self._ssl_context)
+                self._pools[key] = pool
+            return pool
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == 'replay'
+
+    def _replay(self, url: str) -> FetchResult:
+        """Serve a response from the fixture archive (mode 'replay')."""
+        entry = self.archive.lookup(url)
+        self.archive.note_replay(entry is not None)
+        if entry is None:
+            self.telemetry.request(url, None, 0, 0.0)
+            raise FetchConnectionError(url, "Not in fetch archive (replay mode)")
+        if self.replay_latency > 0:
+            time.sleep(self.replay_latency)
+            self.telemetry.waited(url, self.replay_latency, WAIT_REPLAY_LATENCY)
+        if entry.status >= 400:
+            self.telemetry.request(url, entry.status, 0, self.replay_latency)
+            raise FetchStatusError(entry.final_url, entry.status, '(replayed)', entry.headers)
+        body = self.archive.read_body(entry)
+        self.telemetry.request(url, entry.status, len(body), self.replay_latency)
+        return FetchResult(entry.final_url, entry.status, entry.headers, body)
+
+    def get_cached(self, url: str, content_date: ContentDate = None) -> Optional[FetchResult]:
+        """Cached response if it is still fresh (no request is made), else None."""
+        if self.replaying:
+            entry = self.archive.lookup(url)
+            return self._replay(url) if entry is not None and entry.status < 400 else None
+        if self.cache is None:
+            return None
+        entry = self.cache.lookup(url)
+        if entry is None or not self.cache.is_fresh(entry, content_date):
+            return None
+        if content_date is not None and entry.content_date is None:
+            self.cache.set_content_date(url, content_date)
+        self.cache.record_hit(entry)
+        self.telemetry.cache_hit(url, coalesced=entry.run_id == self.cache.run_id)
+        return FetchResult(entry.final_url, entry.status, entry.headers, entry.body, True)
+
+    def get(self, url: str, timeout: float = None, headers: Dict[str, str] = None,
+            content_date: ContentDate = None, use_cache: bool = True) -> FetchResult:
+        """
+        GET a URL (following redirects) and return the decoded response.
+
+        With a cache, fresh entries are returned without a request and stale ones are
+        revalidated (If-None-Match / If-Modified-Since). content_date is the date of the
+        tournament the page belongs to - pages of finished tournaments never expire.
+
+        Raises:
+            FetchStatusError: HTTP status >= 400
+            FetchConnectionError: network / timeout / decoding failure
+        """
+        if self.replaying:
+            return self._replay(url)
+        if self.mode != 'record':
+            return self._single_flight(url, timeout, headers, content_date, use_cache)
+
+        try:
+            result = self._single_flight(url, timeout, headers, content_date, use_cache)
+        except FetchStatusError as e:
+            self.archive.record(url, e.url, e.status, e.headers)
+            raise
+        self.archive.record(url, result.url, result.status, result.headers, result.body)
+        return result
+
+    def _single_flight(self, url: str, timeout: Optional[float], headers: Optional[Dict[str, str]],
+                       content_date: ContentDate, use_cache: bool) -> FetchResult:
+        """Download `url` at most once at a time: other threads of this scraper and other
+        scrapers of the pipeline run wait and then read the result from the cache."""
+        cache = self.cache if use_cache else None
+        if cache is None:
+            return self._get(url, timeout, headers, content_date, use_cache)
+
+        with self._inflight_lock:
+            done = self._inflight.get(url)
+            leader = done is None
+            if leader:
+                done = threading.Event()
+                self._inflight[url] = done
+        if not leader:
+            started = time.monotonic()
+            done.wait()
+            self.telemetry.waited(url, time.monotonic() - started, WAIT_OTHER_DOWNLOAD)
+            return self.get_cached(url, content_date) or self._get(url, timeout, headers, content_date, use_cache)
+
+        claimed = cache.claim(url)
+        try:
+            if not claimed:
+                self._wait_for_claim(url)
+                cached = self.get_cached(url, content_date)
+                if cached is not None:
+                    return cached
+            return self._get(url, timeout, headers, content_date, use_cache)
+        finally:
+            if claimed:
+                cache.release(url)
+            with self._inflight_lock:
+                del self._inflight[url]
+            done.set()
+
+    def _get(self, url: str, timeout: Optional[float], headers: Optional[Dict[str, str]],
+             content_date: ContentDate, use_cache: bool) -> FetchResult:
+        """Live GET (cache, conditional requests, redirects)."""
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        timeout = timeout or self.timeout
+
+        cache = self.cache if use_cache else None
+        entry = None
+        if cache is not None:
+            cached = self.get_cached(url, content_date)
+            if cached is not None:
+                return cached
+            entry = cache.lookup(url)
+            if entry is not None:
+                request_headers.update(cache.conditional_headers(entry))
+
+        current_url = url
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, response_headers, body = self._request(current_url, timeout, request_headers)
+
+            location = response_headers.get('location')
+            if status in REDIRECT_STATUSES and location:
+                current_url = urljoin(current_url, location)
+                continue
+
+            if status == 304 and entry is not None:
+                cache.touch(url, response_headers, content_date)
+                self.telemetry.not_modified(url)
+                return FetchResult(entry.final_url, entry.status, entry.headers, entry.body, True)
+
+            if status >= 400:
+                raise FetchStatusError(current_url, status, reason, response_headers)
+
+            try:
+                body = decode_body(body, response_headers.get('content-encoding', ''))
+            except (OSError, EOFError, zlib.error, ValueError) as e:
+                raise FetchConnectionError(current_url, f"Could not decode response: {e}") from e
+            if cache is not None and status == 200:
+                cache.store(url, current_url, status, response_headers, body, content_date)
+            return FetchResult(current_url, status, response_headers, body)
+
+        raise FetchConnectionError(url, f"Too many redirects (> {MAX_REDIRECTS})")
+
+    def get_text(self, url: str, timeout: float = None, headers: Dict[str, str] = None,
+                 content_date: ContentDate = None) -> str:
+        """GET a URL and return the body as text (UTF-8, invalid bytes ignored)."""
+        return self.get(url, timeout=timeout, headers=headers, content_date=content_date).text
+
+    def stream(self, url: str, chunk_size: int = STREAM_CHUNK_SIZE, timeout: float = None,
+               headers: Dict[str, str] = None, content_date: ContentDate = None) -> Iterator[str]:
+        """
+        GET a URL and yield the body as text chunks while it downloads.
+
+        The caller may stop iterating at any time (break / close()): the rest of the body
+        is not downloaded and the connection is closed instead of going back to the pool.
+        Complete downloads are cached like get(); cached, revalidated (304) and replayed
+        responses are yielded in chunks of the stored body. In record mode an early stop
+        still reads the rest of the body so the archive entry is complete.
+
+        Raises:
+            FetchStatusError: HTTP status >= 400 (before the first chunk)
+            FetchConnectionError: network / timeout / decoding failure (also mid-body)
+        """
+        if self.replaying:
+            yield from _text_chunks(self._replay(url).body, chunk_size)
+            return
+
+        cache = self.cache
+        claimed = cache is not None and cache.claim(url)
+        if cache is not None and not claimed:
+            self._wait_for_claim(url)
+        try:
+            cached = self.get_cached(url, content_date)
+            if cached is None:
+                yield from self._stream(url, chunk_size, timeout, headers, content_date)
+                return
+            self._record(url, cached.url, cached.status, cached.headers, cached.body)
+            yield from _text_chunks(cached.body, chunk_size)
+        finally:
+            if claimed:
+                cache.release(url)
+
+    def _stream(self, url: str, chunk_size: int, timeout: Optional[float], headers: Optional[Dict[str, str]],
+                content_date: ContentDate) -> Iterator[str]:
+        """Live streaming GET (conditional request, redirects)."""
+        request_headers = dict(self.headers)
+        if headers:
+            request_headers.update(headers)
+        timeout = timeout or self.timeout
+
+        cache = self.cache
+        entry = cache.lookup(url) if cache is not None else None
+        if entry is not None:
+            request_headers.update(cache.conditional_headers(entry))
+
+        current_url = url
+        for _ in range(MAX_REDIRECTS + 1):
+            pool, conn, response, response_headers, sent_at = self._open(current_url, timeout, request_headers)
+            status = response.status
+
+            location = response_headers.get('location')
+            if status in REDIRECT_STATUSES and location:
+                self._read_body(pool, conn, response, current_url, timeout, sent_at)
+                current_url = urljoin(current_url, location)
+                continue
+
+            if status == 304 and entry is not None:
+                self._read_body(pool, conn, response, current_url, timeout, sent_at)
+                cache.touch(url, response_headers, content_date)
+                self.telemetry.not_modified(url)
+                self._record(url, entry.final_url, entry.status, entry.headers, entry.body)
+                yield from _text_chunks(entry.body, chunk_size)
+                return
+
+            if status >= 400:
+                self._read_body(pool, conn, response, current_url, timeout, sent_at)
+                self._record(url, current_url, status, response_headers)
+                raise FetchStatusError(current_url, status, response.reason, response_headers)
+
+            yield from self._stream_body(url, current_url, pool, conn, response, response_headers,
+                                         chunk_size, timeout, content_date, sent_at)
+            return
+
+        raise FetchConnectionError(url, f"Too many redirects (> {MAX_REDIRECTS})")
+
+    def _stream_body(self, url: str, final_url: str, pool: ConnectionPool, conn: http.client.HTTPConnection,
+                     response: http.client.HTTPResponse, response_headers: Dict[str, str], chunk_size: int,
+                     timeout: float, content_date: ContentDate, sent_at: float) -> Iterator[str]:
+        """Decode and yield a response body chunk by chunk; cache / record it once complete."""
+        keep_body = (self.cache is not None and response.status == 200) or self.mode == 'record'
+        parts: List[bytes] = []
+        received = 0  # Raw bytes, for the telemetry
+        status = response.status
+        try:
+            decoder = StreamDecoder(response_headers.get('content-encoding', ''))
+            while True:
+                data = self._read(pool, conn, response, final_url, timeout, chunk_size)
+                received += len(data)
+                body = decoder.decompress(data) if data else decoder.flush()
+                if keep_body:
+                    parts.append(body)
+                # Compressed chunks expand a lot - hand them on in chunk_size pieces
+                text = decoder.text(body, final=not data)
+                for start in range(0, len(text), chunk_size):
+                    yield text[start:start + chunk_size]
+                if not data:
+                    break
+        except GeneratorExit:
+            # Caller stopped early - drop the rest of the body unless it is being recorded
+            if self.mode != 'record':
+                conn.close()
+                self.telemetry.request(final_url, status, received, time.monotonic() - sent_at)
+                raise
+            try:
+                rest = self._read(pool, conn, response, final_url, timeout)
+                received += len(rest)
+                parts.append(decoder.decompress(rest))
+                parts.append(decoder.flush())
+            except (FetchError, zlib.error):
+                conn.close()
+                self.telemetry.request(final_url, None, received, time.monotonic() - sent_at)
+                return
+        except FetchConnectionError:
+            self.telemetry.request(final_url, None, received, time.monotonic() - sent_at)
+            raise
+        except (zlib.error, ValueError) as e:
+            conn.close()
+            self.telemetry.request(final_url, None, received, time.monotonic() - sent_at)
+            raise FetchConnectionError(final_url, f"Could not decode response: {e}") from e
+        self.telemetry.request(final_url, status, received, time.monotonic() - sent_at)
+
+        body = b''.join(parts)
+        if self.cache is not None and status == 200:
+            self.cache.store(url, final_url, status, response_headers, body, content_date)
+        self._record(url, final_url, status, response_headers, body)
+
+    def _wait_for_claim(self, url: str):
+        """Wait for another scraper's download of `url` (counted as waiting time)."""
+        started = time.monotonic()
+        self.cache.wait_for_claim(url)
+        self.telemetry.waited(url, time.monotonic() - started, WAIT_OTHER_DOWNLOAD)
+
+    def _record(self, url: str, final_url: str, status: int, headers: Dict[str, str], body: bytes = b''):
+        """Write a response to the fixture archive (mode 'record' only)."""
+        if self.mode == 'record':
+            self.archive.record(url, final_url, status, headers, body)
+
+    def _request(self, url: str, timeout: float, headers: Dict[str, str]) -> Tuple[int, str, Dict[str, str], bytes]:
+        """One rate-controlled GET. Returns (status, reason, headers, raw body)."""
+        pool, conn, response, response_headers, sent_at = self._open(url, timeout, headers)
+        body = self._read_body(pool, conn, response, url, timeout, sent_at)
+        return response.status, response.reason, response_headers, body
+
+    def _open(self, url: str, timeout: float, headers: Dict[str, str]
+              ) -> Tuple[ConnectionPool, http.client.HTTPConnection, http.client.HTTPResponse, Dict[str, str], float]:
+        """One rate-controlled GET up to the response head (the body is left unread).
+        Returns (pool, connection, response, lower-case headers, monotonic send time)."""
+        parts = urlsplit(standin_url(url, self.base_url))
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https') or not parts.hostname:
+            raise FetchConnectionError(url, f"Unsupported URL: {url}")
+
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        host = (urlsplit(url).hostname or '').lower()  # Rate control per Limitless host, also on the stand-in
+        pool = self._pool(scheme, parts.hostname, parts.port)
+
+        self.telemetry.waited(url, self.rate.wait(host), WAIT_RATE_LIMIT)
+        sent_at = time.monotonic()
+        try:
+            conn, response = self._send(pool, url, path, timeout, headers)
+        except FetchConnectionError:
+            self.rate.report(host, None)
+            self.telemetry.request(url, None, 0, time.monotonic() - sent_at)
+            raise
+        response_headers = {name.lower(): value for name, value in response.getheaders()}
+        self.rate.report(host, response.status, response_headers.get('retry-after'))
+        return pool, conn, response, response_headers, sent_at
+
+    def _send(self, pool: ConnectionPool, url: str, path: str, timeout: float,
+              headers: Dict[str, str]) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """GET on a pooled connection up to the response head (retries once on a stale keep-alive connection)."""
+        while True:
+            conn, reused = pool.acquire(timeout)
+            try:
+                conn.request('GET', path, headers=headers)
+                return conn, conn.getresponse()
+            except _STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused:
+                    continue  # Server dropped the idle connection - retry on a fresh one
+                raise FetchConnectionError(url, f"{type(e).__name__}: {e}") from e
+            except (socket.timeout, TimeoutError) as e:
+                conn.close()
+                raise FetchConnectionError(url, f"Timeout after {timeout}s") from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise FetchConnectionError(url, f"{type(e).__name__}: {e}") from e
+
+    def _read_body(self, pool: ConnectionPool, conn: http.client.HTTPConnection, response: http.client.HTTPResponse,
+                   url: str, timeout: float, sent_at: float) -> bytes:
+        """Read the complete raw body and count the request in the telemetry."""
+        try:
+            body = self._read(pool, conn, response, url, timeout)
+        except FetchConnectionError:
+            self.telemetry.request(url, None, 0, time.monotonic() - sent_at)
+            raise
+        self.telemetry.request(url, response.status, len(body), time.monotonic() - sent_at)
+        return body
+
+    def _read(self, pool: ConnectionPool, conn: http.client.HTTPConnection, response: http.client.HTTPResponse,
+              url: str, timeout: float, amount: int = 0) -> bytes:
+        """Read up to `amount` bytes of the raw body (0 = all of it; b'' = body complete).
+        The connection goes back to the pool once the body is complete."""
+        try:
+            data = response.read1(amount) if amount else b''
+            if data:
+                return data
+            data = response.read()  # Rest of the body, marks the response as done
+        except (socket.timeout, TimeoutError) as e:
+            conn.close()
+            raise FetchConnectionError(url, f"Timeout after {timeout}s") from e
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            raise FetchConnectionError(url, f"{type(e).__name__}: {e}") from e
+
+        if response.will_close:
+            conn.close()
+        else:
+            pool.release(conn)
+        return data
+
+    def connections_opened(self) -> int:
+        """Total TCP/TLS connections opened so far (for reports)."""
+        with self._pools_lock:
+            return sum(pool.connections_opened for pool in self._pools.values())
+
+    def close(self):
+        """Close all idle connections."""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+
+
+_shared_client: Optional[HTTPClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """Process-wide HTTPClient so all scrapers share the keep-alive connections."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            mode = mode_from_argv()
+            base_url = base_url_from_argv()
+            # Stand-in pages must not end up in (or come from) the real response cache
+            cache = get_cache() if base_url is None else None
+            if mode == 'live':
+                _shared_client = HTTPClient(cache=cache, base_url=base_url)
+            else:
+                archive = FetchArchive(archive_dir_from_argv())
+                # Replay never touches the network or the response cache
+                _shared_client = HTTPClient(cache=cache if mode == 'record' else None,
+                                            archive=archive, mode=mode,
+                                            replay_latency=latency_from_argv(), base_url=base_url)
+                print(f"[HTTPClient] Fetch mode: {mode} ({archive.path})")
+            if base_url is not None:
+                print(f"[HTTPClient] Limitless stand-in: {base_url} (response cache disabled)")
+        return _shared_client
+
+
+def configure_cache(settings: Dict):
+    """Apply the scraper settings http_cache (on/off) and cache_immutable_after_days."""
+    client = get_client()
+    if client.replaying or client.base_url is not None:
+        return
+    if not settings.get('http_cache', True):
+        client.cache = None
+        print("[HTTPCache] Response cache disabled (http_cache = false)")
+        return
+    client.cache = get_cache()
+    client.cache.immutable_after_days = settings.get('cache_immutable_after_days', DEFAULT_IMMUTABLE_AFTER_DAYS)
+
+
+def set_content_date(url: str, content_date: ContentDate):
+    """Record the tournament date of a page fetched before its date was known."""
+    cache = get_client().cache
+    if cache is not None and content_date is not None:
+        cache.set_content_date(url, content_date)
+
+
+def cache_summary() -> str:
+    """Cache statistics of this run ("" if the cache is disabled)."""
+    cache = get_client().cache
+    return cache.summary() if cache is not None else ""
+
+
+def configure_rate_limit(settings: Dict):
+    """Apply requests_per_second (starting rate; default 1 / delay_between_requests),
+    host_requests_per_second ({host: starting rate} for single hosts), max_requests_per_second
+    and retry_delay (backoff base) from scraper settings."""
+    rate = get_client().rate
+    delay = settings.get('delay_between_requests')
+    initial_rate = settings.get('requests_per_second')
+    if initial_rate is None and delay:
+        initial_rate = 1.0 / delay
+    if initial_rate:
+        rate.initial_rate = initial_rate
+    for host, host_rate in (settings.get('host_requests_per_second') or {}).items():
+        rate.host_rates[host.lower()] = float(host_rate)
+    rate.max_rate = max(settings.get('max_requests_per_second', DEFAULT_MAX_REQUESTS_PER_SECOND), rate.initial_rate)
+    rate.backoff_base = settings.get('retry_delay', DEFAULT_BACKOFF_BASE)
+
+
+def configure_http(settings: Dict):
+    """Apply all HTTP settings of a scraper (response cache + rate control)."""
+    configure_cache(settings)
+    configure_rate_limit(settings)
+
+
+def fetch_summary() -> str:
+    """Cache, rate control and record / replay statistics of this run, one line each."""
+    client = get_client()
+    lines = [cache_summary(), client.rate.summary(), client.telemetry.summary()]
+    if client.archive is not None:
+        lines.append(client.archive.summary())
+    lines.append(f"[HTTPClient] {client.connections_opened()} connections opened")
+    return "\n".join(line for line in lines if line)
+
+
+def save_fetch_telemetry(name: str = None) -> Optional[str]:
+    """Write this run's fetch telemetry to data/fetch_telemetry_<name>.json
+    (name defaults to the script / EXE name). Returns the path, None on error."""
+    client = get_client()
+    name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or 'scraper'
+    path = telemetry_path(name)
+    run_id = client.cache.run_id if client.cache is not None else current_run_id()
+    if not client.telemetry.save(path, scraper=name, run_id=run_id, mode=client.mode):
+        return None
+    print(f"[Telemetry] ✓ Saved fetch telemetry to {path}")
+    return path
+
+
+# ============================================================================
+# SCRAPER HELPERS (old fetch_page / safe_fetch signatures)
+# ============================================================================
+
+def is_retryable(error: FetchError) -> bool:
+    """Connection failures, 429 and 5xx may succeed on retry, other 4xx won't."""
+    if isinstance(error, FetchStatusError):
+        return error.status in THROTTLE_STATUSES or error.status >= 500
+    return True
+
+
+def fetch_page(url: str, timeout: int = DEFAULT_TIMEOUT, content_date: ContentDate = None) -> str:
+    """Fetch a webpage and return its HTML content ("" on error, error is printed)."""
+    try:
+        return get_client().get_text(url, timeout=timeout, content_date=content_date)
+    except FetchError as e:
+        print(f"  Error fetching {url}: {e}")
+        return ""
+
+
+class LinkCollector(HTMLParser):
+    """Collects the href values matching `pattern` in page order (parser for feed_page)."""
+
+    def __init__(self, pattern: str):
+        super().__init__()
+        self.pattern = re.compile(pattern)
+        self.matches: List[Match] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        for name, value in attrs:
+            if name == 'href' and value:
+                match = self.pattern.search(value)
+                if match:
+                    self.matches.append(match)
+
+
+def feed_page(url: str, parser: HTMLParser, stop: Callable[[], bool] = None,
+              timeout: int = DEFAULT_TIMEOUT, content_date: ContentDate = None) -> bool:
+    """Feed a page to an HTMLParser while it downloads (see HTTPClient.stream).
+
+    stop is called after every chunk - once it returns True the download is abandoned
+    (e.g. the listing reached tournaments older than the wanted date range).
+    Returns False on a fetch error (error is printed, parser keeps what it got so far).
+    """
+    chunks = get_client().stream(url, timeout=timeout, content_date=content_date)
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            if stop is not None and stop():
+                return True
+        parser.close()
+        return True
+    except FetchError as e:
+        print(f"  Error fetching {url}: {e}")
+        return False
+    finally:
+        chunks.close()
+
+
+def safe_fetch(url: str, timeout: int, retries: int, retry_delay: float,
+               content_date: ContentDate = None) -> str:
+    """Fetch a URL with retries and a configurable timeout.
+
+    Only connection errors, 429 and 5xx answers are retried - a 404 won't change.
+    The pause before a retry comes from the client's RateController (exponential
+    backoff with jitter, Retry-After); retry_delay is kept for old callers, the
+    backoff base is configured with configure_rate_limit().
+    """
+    cached = get_client().get_cached(url, content_date)
+    if cached is not None:
+        print(f"  Cached: {url}", flush=True)
+        return cached.text
+
+    attempts = retries + 1
+    for attempt in range(1, attempts + 1):
+        print(f"  Fetching: {url} (attempt {attempt}/{attempts})", flush=True)
+        if attempt > 1:
+            get_client().telemetry.retry(url)
+        try:
+            return get_client().get_text(url, timeout=timeout, content_date=content_date)
+        except FetchStatusError as e:
+            if not is_retryable(e):
+                print(f"  [WARN] Fetch failed ({e}), not retrying: {url}", flush=True)
+                return ""
+            print(f"  [WARN] Fetch failed ({e}) (attempt {attempt}/{attempts}): {url}", flush=True)
+        except FetchError as e:
+            print(f"  [WARN] Fetch failed ({e}) (attempt {attempt}/{attempts}): {url}", flush=True)
+    return ""
+
+
+# ============================================================================
+# CONCURRENT FETCHING
+# ============================================================================
+
+class FetchOutcome(NamedTuple):
+    """Result of one URL in a FetchEngine batch."""
+    index: int  # Position in the input batch
+    url: str
+    text: str  # "" on error
+    error: Optional[FetchError]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FetchEngine:
+    """
+    Fetch batches of URLs in parallel while staying polite.
+
+    - max_workers requests in flight at once (thread pool over the shared keep-alive client)
+    - pacing per host by the client's RateController (see configure_rate_limit)
+    - connection errors, 429 and 5xx answers are retried (retries x, with backoff)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, timeout: float = None,
+                 retries: int = 0, client: HTTPClient = None):
+        self.max_workers = max(1, int(max_workers))
+        self.client = client or get_client()
+        self.timeout = timeout
+        self.retries = retries
+
+    @classmethod
+    def from_settings(cls, settings: Dict, **overrides) -> 'FetchEngine':
+        """Build an engine from a scraper settings dict (keys: max_parallel_requests,
+        request_timeout, max_retries)."""
+        options = {
+            'max_workers': settings.get('max_parallel_requests', DEFAULT_MAX_WORKERS),
+            'timeout': settings.get('request_timeout'),
+            'retries': settings.get('max_retries', 0)
+        }
+        options.update(overrides)
+        return cls(**options)
+
+    def fetch(self, url: str, content_date: ContentDate = None) -> str:
+        """Fetch one URL through the rate controller (with retries). Raises FetchError.
+
+        Fresh cache hits are returned without waiting for the rate controller.
+        """
+        cached = self.client.get_cached(url, content_date)
+        if cached is not None:
+            return cached.text
+        attempts = self.retries + 1
+        for attempt in range(1, attempts + 1):
+            if attempt > 1:
+                self.client.telemetry.retry(url)
+            try:
+                return self.client.get_text(url, timeout=self.timeout, content_date=content_date)
+            except FetchError as e:
+                if not is_retryable(e) or attempt == attempts:
+                    raise
+
+    def _fetch_outcome(self, index: int, url: str, content_date: ContentDate = None) -> FetchOutcome:
+        try:
+            return FetchOutcome(index, url, self.fetch(url, content_date), None)
+        except FetchError as e:
+            return FetchOutcome(index, url, '', e)
+
+    def fetch_all(self, urls: Iterable[str], content_date: ContentDate = None) -> Iterator[FetchOutcome]:
+        """Fetch all URLs and yield FetchOutcomes as they complete (see outcome.index for order).
+
+        content_date: tournament date shared by all URLs (see HTTPClient.get).
+        """
+        urls = list(urls)
+        if not urls:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+            futures = [executor.submit(self._fetch_outcome, i, url, content_date) for i, url in enumerate(urls)]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Consumer stopped early - don't start the remaining requests
+                for future in futures:
+                    future.cancel()
+
+    def fetch_ordered(self, urls: Iterable[str], content_date: ContentDate = None) -> List[FetchOutcome]:
+        """Fetch all URLs in parallel and return the outcomes in input order."""
+        outcomes = list(self.fetch_all(urls, content_date))
+        outcomes.sort(key=lambda outcome: outcome.index)
+        return outcomes
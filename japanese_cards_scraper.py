@@ -17,6 +17,10 @@ import time
 from datetime import datetime
 from typing import List, Dict, Set, Tuple
 
+from browser_pool import BrowserPool, create_browser, short_error
+from card_details import PROMO_SETS, read_card_page
+from limitless_hosts import limitless_url
+
 # Fix Windows console encoding for Unicode characters (✓, ×, •, etc.)
 if sys.platform == 'win32':
     if hasattr(sys.stdout, 'reconfigure'):
@@ -38,7 +42,10 @@ DEFAULT_SETTINGS = {
     "detail_page_wait_seconds": 2.0,
     "detail_request_delay_seconds": 0.5,
     "keep_latest_sets": 4,
-    "skip_detail_scraping": False
+    "skip_detail_scraping": False,
+    "browser_workers": 2,  # Parallel Chrome instances for the detail pages
+    "browser_page_budget": 1000,  # Pages per browser before it is restarted
+    "lean_browser": True  # Chrome without images / fonts / media / trackers, eager page load
 }
 
 # Load settings from file if it exists
@@ -58,9 +65,7 @@ print("=" * 80)
 print()
 
 try:
-    from selenium import webdriver
     from selenium.webdriver.common.by import By
-    from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
     SELENIUM_AVAILABLE = True
@@ -91,15 +96,7 @@ def scrape_japanese_cards_list() -> List[Dict[str, str]]:
     """Scrape Japanese card list and extract set information."""
     print("[Japanese Scraper] Starting Selenium WebDriver...")
     
-    chrome_options = Options()
-    if SETTINGS['headless']:
-        chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    driver = webdriver.Chrome(options=chrome_options)
+    driver = create_browser(SETTINGS['headless'], lean=bool(SETTINGS.get('lean_browser', True)))
     all_cards_data = []
     
     try:
@@ -120,7 +117,7 @@ def scrape_japanese_cards_list() -> List[Dict[str, str]]:
                 current_url = f"{base_url}&page={page_index}"
 
             print(f"[Japanese Scraper] Loading page {page_index}: {current_url}")
-            driver.get(current_url)
+            driver.get(limitless_url(current_url))
 
             # Wait for table rows to appear
             try:
@@ -239,73 +236,33 @@ def scrape_card_details(cards: List[Dict[str, str]]) -> List[Dict[str, str]]:
     print(f"\n[Japanese Scraper] Scraping detail pages for {len(cards)} cards...")
     print(f"[Japanese Scraper] This may take a while - opening ~1 page per card...")
     
-    chrome_options = Options()
-    if SETTINGS['headless']:
-        chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    
-    driver = webdriver.Chrome(options=chrome_options)
-    
-    try:
-        for idx, card in enumerate(cards):
-            try:
-                if not card.get('card_url'):
-                    continue
-                
-                # Build full URL if relative
-                if card['card_url'].startswith('/'):
-                    full_url = f"https://limitlesstcg.com{card['card_url']}"
-                else:
-                    full_url = card['card_url']
-                
-                print(f"[Japanese Scraper] [{idx+1}/{len(cards)}] {card['name']} ({card['set']} {card['number']})...")
-                driver.get(full_url)
-                
-                # Wait for image to load
-                time.sleep(SETTINGS['detail_page_wait_seconds'])
-                
-                # Extract image URL from <img class="card shadow resp-w">
-                try:
-                    img_elem = driver.find_element(By.CSS_SELECTOR, "img.card.shadow.resp-w")
-                    image_url = img_elem.get_attribute('src')
-                    if image_url:
-                        card['image_url'] = image_url
-                except:
-                    pass
-                
-                # Extract rarity from card-prints div
-                try:
-                    rarity_spans = driver.find_elements(By.CSS_SELECTOR, ".card-prints-current .prints-current-details span")
-                    if len(rarity_spans) >= 2:
-                        rarity_info = rarity_spans[1].get_attribute('textContent').strip()
-                        # Extract rarity from format like "· Double Rare"
-                        if '·' in rarity_info:
-                            rarity = rarity_info.split('·')[1].strip()
-                            card['rarity'] = rarity
-                except:
-                    pass
-                
-                # For Promo sets: If rarity is empty, set it to "Promo"
-                PROMO_SETS = ['MEP', 'SVP', 'SP', 'SMP', 'XYP', 'BWP', 'HSP', 'DPP', 'NP', 'WP', 
-                              'POP', 'SWSH', 'SWSHP', 'PR-SW', 'PR-SM', 'PR-XY', 'PR-BLW', 'PR-HS', 'PR-DP']
-                if card['set'] in PROMO_SETS and not card.get('rarity'):
-                    card['rarity'] = 'Promo'
-                
-                # Be nice to the server
-                time.sleep(SETTINGS['detail_request_delay_seconds'])
-                
-                if (idx + 1) % 50 == 0:
-                    print(f"[Japanese Scraper] ✓ Completed {idx + 1} detail pages")
-                
-            except Exception as e:
-                print(f"[Japanese Scraper] ERROR scraping {card['name']}: {e}")
-                continue
+    pool = BrowserPool.from_settings(SETTINGS, log_prefix="[Japanese Scraper]")
+    todo = [card for card in cards if card.get('card_url')]
+    print(f"[Japanese Scraper] Browser pool: {pool.describe()}")
     
-    finally:
-        driver.quit()
+    # Build full URL if relative
+    urls = [f"https://limitlesstcg.com{card['card_url']}" if card['card_url'].startswith('/') else card['card_url']
+            for card in todo]
+    for outcome in pool.load_all(urls, read_card_page):
+        card = todo[outcome.index]
+        print(f"[Japanese Scraper] [{outcome.index + 1}/{len(todo)}] {card['name']} ({card['set']} {card['number']})...")
+        if not outcome.ok:
+            print(f"[Japanese Scraper] ERROR scraping {card['name']}: {short_error(outcome.error)}")
+            continue
+        
+        # Image URL (<img class="card shadow resp-w">) and rarity (format like "· Double Rare")
+        details = outcome.result
+        if details.image_url:
+            card['image_url'] = details.image_url
+        if details.rarity:
+            card['rarity'] = details.rarity
+        
+        # For Promo sets: If rarity is empty, set it to "Promo"
+        if card['set'] in PROMO_SETS and not card.get('rarity'):
+            card['rarity'] = 'Promo'
+        
+        if (outcome.index + 1) % 50 == 0:
+            print(f"[Japanese Scraper] ✓ Completed {outcome.index + 1} detail pages")
     
     # Count how many got image URLs
     cards_with_images = sum(1 for c in cards if c.get('image_url'))
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Limitless Hosts - Base URL Override for the Scrapers
+====================================================
+The Limitless hosts (limitlesstcg.com, play.limitlesstcg.com, labs.limitlesstcg.com)
+can be redirected to a stand-in server (limitless_standin.py):
+
+    python city_league_analysis_scraper.py --limitless-base-url=http://127.0.0.1:8800
+    set HAUSI_LIMITLESS_BASE_URL=http://127.0.0.1:8800      (every scraper started afterwards)
+
+http_client applies the override to every HTTP fetch, the browser based scrapers
+wrap their URLs in limitless_url(). Other hosts than limitlesstcg.com are addressed
+as <base>/_host/<host>/<path>.
+"""
+
+import os
+import sys
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+BASE_URL_OPTION = '--limitless-base-url='
+BASE_URL_ENV = 'HAUSI_LIMITLESS_BASE_URL'
+
+MAIN_HOST = 'limitlesstcg.com'
+LIMITLESS_HOSTS = (MAIN_HOST, 'play.limitlesstcg.com', 'labs.limitlesstcg.com')
+HOST_PREFIX = '/_host/'
+
+
+def base_url_from_argv(argv=None) -> Optional[str]:
+    """Stand-in base URL from --limitless-base-url=<url> or HAUSI_LIMITLESS_BASE_URL (None = real sites)."""
+    value = None
+    for arg in (argv if argv is not None else sys.argv):
+        if arg.startswith(BASE_URL_OPTION):
+            value = arg[len(BASE_URL_OPTION):]
+    value = value or os.environ.get(BASE_URL_ENV)
+    return value.rstrip('/') if value else None
+
+
+def standin_url(url: str, base_url: Optional[str]) -> str:
+    """The stand-in server URL of a Limitless URL (other URLs are returned unchanged)."""
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if host not in LIMITLESS_HOSTS:
+        return url
+    path = parts.path or '/'
+    if host != MAIN_HOST:
+        path = f"{HOST_PREFIX}{host}{path}"
+    return base_url + path + ('?' + parts.query if parts.query else '')
+
+
+def limitless_url(url: str) -> str:
+    """`url`, or its stand-in equivalent when a base URL override is set (browser based scrapers)."""
+    return standin_url(url, base_url_from_argv())
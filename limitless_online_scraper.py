@@ -6,11 +6,9 @@ Scrapes deck statistics from play.limitlesstcg.com/decks
 No external dependencies required - uses only Python standard library
 """
 
-import urllib.request
 import urllib.parse
 import csv
 import re
-import time
 import json
 import os
 import sys
@@ -18,6 +16,8 @@ from datetime import datetime
 from html.parser import HTMLParser
 from typing import List, Dict, Optional, Tuple, Any
 
+from http_client import configure_http, fetch_page, fetch_summary, save_fetch_telemetry
+
 # Fix Windows console encoding for Unicode characters (✓, ×, •, etc.)
 if sys.platform == 'win32':
     if hasattr(sys.stdout, 'reconfigure'):
@@ -114,19 +114,6 @@ def load_settings() -> Dict[str, Any]:
     
     return settings
 
-def fetch_page(url: str) -> str:
-    """Fetch a webpage and return its HTML content."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=15) as response:
-            return response.read().decode('utf-8', errors='ignore')
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return ""
-
 class DeckStatsParser(HTMLParser):
     """Parser to extract deck statistics from the decks page."""
     def __init__(self):
@@ -412,7 +399,7 @@ class MatchupParser(HTMLParser):
         if self.capture_data and self.in_cell:
             self.current_data += data
 
-def scrape_matchup_data(deck_url: str, format_type: str, rotation: str, set_code: str, delay: float = 1.5) -> List[Dict[str, Any]]:
+def scrape_matchup_data(deck_url: str, format_type: str, rotation: str, set_code: str) -> List[Dict[str, Any]]:
     """Scrape matchup data for a specific deck using its URL slug."""
     params = {
         'format': format_type.lower(),
@@ -422,7 +409,6 @@ def scrape_matchup_data(deck_url: str, format_type: str, rotation: str, set_code
     url = f"https://play.limitlesstcg.com/decks/{deck_url}/matchups/?{urllib.parse.urlencode(params)}"
     
     print(f"    Fetching matchups from: {url}")
-    time.sleep(delay)
     
     html_content = fetch_page(url)
     if not html_content:
@@ -434,7 +420,6 @@ def scrape_matchup_data(deck_url: str, format_type: str, rotation: str, set_code
         }
         url_fallback = f"https://play.limitlesstcg.com/decks/{deck_url}/matchups/?{urllib.parse.urlencode(params_no_set)}"
         print(f"    Fetching fallback from: {url_fallback}")
-        time.sleep(delay)
         html_content = fetch_page(url_fallback)
         
         if not html_content:
@@ -549,8 +534,7 @@ def analyze_matchups_for_top_decks(deck_data: List[Dict[str, Any]], settings: Di
             deck_url,
             settings['format'],
             settings['rotation'],
-            settings['set'],
-            settings['delay_between_requests']
+            settings['set']
         )
         if not matchups:
             print(f"    ⚠ No matchup data found for {deck_name}")
@@ -1459,6 +1443,7 @@ def main():
     
     # Load settings
     settings = load_settings()
+    configure_http(settings)
     
     print(f"\nSettings:")
     print(f"  Game: {settings['game']}")
@@ -1532,6 +1517,8 @@ def main():
     
     print("\n" + "=" * 60)
     print("Scraping finished!")
+    print(fetch_summary())
+    save_fetch_telemetry()
 
 if __name__ == "__main__":
     try:
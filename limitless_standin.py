@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+"""
+Limitless Stand-in Server - Offline Load Testing of the Scrapers
+================================================================
+Local HTTP server impersonating limitlesstcg.com, play.limitlesstcg.com and
+labs.limitlesstcg.com, so the whole pipeline can be measured (throughput,
+concurrency scaling, behaviour under 429 / 5xx) on a machine without network.
+
+Fixtures:
+- recorded: responses of a fetch archive (fetch_archive.py, --record-fetches) are
+  served as recorded (default data/fetch_archive/ if it exists)
+- generated: every other page is generated from its URL (deterministic per URL):
+  tournament lists, standings, decklists, deck options, card lists / card pages,
+  deck statistics and matchups - in the markup the scrapers parse
+
+Faults (per request): --latency / --jitter seconds, --error-rate (HTTP 500),
+--throttle-rate (HTTP 429 with Retry-After).
+
+Start the server:
+    python limitless_standin.py --port 8800 --latency 0.2 --throttle-rate 0.05
+
+Point the scrapers at it (limitless_hosts.py - HTTP scrapers via http_client, Selenium scrapers via limitless_url):
+    python city_league_analysis_scraper.py --limitless-base-url=http://127.0.0.1:8800
+    set HAUSI_LIMITLESS_BASE_URL=http://127.0.0.1:8800      (every scraper started afterwards)
+
+Other hosts than limitlesstcg.com are addressed as <base>/_host/<host>/<path>.
+With a base URL override the response cache (data/http_cache.sqlite) is not used.
+GET <base>/_standin/stats returns the server's request counters as JSON.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from fetch_archive import FetchArchive, archive_dir_from_argv
+from limitless_hosts import BASE_URL_ENV, BASE_URL_OPTION, HOST_PREFIX, LIMITLESS_HOSTS, MAIN_HOST
+
+
+# ============================================================================
+# FIXTURE DATA
+# ============================================================================
+
+DEFAULT_PORT = 8800
+DEFAULT_SET = 'PFL'  # Format filter of the generated deck statistics links
+TOURNAMENTS_PER_DAY = 5
+STANDINGS_SIZE = 32
+LABS_TOURNAMENTS = 20
+JH_TOURNAMENTS_PER_PAGE = 100
+JH_PAGES = 10
+CARD_LIST_PAGE_SIZE = 50
+CARD_LIST_PAGES = 5
+
+# (slug, display name, pokemon image names, Pokémon cards (name, set, number))
+ARCHETYPES = [
+    ('dragapult-ex', 'Dragapult ex', ['dragapult'],
+     [('Dreepy', 'TWM', '128'), ('Drakloak', 'TWM', '129'), ('Dragapult ex', 'TWM', '130'), ('Budew', 'PRE', '4')]),
+    ('gardevoir-ex', 'Gardevoir ex', ['gardevoir'],
+     [('Ralts', 'MEG', '58'), ('Kirlia', 'MEG', '59'), ('Gardevoir ex', 'SVI', '86'), ('Munkidori', 'TWM', '95')]),
+    ('charizard-ex', 'Charizard ex Pidgeot ex', ['charizard', 'pidgeot'],
+     [('Charmander', 'PAF', '7'), ('Charizard ex', 'OBF', '125'), ('Pidgey', 'OBF', '162'), ('Pidgeot ex', 'OBF', '164')]),
+    ('raging-bolt-ex', 'Raging Bolt ex Ogerpon ex', ['raging-bolt', 'ogerpon'],
+     [('Raging Bolt ex', 'TEF', '123'), ('Teal Mask Ogerpon ex', 'TWM', '25'), ('Squawkabilly ex', 'PAL', '169')]),
+    ('gholdengo-ex', 'Gholdengo ex', ['gholdengo'],
+     [('Gimmighoul', 'SSP', '97'), ('Gholdengo ex', 'PAR', '139'), ('Lunatone', 'MEG', '74'), ('Solrock', 'MEG', '75')]),
+    ('grimmsnarl-ex', "Marnie's Grimmsnarl ex", ['grimmsnarl'],
+     [("Marnie's Impidimp", 'DRI', '134'), ("Marnie's Morgrem", 'DRI', '135'), ("Marnie's Grimmsnarl ex", 'DRI', '136')]),
+]
+
+TRAINERS = [
+    ('Ultra Ball', 'SVI', '196'), ('Nest Ball', 'SVI', '181'), ("Boss's Orders", 'PAL', '172'),
+    ('Iono', 'PAL', '185'), ('Arven', 'SVI', '166'), ('Rare Candy', 'SVI', '191'),
+    ("Professor's Research", 'SVI', '189'), ('Night Stretcher', 'SFA', '61'), ('Super Rod', 'PAL', '188'),
+    ("Lillie's Determination", 'MEG', '119'), ('Buddy-Buddy Poffin', 'TEF', '144'), ('Counter Catcher', 'PAR', '160'),
+]
+
+ENERGIES = [
+    ('Basic Psychic Energy', 'SVE', '5'), ('Basic Fire Energy', 'SVE', '2'), ('Basic Darkness Energy', 'SVE', '7'),
+    ('Luminous Energy', 'PAL', '191'), ('Jet Energy', 'PAL', '190'),
+]
+
+CARD_TYPES = ['Pokémon', 'Trainer', 'Energy']
+PREFECTURES = ['Tokyo', 'Osaka', 'Aichi', 'Fukuoka', 'Hokkaido', 'Miyagi', 'Hiroshima', 'Kanagawa']
+
+
+def _rng(*parts) -> random.Random:
+    """Deterministic random generator per page (same URL -> same fixture)."""
+    seed = hashlib.sha1('/'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def _today() -> datetime:
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ordinal_date(day: datetime) -> str:
+    """'12th March 2026' (tournament pages)."""
+    suffix = 'th' if 11 <= day.day <= 13 else {1: 'st', 2: 'nd', 3: 'rd'}.get(day.day % 10, 'th')
+    return f"{day.day}{suffix} {day.strftime('%B %Y')}"
+
+
+def _deck(rng: random.Random, archetype) -> List[Tuple[str, str, str, str, int]]:
+    """60-card list as (section, name, set, number, count)."""
+    cards = [('pokemon', name, set_code, number, rng.randint(1, 4)) for name, set_code, number in archetype[3]]
+    for name, set_code, number in rng.sample(TRAINERS, 9):
+        cards.append(('trainer', name, set_code, number, rng.randint(1, 4)))
+    for name, set_code, number in rng.sample(ENERGIES, 2):
+        cards.append(('energy', name, set_code, number, 0))
+    used = sum(card[4] for card in cards)
+    energy_count = max(2, 60 - used)
+    cards[-2] = cards[-2][:4] + (energy_count - energy_count // 2,)
+    cards[-1] = cards[-1][:4] + (energy_count // 2,)
+    return cards
+
+
+def _page(title: str, body: str) -> str:
+    return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title} | Limitless</title></head>'
+            f'<body>{body}</body></html>')
+
+
+# ============================================================================
+# PAGE GENERATORS
+# ============================================================================
+
+def _decklist_columns(cards, decimal_counts: bool = False) -> str:
+    """limitlesstcg.com decklist markup (City League lists, tournament card pages)."""
+    html = []
+    for section, heading in (('pokemon', 'Pokémon'), ('trainer', 'Trainer'), ('energy', 'Energy')):
+        rows = [card for card in cards if card[0] == section]
+        html.append(f'<div class="decklist-column"><div class="decklist-column-heading">'
+                    f'{heading} ({sum(card[4] for card in rows)})</div>')
+        for _, name, set_code, number, count in rows:
+            shown = f"{count * 0.93:.2f}" if decimal_counts else str(count)
+            html.append(f'<div class="decklist-card" data-set="{set_code}" data-number="{number}">'
+                        f'<a class="card-link" href="/cards/{set_code}/{number}">'
+                        f'<span class="card-count">{shown}</span> <span class="card-name">{name}</span></a></div>')
+        html.append('</div>')
+    return ''.join(html)
+
+
+def jp_tournament_list(query: Dict[str, str]) -> str:
+    """/tournaments/jp?show=N - City League list, newest first."""
+    show = int(query.get('show', '50') or 50)
+    today = _today()
+    rows = []
+    for index in range(show):
+        tournament_id = 9000 - index
+        day = today - timedelta(days=1 + index // TOURNAMENTS_PER_DAY)
+        rng = _rng('jp-list', tournament_id)
+        rows.append(f'<tr><td>{day.strftime("%d %b %y")}</td><td>{rng.choice(PREFECTURES)}</td>'
+                    f'<td>Card Shop {tournament_id}</td><td>Player {rng.randint(1, 999)}</td>'
+                    f'<td><a href="/tournaments/jp/{tournament_id}">Results</a></td></tr>')
+    return _page('City League Tournaments', '<table><tr><th>Date</th><th>Prefecture</th><th>Shop</th>'
+                 '<th>Winner</th><th></th></tr>' + ''.join(rows) + '</table>')
+
+
+def jp_tournament(tournament_id: str) -> str:
+    """/tournaments/jp/<id> - standings with archetype images and decklist links."""
+    rng = _rng('jp', tournament_id)
+    rows = []
+    for place in range(1, STANDINGS_SIZE + 1):
+        archetype = rng.choice(ARCHETYPES)
+        images = ''.join(f'<img class="pokemon" src="/img/{name}.png" alt="{name}">' for name in archetype[2])
+        rows.append(f'<tr><td>{place}</td><td><a href="/players/{place}">Player {place}</a></td>'
+                    f'<td><a href="/decks/list/jp/{int(tournament_id) * 100 + place}">{images}</a></td></tr>')
+    return _page(f'City League {tournament_id}', '<table><tr><th>Place</th><th>Player</th><th>Deck</th></tr>'
+                 + ''.join(rows) + '</table>')
+
+
+def decklist(list_id: str) -> str:
+    """/decks/list/<id>, /decks/list/jp/<id>."""
+    rng = _rng('list', list_id)
+    archetype = rng.choice(ARCHETYPES)
+    return _page(f'{archetype[1]} decklist', _decklist_columns(_deck(rng, archetype)))
+
+
+def tournament_list(query: Dict[str, str]) -> str:
+    """/tournaments?show=100&page=N - newest first (tournament_scraper_JH)."""
+    page = int(query.get('page', '1') or 1)
+    rows = []
+    if page <= JH_PAGES:
+        first = 5000 - (page - 1) * JH_TOURNAMENTS_PER_PAGE
+        for tournament_id in range(first, first - JH_TOURNAMENTS_PER_PAGE, -1):
+            rows.append(f'<tr><td><a href="/tournaments/{tournament_id}">Tournament {tournament_id}</a></td></tr>')
+    return _page('Tournaments', '<table>' + ''.join(rows) + '</table>')
+
+
+def tournament(tournament_id: str) -> str:
+    """/tournaments/<id> - tournament header (name, date, players, format)."""
+    rng = _rng('tournament', tournament_id)
+    day = _today() - timedelta(days=int(tournament_id) % 365)
+    kind = rng.choice(['Regional Championship', 'Special Event', 'International Championship'])
+    return _page(f'{kind} {tournament_id}',
+                 f'<div class="infobox-heading">{kind} {tournament_id}</div>'
+                 f'<div class="infobox-line">{_ordinal_date(day)} • {rng.randint(200, 3000)} Players • '
+                 f'<a href="/decks/?time=all&format=SVI-PFL">Scarlet &amp; Violet - Phantasmal Flames</a></div>')
+
+
+def tournament_cards(tournament_id: str, query: Dict[str, str]) -> str:
+    """/tournaments/<id>/cards - deck options, ?deck=<value> - averaged list of one archetype."""
+    deck = query.get('deck')
+    if deck:
+        rng = _rng('cards', tournament_id, deck)
+        archetype = ARCHETYPES[int(float(deck)) % len(ARCHETYPES)]
+        return _page(f'{archetype[1]} cards', _decklist_columns(_deck(rng, archetype), decimal_counts=True))
+    rng = _rng('cards', tournament_id)
+    options = ''.join(f'<li data-value="{index}.{rng.randint(10, 99)}">{archetype[1]} - {rng.randint(2, 120)} decklists</li>'
+                      for index, archetype in enumerate(ARCHETYPES))
+    return _page(f'Tournament {tournament_id} cards', f'<ul class="select">{options}</ul>')
+
+
+def card_list(query: Dict[str, str]) -> str:
+    """/cards?q=...&display=list[&page=N] - card table with pagination."""
+    page = int(query.get('page', '1') or 1)
+    cards = [card for archetype in ARCHETYPES for card in archetype[3]] + TRAINERS + ENERGIES
+    rows = []
+    for index in range(CARD_LIST_PAGE_SIZE):
+        name, set_code, number = cards[((page - 1) * CARD_LIST_PAGE_SIZE + index) % len(cards)]
+        number = str(int(number) + 1000 * ((page - 1) * CARD_LIST_PAGE_SIZE + index) // len(cards))
+        card_type = 'Trainer' if (name, set_code) in [(t[0], t[1]) for t in TRAINERS] else \
+            'Energy' if 'Energy' in name else 'Pokémon'
+        rows.append(f'<tr><td>{set_code}</td><td>{number}</td><td><a href="/cards/{set_code}/{number}">{name}</a></td>'
+                    f'<td>{card_type}</td></tr>')
+    pagination = '<div class="pagination">'
+    if page < CARD_LIST_PAGES:
+        params = '&'.join(f'{key}={value}' for key, value in query.items() if key != 'page')
+        pagination += f'<a rel="next" href="/cards?{params}&page={page + 1}">Next</a>'
+    pagination += '</div>'
+    return _page('Cards', '<table class="data-table"><thead><tr><th>Set</th><th>No</th><th>Name</th><th>Type</th>'
+                 '</tr></thead><tbody>' + ''.join(rows) + '</tbody></table>' + pagination)
+
+
+def card_page(set_code: str, number: str) -> str:
+    """/cards/<set>/<number> - image, rarity, international prints with Cardmarket link."""
+    rng = _rng('card', set_code, number)
+    rarity = rng.choice(['Common', 'Uncommon', 'Rare', 'Double Rare', 'Illustration Rare'])
+    prints = ''
+    for offset, other in enumerate([set_code, rng.choice(['SVP', 'PAF', 'PRE'])]):
+        current = ' class="current"' if offset == 0 else ''
+        prints += (f'<tr{current}><td><a href="/cards/{other}/{int(number) + offset}">'
+                   f'{other} {int(number) + offset}</a></td>'
+                   f'<td><a class="card-price eur" href="https://www.cardmarket.com/en/Pokemon/Products/Singles/{other}/'
+                   f'{set_code}-{number}">{rng.randint(1, 300) / 10:.2f}€</a></td></tr>')
+    return _page(f'{set_code} {number}',
+                 f'<img class="card shadow resp-w" src="https://limitlesstcg.nyc3.cdn.digitaloceanspaces.com/tpci/'
+                 f'{set_code}/{set_code}_{number}_R_EN_LG.png">'
+                 f'<div class="card-prints-current"><div class="prints-current-details">'
+                 f'<span class="text-lg">{set_code} {number}</span><span>#{number} · {rarity}</span></div></div>'
+                 f'<table class="card-prints-versions"><thead><tr><th>Print</th><th>Price</th></tr></thead>'
+                 f'<tbody>{prints}</tbody></table>')
+
+
+def play_deck_stats(query: Dict[str, str]) -> str:
+    """play: /decks?game=PTCG... - deck statistics table."""
+    set_code = query.get('set', DEFAULT_SET)
+    params = f"game=PTCG&format={query.get('format', 'standard')}&rotation={query.get('rotation', '2025')}&set={set_code}"
+    rng = _rng('play-decks', set_code)
+    rows = []
+    for rank, archetype in enumerate(ARCHETYPES, 1):
+        wins, losses, ties = rng.randint(50, 900), rng.randint(50, 900), rng.randint(0, 40)
+        rows.append(f'<tr><td>{rank}</td><td><img class="pokemon" src="/img/{archetype[2][0]}.png"></td>'
+                    f'<td><a href="/decks/{archetype[0]}?{params}">{archetype[1]}</a></td>'
+                    f'<td>{wins + losses + ties}</td><td>{rng.randint(10, 150) / 10:.1f}%</td>'
+                    f'<td>{wins} - {losses} - {ties}</td><td>{100 * wins / (wins + losses):.1f}%</td></tr>')
+    return _page('Decks', '<table class="meta"><tr><th>#</th><th></th><th>Deck</th><th>Count</th><th>Share</th>'
+                 '<th>Score</th><th>Win %</th></tr>' + ''.join(rows) + '</table>')
+
+
+def play_deck(slug: str) -> str:
+    """play: /decks/<slug> - deck page with tournament decklist links."""
+    archetype = next((item for item in ARCHETYPES if item[0] == slug), ARCHETYPES[0])
+    rng = _rng('play-deck', slug)
+    links = ''.join(f'<tr><td><a href="/tournament/t{rng.randint(1000, 9999)}/player/player{index}/decklist">'
+                    f'List {index}</a></td></tr>' for index in range(40))
+    return _page(archetype[1], f'<div class="name">{archetype[1]}</div><table>{links}</table>')
+
+
+def play_matchups(slug: str) -> str:
+    """play: /decks/<slug>/matchups/ - matchup table."""
+    rng = _rng('matchups', slug)
+    rows = []
+    for opponent in ARCHETYPES:
+        wins, losses, ties = rng.randint(5, 200), rng.randint(5, 200), rng.randint(0, 10)
+        rows.append(f'<tr><td><img src="/img/{opponent[2][0]}.png"></td><td>{opponent[1]}</td>'
+                    f'<td>{wins + losses + ties}</td><td>{wins} - {losses} - {ties}</td>'
+                    f'<td>{100 * wins / (wins + losses):.1f}%</td></tr>')
+    return _page('Matchups', '<table><tr><th></th><th>Deck</th><th>Matches</th><th>Score</th><th>Win %</th></tr>'
+                 + ''.join(rows) + '</table>')
+
+
+def play_decklist(tournament_id: str, player: str) -> str:
+    """play: /tournament/<id>/player/<name>/decklist."""
+    rng = _rng('play-list', tournament_id, player)
+    cards = _deck(rng, rng.choice(ARCHETYPES))
+    html = []
+    for section, heading in (('pokemon', 'Pokémon'), ('trainer', 'Trainer'), ('energy', 'Energy')):
+        rows = [card for card in cards if card[0] == section]
+        links = ''.join(
+            f'<a href="https://limitlesstcg.com/cards/{set_code}/{number}">{count} {name} ({set_code} {number})</a>'
+            if section == 'pokemon' else f'<a href="https://limitlesstcg.com/cards/{set_code}/{number}">{count} {name}</a>'
+            for _, name, set_code, number, count in rows
+        )
+        html.append(f'<div class="cards"><div class="heading">{heading} ({sum(card[4] for card in rows)})</div>{links}</div>')
+    return _page('Decklist', ''.join(html))
+
+
+def labs_index() -> str:
+    """labs: / - tournament links."""
+    links = ''.join(f'<a href="/{tournament_id:04d}/standings">Tournament {tournament_id}</a>'
+                    for tournament_id in range(LABS_TOURNAMENTS + 40, 40, -1))
+    return _page('Limitless Labs', links)
+
+
+def labs_standings(tournament_id: str) -> str:
+    """labs: /<id>/standings - standings with player decklist and archetype links."""
+    rng = _rng('labs', tournament_id)
+    day = _today() - timedelta(days=int(tournament_id) % 90)
+    rows = []
+    for place in range(1, STANDINGS_SIZE + 1):
+        archetype = rng.choice(ARCHETYPES)
+        rows.append(f'<tr><td>{place}</td><td><a href="/{tournament_id}/player/{place}/decklist">Player {place}</a></td>'
+                    f'<td><a href="/{tournament_id}/decks/{archetype[0]}">{archetype[1]}</a></td></tr>')
+    return _page(f'Regional Championship {tournament_id}',
+                 f'<div class="header">{_ordinal_date(day)} • Standard</div><table>{"".join(rows)}</table>')
+
+
+def labs_decklist(tournament_id: str, player_id: str) -> str:
+    """labs: /<id>/player/<pid>/decklist - card data as embedded JSON."""
+    rng = _rng('labs-list', tournament_id, player_id)
+    message = {'pokemon': [], 'trainer': [], 'energy': []}
+    for section, name, set_code, number, count in _deck(rng, rng.choice(ARCHETYPES)):
+        message[section].append({'count': count, 'name': name, 'set': set_code, 'number': number})
+    payload = json.dumps({'body': json.dumps({'ok': True, 'message': message})})
+    return _page('Decklist', f'<script type="application/json">{payload}</script>')
+
+
+Route = Tuple[str, 're.Pattern', Callable[..., str]]
+
+ROUTES: List[Route] = [
+    (MAIN_HOST, re.compile(r'^/tournaments/jp/?$'), lambda m, q: jp_tournament_list(q)),
+    (MAIN_HOST, re.compile(r'^/tournaments/jp/(\d+)/?$'), lambda m, q: jp_tournament(m.group(1))),
+    (MAIN_HOST, re.compile(r'^/decks/list/(?:jp/)?(\d+)/?$'), lambda m, q: decklist(m.group(1))),
+    (MAIN_HOST, re.compile(r'^/tournaments/?$'), lambda m, q: tournament_list(q)),
+    (MAIN_HOST, re.compile(r'^/tournaments/(\d+)/?$'), lambda m, q: tournament(m.group(1))),
+    (MAIN_HOST, re.compile(r'^/tournaments/(\d+)/cards/?$'), lambda m, q: tournament_cards(m.group(1), q)),
+    (MAIN_HOST, re.compile(r'^/cards/?$'), lambda m, q: card_list(q)),
+    (MAIN_HOST, re.compile(r'^/cards/([A-Za-z0-9-]+)/(\d+)/?$'), lambda m, q: card_page(m.group(1), m.group(2))),
+    ('play.limitlesstcg.com', re.compile(r'^/decks/?$'), lambda m, q: play_deck_stats(q)),
+    ('play.limitlesstcg.com', re.compile(r'^/decks/([^/]+)/matchups/?$'), lambda m, q: play_matchups(m.group(1))),
+    ('play.limitlesstcg.com', re.compile(r'^/decks/([^/]+)/?$'), lambda m, q: play_deck(m.group(1))),
+    ('play.limitlesstcg.com', re.compile(r'^/tournament/([^/]+)/player/([^/]+)/decklist/?$'),
+     lambda m, q: play_decklist(m.group(1), m.group(2))),
+    ('labs.limitlesstcg.com', re.compile(r'^/?$'), lambda m, q: labs_index()),
+    ('labs.limitlesstcg.com', re.compile(r'^/(\d+)/standings/?$'), lambda m, q: labs_standings(m.group(1))),
+    ('labs.limitlesstcg.com', re.compile(r'^/(\d+)/player/(\d+)/decklist/?$'),
+     lambda m, q: labs_decklist(m.group(1), m.group(2))),
+]
+
+
+def generate_page(host: str, path: str, query: Dict[str, str]) -> Optional[str]:
+    """Generated fixture for a URL (None = unknown page)."""
+    for route_host, pattern, render in ROUTES:
+        if route_host != host:
+            continue
+        match = pattern.match(path)
+        if match:
+            return render(match, query)
+    return None
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class StandinConfig:
+    """Fault injection and fixture settings of a running server."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: int = 1, archive: Optional[FetchArchive] = None,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.archive = archive
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.started = time.time()
+        self.requests: Dict[str, int] = {}  # "host status" -> count
+        self.bytes_sent = 0
+
+    def count(self, host: str, status: int, size: int):
+        with self.lock:
+            key = f"{host} {status}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes_sent += size
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+    def stats(self) -> Dict:
+        with self.lock:
+            elapsed = time.time() - self.started
+            total = sum(self.requests.values())
+            return {
+                'uptime_seconds': round(elapsed, 1),
+                'requests': total,
+                'requests_per_second': round(total / elapsed, 2) if elapsed > 0 else 0.0,
+                'bytes_sent': self.bytes_sent,
+                'by_host_and_status': dict(sorted(self.requests.items()))
+            }
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Serves recorded / generated Limitless pages with the configured faults."""
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real sites
+    server_version = 'LimitlessStandin/1.0'
+    config: StandinConfig = None
+
+    def log_message(self, format, *args):
+        pass  # One line per request would dominate the load test
+
+    def _virtual_host(self) -> Tuple[str, str]:
+        """(Limitless host, path) from the /_host/<host> prefix or the Host header."""
+        path = urlsplit(self.path).path or '/'
+        if path.startswith(HOST_PREFIX):
+            host, _, rest = path[len(HOST_PREFIX):].partition('/')
+            return host.lower(), '/' + rest
+        host = (self.headers.get('Host') or '').split(':')[0].lower()
+        return (host if host in LIMITLESS_HOSTS else MAIN_HOST), path
+
+    def _send(self, host: str, status: int, body: bytes, headers: Dict[str, str] = None):
+        headers = dict(headers or {})
+        if body and len(body) > 1024 and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.config.count(host, status, len(body))
+
+    def do_GET(self):
+        config = self.config
+        if self.path.startswith('/_standin/stats'):
+            self._send('_standin', 200, json.dumps(config.stats(), indent=2).encode('utf-8'),
+                       {'Content-Type': 'application/json'})
+            return
+
+        host, path = self._virtual_host()
+        query_string = urlsplit(self.path).query
+
+        if config.latency or config.jitter:
+            time.sleep(config.latency + config.random.uniform(0, config.jitter))
+
+        roll = config.roll()
+        if roll < config.throttle_rate:
+            self._send(host, 429, b'Too Many Requests', {'Retry-After': str(config.retry_after)})
+            return
+        if roll < config.throttle_rate + config.error_rate:
+            self._send(host, 500, b'Internal Server Error')
+            return
+
+        # Recorded response first, generated fixture otherwise
+        if config.archive is not None:
+            url = f"https://{host}{path}" + (f"?{query_string}" if query_string else '')
+            entry = config.archive.lookup(url)
+            if entry is not None:
+                body = config.archive.read_body(entry) if entry.status < 400 else b''
+                headers = {'Content-Type': entry.headers.get('content-type', 'text/html; charset=utf-8')}
+                self._send(host, entry.status, body, headers)
+                return
+
+        query = {key: values[-1] for key, values in parse_qs(query_string).items()}
+        page = generate_page(host, path, query)
+        if page is None:
+            self._send(host, 404, b'Not Found')
+            return
+
+        body = page.encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(host, 304, b'', {'ETag': etag})
+            return
+        self._send(host, 200, body, {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag})
+
+
+def create_server(host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                  config: StandinConfig = None) -> ThreadingHTTPServer:
+    """Stand-in server (not started - call serve_forever(), e.g. in a thread)."""
+    handler = type('ConfiguredStandinHandler', (StandinHandler,), {'config': config or StandinConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for limitlesstcg.com / play. / labs.')
+    parser.add_argument('--host', default='127.0.0.1', help='Listen address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra seconds, 0..jitter (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of HTTP 500 answers (default: 0)')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of HTTP 429 answers (default: 0)')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds of 429 answers (default: 1)')
+    parser.add_argument('--archive', help='Fetch archive with recorded fixtures (default: data/fetch_archive)')
+    parser.add_argument('--generated-only', action='store_true', help='Ignore recorded fixtures')
+    parser.add_argument('--seed', type=int, help='Random seed of the fault injection')
+    args = parser.parse_args()
+
+    archive = None
+    if not args.generated_only:
+        archive_dir = args.archive or archive_dir_from_argv([])
+        if os.path.exists(archive_dir):
+            archive = FetchArchive(archive_dir)
+            len(archive)  # Load the index now, not on the first request
+
+    config = StandinConfig(args.latency, args.jitter, args.error_rate, args.throttle_rate,
+                           args.retry_after, archive, args.seed)
+    server = create_server(args.host, args.port, config)
+    base_url = f"http://{args.host}:{args.port}"
+
+    print("=" * 70)
+    print(f"LIMITLESS STAND-IN SERVER on {base_url}")
+    print("=" * 70)
+    print(f"Fixtures: {'recorded (' + archive.path + ') + generated' if archive else 'generated'}")
+    print(f"Faults: latency {args.latency:.2f}s + 0..{args.jitter:.2f}s, "
+          f"{args.error_rate:.1%} HTTP 500, {args.throttle_rate:.1%} HTTP 429 (Retry-After {args.retry_after}s)")
+    print(f"Scrapers: {BASE_URL_OPTION}{base_url}  or  set {BASE_URL_ENV}={base_url}")
+    print("Stop with Ctrl+C")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(config.stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,7 @@ Usage:
   python master_update.py --scrape-only      # Only run scrapers
   python master_update.py --merge-only       # Only merge existing data
   python master_update.py --stats-only       # Show statistics
+  python master_update.py --rebuild-card-db  # Rebuild card DB snapshot from CSV
 """
 
 import sys
@@ -68,14 +69,14 @@ def merge_databases():
         print(f"[Orchestrator] ERROR merging databases: {e}")
         return False
 
-def show_statistics():
-    """Display database statistics."""
+def show_statistics(rebuild_card_db: bool = False):
+    """Display database statistics (rebuild_card_db: ignore the card DB snapshot)."""
     print("\n" + "=" * 80)
     print("PHASE 3: Database Statistics")
     print("=" * 80 + "\n")
     
     try:
-        manager = CardDataManager()
+        manager = CardDataManager(force_rebuild=rebuild_card_db)
         stats = manager.get_stats()
         
         print(f"Total unique cards:     {stats['total_cards']:,}")
@@ -135,11 +136,18 @@ Examples:
         help='Non-interactive mode (runs all phases)'
     )
     
+    parser.add_argument(
+        '--rebuild-card-db',
+        action='store_true',
+        help='Ignore the card database snapshot and rebuild it from CSV (statistics phase; '
+             'the scraper / merge steps do not open the card database)'
+    )
+    
     args = parser.parse_args()
     
     # Determine what to run
     if args.stats_only:
-        return 0 if show_statistics() else 1
+        return 0 if show_statistics(args.rebuild_card_db) else 1
     
     if args.merge_only:
         return 0 if merge_databases() else 1
@@ -174,7 +182,7 @@ Examples:
     
     # Phase 3: Statistics
     print("\n[Orchestrator] Displaying statistics...")
-    if not show_statistics():
+    if not show_statistics(args.rebuild_card_db):
         print("[Orchestrator] ✗ Statistics failed!")
         return 1
     
@@ -11,6 +11,8 @@ import logging
 from pathlib import Path
 from datetime import datetime
 
+from browser_pool import route_lean
+
 try:
     from playwright.async_api import async_playwright
 except ImportError:
@@ -160,6 +162,7 @@ async def main():
         context = await browser.new_context(
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         )
+        await route_lean(context)  # No images / fonts / media / trackers - only the price text is read
         page = await context.new_page()
         
         # Create output CSV
@@ -5,19 +5,21 @@ Scrapes card usage data from limitlesstcg.com/tournaments
 No external dependencies required - uses only Python standard library
 """
 
-import urllib.request
 import urllib.parse
 import csv
 import re
-import time
 import json
 import os
 import sys
-import html
 import math
+from datetime import datetime
 from html.parser import HTMLParser
 from typing import List, Dict, Optional
 
+from http_cache import parse_page_date
+from http_client import (FetchEngine, LinkCollector, configure_http, feed_page, fetch_page, fetch_summary, get_client,
+                         save_fetch_telemetry, set_content_date)
+
 # Fix Windows console encoding for Unicode characters (✓, ×, •, etc.)
 if sys.platform == 'win32':
     if hasattr(sys.stdout, 'reconfigure'):
@@ -33,18 +35,22 @@ if sys.platform == 'win32':
 
 # Import the reliable card type lookup module
 from card_type_lookup import is_trainer_or_energy, is_valid_card
-from card_scraper_shared import CardDatabaseLookup
+from card_scraper_shared import CardDatabaseLookup, iter_decklist_cards
 
 # Default settings
 DEFAULT_SETTINGS = {
     "max_tournaments": 150,
     "max_decks_per_tournament": 1,
-    "delay_between_tournaments": 0,
     "start_tournament_id": 391,
     "output_file": "tournament_cards_data.csv",
     "format_filter": ["Standard"],
     "tournament_types": ["Regional", "Special Event", "LAIC", "EUIC", "NAIC", "Worlds", "International", "Championship"],
     "append_mode": True,
+    "max_parallel_requests": 4,
+    "requests_per_second": 2.0,
+    "max_requests_per_second": 4.0,
+    "http_cache": True,
+    "cache_immutable_after_days": 14,
     "_comment": "Nur Standard-Format Turniere (Regional, Special Event, LAIC, EUIC, NAIC, Worlds) werden automatisch gescraped. append_mode=True keeps old tournament data."
 }
 
@@ -105,21 +111,6 @@ def load_settings() -> Dict:
         return DEFAULT_SETTINGS.copy()
 
 
-def fetch_page(url: str) -> str:
-    """Fetch a webpage and return its HTML content."""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        req = urllib.request.Request(url, headers=headers)
-        with urllib.request.urlopen(req, timeout=30) as response:
-            html = response.read().decode('utf-8', errors='ignore')
-            print(f"  Fetched {len(html)} bytes")
-            return html
-    except Exception as e:
-        print(f"Error fetching {url}: {e}")
-        return ""
-
 def get_tournament_links(base_url: str, max_tournaments: int, start_tournament_id: int = None) -> List[Dict]:
     """Get tournament links from the main tournaments page with pagination support."""
     print("Fetching tournaments list...")
@@ -143,16 +134,24 @@ def get_tournament_links(base_url: str, max_tournaments: int, start_tournament_i
                 fetch_url = f"{base_url}?show=100&page={page}"
         
         print(f"Loading page {page}... (found {len(tournaments)} so far)")
-        html = fetch_page(fetch_url)
-        if not html:
+        
+        # Parse the page while it downloads and stop once it has enough tournaments
+        # or reached start_tournament_id (the list is sorted newest first)
+        links = LinkCollector(r'^(/tournaments/(\d+))$')
+        wanted = max_tournaments - len(tournaments)
+        
+        def page_complete() -> bool:
+            if start_tournament_id and links.matches and int(links.matches[-1].group(2)) < start_tournament_id:
+                return True
+            return len({match.group(2) for match in links.matches} - seen_ids) >= wanted
+        
+        if not feed_page(fetch_url, links, stop=page_complete) and not links.matches:
             break
         
-        # Parse table rows - each row contains tournament info
-        matches = re.findall(r'href=["\'](/tournaments/(\d+))["\']', html)
         page_tournaments = 0
         
-        for match in matches:
-            path, tournament_id = match
+        for match in links.matches:
+            path, tournament_id = match.groups()
             tournament_id_num = int(tournament_id)
             
             # STOP immediately if we reach start_tournament_id
@@ -434,9 +433,9 @@ def get_tournament_info(tournament_url: str) -> Dict:
     
     return info
 
-def get_deck_options(cards_url: str) -> List[Dict]:
+def get_deck_options(cards_url: str, content_date: Optional[datetime] = None) -> List[Dict]:
     """Extract deck options from the dropdown on the cards page."""
-    html = fetch_page(cards_url)
+    html = fetch_page(cards_url, content_date=content_date)
     if not html:
         return []
     
@@ -503,8 +502,7 @@ def lookup_card_info(card_name: str, retries: int = 3) -> Optional[Dict]:
         try:
             html = fetch_page(search_url)
             if not html:
-                time.sleep(1.0)
-                continue
+                continue  # Pause before the retry comes from the client's rate control
             
             # Strategy 1: Look for data-set and data-number in card container
             # Pattern: <div class="card-list-card" data-set="PAR" data-number="123">
@@ -629,130 +627,82 @@ def lookup_card_info(card_name: str, retries: int = 3) -> Optional[Dict]:
             
         except Exception as e:
             print(f"    Warning: Error looking up {card_name} (attempt {attempt+1}): {e}")
-            if attempt < retries - 1:
-                time.sleep(1.0)
     
     # Cache negative result to avoid repeated lookups
     _card_lookup_cache[card_name] = None
     return None
 
-def extract_cards_from_page(cards_url: str, card_db: CardDatabaseLookup, deck_name: str = None) -> List[Dict]:
+def extract_cards_from_page(cards_url: str, card_db: CardDatabaseLookup, deck_name: str = None,
+                            content_date: Optional[datetime] = None) -> List[Dict]:
     """Extract card data from a tournament's cards page."""
     print(f"Fetching cards from: {cards_url}")
-    html_content = fetch_page(cards_url)
+    html_content = fetch_page(cards_url, content_date=content_date)
     if not html_content:
         return []
+    return parse_cards_page(html_content, card_db)
 
+def parse_cards_page(html_content: str, card_db: CardDatabaseLookup) -> List[Dict]:
+    """Parse the decklist columns of an already fetched cards page."""
     cards: List[Dict] = []
+    entries: List[Dict] = []  # Parsed cards, resolved against the database in one batch
     seen_cards = set()
     cards_to_lookup = []  # Track cards that need lookup
 
-    # Regex patterns
-    heading_pattern = re.compile(r'<div[^>]*class="decklist-column-heading"[^>]*>\s*([^<]+?)\s*</div>', re.IGNORECASE)
-    card_pattern = re.compile(r'<div[^>]*class="decklist-card"[^>]*data-set="([A-Z0-9]*)"[^>]*data-number="(\d*)"[^>]*>.*?<span class="card-count">([0-9.]+)</span>\s*<span class="card-name">([^<]+)</span>', re.IGNORECASE | re.DOTALL)
-
-    # Find all headings with their span (start/end ranges)
-    headings = []
-    for m in heading_pattern.finditer(html_content):
-        title = m.group(1).strip().lower()
-        # Classify section by heading text
-        if 'trainer' in title:
-            section_type = 'trainer'
-        elif 'energy' in title:
-            section_type = 'energy'
-        else:
-            section_type = 'pokemon'
-        headings.append({'start': m.end(), 'type': section_type})
-
-    # Determine end positions for headings
-    for idx in range(len(headings)):
-        start = headings[idx]['start']
-        end = headings[idx + 1]['start'] if idx + 1 < len(headings) else len(html_content)
-        headings[idx]['end'] = end
-
-    # Extract cards per section so we know exact type
-    for sec in headings if headings else [{'start': 0, 'end': len(html_content), 'type': 'pokemon'}]:
-        block = html_content[sec['start']:sec['end']]
-        section_type = sec['type']
-
-        for match in card_pattern.findall(block):
-            try:
-                set_code_raw = match[0].upper() if match[0] else ""
-                card_number_raw = match[1] if match[1] else ""
-                count_str = match[2]
-                name = match[3].strip()
-
-                # Decode HTML entities (e.g., &#039; -> ')
-                name = html.unescape(name)
+    # One pass over the decklist columns; the section comes from the column heading
+    for card in iter_decklist_cards(html_content):
+        name = card.name
+        section_type = card.section
 
-                # Normalize different apostrophe characters to standard ASCII apostrophe
-                name = name.replace(''', "'").replace('`', "'").replace('´', "'").replace(''', "'").replace('ʼ', "'")
+        # IMPORTANT: Validate card name against database before processing
+        # This filters out tournament titles like "CUT WILL GET COAL", "January 2025", etc.
+        if not is_valid_card(name):
+            # Not a valid card - likely tournament title or metadata
+            continue
 
-                # IMPORTANT: Validate card name against database before processing
-                # This filters out tournament titles like "CUT WILL GET COAL", "January 2025", etc.
-                if not is_valid_card(name):
-                    # Not a valid card - likely tournament title or metadata
-                    continue
+        # Fix PR-SV to SVP mapping
+        set_code_raw = card.set_code
+        if section_type == 'pokemon' and set_code_raw == 'PR-SV':
+            set_code_raw = 'SVP'
+
+        entries.append({
+            'name': name,
+            'count': card.count,  # Can be decimal like 3.78
+            'section': section_type,
+            'set_code': set_code_raw if section_type == 'pokemon' else '',
+            'set_number': card.number if section_type == 'pokemon' else ''
+        })
 
-                # Parse count (can be decimal like 3.78)
-                count = float(count_str)
+    # TRUST THE SECTION HEADING from HTML!
+    # Trainer/Energy sections: Latest low-rarity version from database (no set/number if not found)
+    # Pokemon section: ALWAYS keep set/number from scraped data
+    for row in card_db.resolve_decklist(entries):
+        name = row['name']
+        set_code = row['set_code']
+        card_number = row['set_number']
 
-                # TRUST THE SECTION HEADING from HTML!
-                # Trainer/Energy sections: Get latest low-rarity version from database
-                # Pokemon section: ALWAYS include set/number from scraped data
-                
-                if section_type in ['trainer', 'energy']:
-                    # For Trainer/Energy: Get latest low-rarity version from database
-                    latest_card = card_db.get_latest_low_rarity_version(name)
-                    if latest_card:
-                        set_code = latest_card.set_code
-                        card_number = latest_card.number
-                        full_name = f"{name} {set_code} {card_number}"
-                        card_key = f"{name}|{set_code}|{card_number}".lower()
-                        needs_lookup = False
-                    else:
-                        # Fallback if not found in database
-                        set_code = ""
-                        card_number = ""
-                        full_name = name
-                        card_key = name.lower()
-                        needs_lookup = False
-                else:
-                    # For Pokemon: ALWAYS require set/number
-                    set_code = set_code_raw
-                    card_number = card_number_raw
-                    
-                    # Fix PR-SV to SVP mapping
-                    if set_code == 'PR-SV':
-                        set_code = 'SVP'
-                    
-                    # Check if Pokemon card is missing set/number info
-                    if not set_code or not card_number:
-                        # Mark for lookup
-                        cards_to_lookup.append(len(cards))
-                        full_name = name
-                        card_key = name.lower()
-                        needs_lookup = True
-                    else:
-                        full_name = f"{name} {set_code} {card_number}"
-                        card_key = f"{name}|{set_code}|{card_number}".lower()
-                        needs_lookup = False
+        # Pokemon card missing set/number info -> mark for lookup
+        needs_lookup = row['section'] == 'pokemon' and not (set_code and card_number)
 
-                if card_key not in seen_cards and name:
-                    seen_cards.add(card_key)
-                    # Determine if card is an Ace Spec
-                    is_ace_spec = card_db.is_ace_spec_by_name(name)
-                    cards.append({
-                        'count': count,
-                        'name': name,
-                        'set_code': set_code,
-                        'card_number': card_number,
-                        'full_name': full_name,
-                        'needs_lookup': needs_lookup,
-                        'is_ace_spec': 'Yes' if is_ace_spec else 'No'
-                    })
-            except (ValueError, IndexError):
-                continue
+        if set_code and card_number:
+            full_name = f"{name} {set_code} {card_number}"
+            card_key = f"{name}|{set_code}|{card_number}".lower()
+        else:
+            full_name = name
+            card_key = name.lower()
+
+        if card_key not in seen_cards and name:
+            seen_cards.add(card_key)
+            if needs_lookup:
+                cards_to_lookup.append(len(cards))
+            cards.append({
+                'count': row['count'],
+                'name': name,
+                'set_code': set_code,
+                'card_number': card_number,
+                'full_name': full_name,
+                'needs_lookup': needs_lookup,
+                'is_ace_spec': row['is_ace_spec']
+            })
 
     # Lookup missing card info - ONLY for Pokemon cards
     if cards_to_lookup:
@@ -793,7 +743,6 @@ def extract_cards_from_page(cards_url: str, card_db: CardDatabaseLookup, deck_na
                 print(f"✗ NOT FOUND - keeping card anyway: {card['name']}")
             # Update Ace Spec status (in case it wasn't set or needs update)
             card['is_ace_spec'] = 'Yes' if card_db.is_ace_spec_by_name(card['name']) else 'No'
-            time.sleep(0.3)  # Rate limiting
         
         print(f"  Lookup summary: {successful_lookups} found, {failed_lookups} kept without set/number")
 
@@ -902,6 +851,7 @@ def main():
     print("Step 1: Loading settings...")
     try:
         settings = load_settings()
+        configure_http(settings)
     except Exception as e:
         print(f"ERROR: Failed to load settings: {e}")
         import traceback
@@ -910,7 +860,6 @@ def main():
     
     max_tournaments = settings['max_tournaments']
     max_decks = settings.get('max_decks_per_tournament', 1)
-    delay = settings['delay_between_tournaments']
     output_file = settings['output_file']
     start_tournament_id = settings.get('start_tournament_id', None)
     tournament_types = settings.get('tournament_types', ["Regional", "Special Event", "LAIC", "EUIC", "NAIC", "Worlds", "International", "Championship"])
@@ -937,12 +886,14 @@ def main():
     
     base_url = "https://limitlesstcg.com/tournaments"
     all_data = []
+    engine = FetchEngine.from_settings(settings)
     
     print("Starting Limitless TCG Tournament Cards Scraper...")
     print(f"Settings: max_tournaments={max_tournaments}, max_decks_per_tournament={max_decks}")
     if start_tournament_id:
         print(f"Stop at tournament ID: {start_tournament_id} (oldest tournament to include)")
     print(f"Tournament types filter: {', '.join(tournament_types)}")
+    print(f"Parallel requests: {engine.max_workers} ({get_client().rate.describe()})")
     print("=" * 50)
     
     # Get tournament links
@@ -964,6 +915,10 @@ def main():
         tournament['format'] = info['format']
         tournament['meta'] = info.get('meta', '')
         
+        # Pages of finished tournaments are cached for good (see http_cache)
+        tournament_date = parse_page_date(info['date'])
+        set_content_date(tournament['url'], tournament_date)
+        
         # Skip Standard (JP) tournaments - they use different card pool
         if tournament['meta'] == 'Standard (JP)':
             print(f"[SKIP] Standard (JP) tournament: {tournament['name']}")
@@ -988,7 +943,7 @@ def main():
             print(f"     Format: {info['format']}")
         
         # Get deck options from dropdown
-        deck_options = get_deck_options(tournament['cards_url'])
+        deck_options = get_deck_options(tournament['cards_url'], tournament_date)
         decks_to_scrape = deck_options[:max_decks] if deck_options else []
         
         # Add total deck count to tournament name
@@ -1000,11 +955,17 @@ def main():
         if decks_to_scrape:
             print(f"Found {len(deck_options)} deck archetypes, scraping top {len(decks_to_scrape)}")
             
-            for j, deck in enumerate(decks_to_scrape, 1):
-                deck_url = f"{tournament['cards_url']}?deck={deck['data_value']}"
-                print(f"  Deck {j}/{len(decks_to_scrape)}: {deck['deck_name']} ({deck['decklist_count']} lists)")
+            deck_urls = [f"{tournament['cards_url']}?deck={deck['data_value']}" for deck in decks_to_scrape]
+            
+            # Deck pages are fetched in parallel; parsing (incl. card lookups) stays in deck order
+            for outcome in engine.fetch_ordered(deck_urls, tournament_date):
+                deck = decks_to_scrape[outcome.index]
+                print(f"  Deck {outcome.index + 1}/{len(decks_to_scrape)}: {deck['deck_name']} ({deck['decklist_count']} lists)")
+                if not outcome.ok:
+                    print(f"    Fetch failed: {outcome.error}")
+                    continue
                 
-                cards = extract_cards_from_page(deck_url, card_db, deck['deck_name'])
+                cards = parse_cards_page(outcome.text, card_db)
                 
                 # Add deck name to each card
                 for card in cards:
@@ -1014,7 +975,7 @@ def main():
         else:
             # Fallback: just scrape the default page
             print("No deck dropdown found, scraping default page")
-            cards = extract_cards_from_page(tournament['cards_url'], card_db)
+            cards = extract_cards_from_page(tournament['cards_url'], card_db, content_date=tournament_date)
             for card in cards:
                 card['deck_name'] = 'Default'
             all_cards.extend(cards)
@@ -1026,9 +987,6 @@ def main():
         print(f"Found {len(all_cards)} total cards")
         
         all_data.append(tournament)
-        
-        if delay > 0 and i < len(tournaments):
-            time.sleep(delay)
     
     # Save to CSV
     if all_data:
@@ -1044,6 +1002,8 @@ def main():
         print(f"Total cards extracted: {total_cards}")
     else:
         print("No data collected.")
+    print(fetch_summary())
+    save_fetch_telemetry()
 
 if __name__ == "__main__":
     try:
@@ -6,12 +6,10 @@ Reads existing CSV and updates ONLY the international_prints column
 
 import csv
 import sys
-import time
 import os
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+
+from card_enrichment import CardEnrichment
 
 # Set working directory to script location
 # Handle both frozen (PyInstaller) and normal Python execution
@@ -27,54 +25,25 @@ os.chdir(SCRIPT_DIR)
 print(f"Working directory: {os.getcwd()}")
 print()
 
-def create_browser():
-    """Create and configure Chrome WebDriver"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    return webdriver.Chrome(options=chrome_options)
-
-def extract_int_prints(driver, set_code, number):
-    """Extract international prints for a card"""
-    try:
-        # Build URL
-        url = f"https://limitlesstcg.com/cards/{set_code}/{number}"
-        driver.get(url)
-        time.sleep(1)  # Quick wait
-        
-        # Find Int. Prints table links
-        int_prints_links = driver.find_elements(By.CSS_SELECTOR, ".card-prints-versions a[href^='/cards/']")
-        
-        int_prints = set()
-        for link in int_prints_links:
-            href = link.get_attribute('href')
-            if href:
-                path = href.split('/cards/')[-1].strip()
-                parts = path.split('/')
-                
-                # Only process SET/NUMBER format (skip Japanese cards)
-                if len(parts) == 2 and parts[1].replace('-', '').replace('a', '').replace('b', '').isdigit():
-                    card_id = f"{parts[0]}-{parts[1]}"
-                    int_prints.add(card_id)
-        
-        # Always include current card
-        current_id = f"{set_code}-{number}"
-        int_prints.add(current_id)
-        
-        return ','.join(sorted(list(int_prints)))
-    
-    except Exception as e:
-        # Check if it's a session error
-        error_msg = str(e).lower()
-        if 'invalid session' in error_msg or 'session' in error_msg:
-            raise  # Re-raise session errors so they can be handled upstream
-        
-        print(f"    ERROR: {e}")
-        # Fallback to current card only
-        return f"{set_code}-{number}"
+# Page visit settings (card_enrichment; --browser-workers=N overrides browser_workers)
+SETTINGS = {
+    "detail_fetch_mode": "http",  # Plain GET + HTML parsing, Chrome only for pages that fail
+    "max_parallel_requests": 4,
+    "requests_per_second": 2.0,
+    "max_requests_per_second": 4.0,
+    "headless": True,
+    "browser_workers": 2,
+    "browser_page_budget": 1000,  # Restart each browser after 1000 cards to prevent session issues
+    "lean_browser": True,  # No images / fonts / media / trackers, eager page load
+    "detail_page_wait_seconds": 1.0,  # Quick wait
+    "detail_request_delay_seconds": 0.5  # Small delay to be nice to Limitless servers
+}
+
+def save_cards(csv_path, cards):
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['name', 'set', 'number', 'type', 'rarity', 'image_url', 'international_prints', 'cardmarket_url'])
+        writer.writeheader()
+        writer.writerows(cards)
 
 # Main execution
 try:
@@ -96,100 +65,51 @@ try:
     print(f"Loaded {len(cards)} cards")
     print()
 
-    # Create browser
-    print("Starting browser...")
-    driver = create_browser()
-    print("✓ Browser ready")
+    # Skip cards that already have multiple prints
+    todo = []
+    for i, card in enumerate(cards):
+        current_prints = card.get('international_prints', '')
+        if current_prints and ',' in current_prints:
+            print(f"[{i+1}/{len(cards)}] {card['name']} ({card['set']} {card['number']}) - Already has prints: {current_prints}")
+        else:
+            todo.append(card)
     print()
 
-    # Update international prints
-    print("Updating international prints...")
-    print("(This will take a while - ~1-2 seconds per card)")
+    # Update international prints (only this field of the card page)
+    enrichment = CardEnrichment(SETTINGS, fields=('international_prints',), log_prefix="   ")
+    print(f"Updating international prints of {len(todo)} cards...")
     print()
 
-    try:
-        for i, card in enumerate(cards):
-            # Skip if already has multiple prints
-            current_prints = card.get('international_prints', '')
-            if current_prints and ',' in current_prints:
-                print(f"[{i+1}/{len(cards)}] {card['name']} ({card['set']} {card['number']}) - Already has prints: {current_prints}")
-                continue
-            
-            print(f"[{i+1}/{len(cards)}] {card['name']} ({card['set']} {card['number']})...", end='', flush=True)
-            
-            # Extract int. prints (with retry on session error)
-            max_retries = 3
-            for retry in range(max_retries):
-                try:
-                    new_prints = extract_int_prints(driver, card['set'], card['number'])
-                    card['international_prints'] = new_prints
-                    break  # Success!
-                    
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    if 'invalid session' in error_msg or 'session' in error_msg:
-                        print(f"\n    ⚠ Session lost! Restarting browser...")
-                        try:
-                            driver.quit()
-                        except:
-                            pass
-                        driver = create_browser()
-                        print(f"    ✓ Browser restarted, retrying card...")
-                        if retry < max_retries - 1:
-                            continue  # Retry
-                        else:
-                            # Max retries reached, use fallback
-                            print(f"    ✗ Max retries reached, using fallback")
-                            card['international_prints'] = f"{card['set']}-{card['number']}"
-                    else:
-                        # Other error, use fallback
-                        card['international_prints'] = f"{card['set']}-{card['number']}"
-                        break
-            
-            # Show result if multiple prints found
-            if ',' in card['international_prints']:
-                print(f" → {card['international_prints']}")
-            else:
-                print(f" (only {card['international_prints']})")
-            
-            # Progressive save every 100 cards
-            if (i + 1) % 100 == 0:
-                print()
-                print(f"CHECKPOINT: Saving progress ({i+1} cards updated)...")
-                with open(csv_path, 'w', encoding='utf-8', newline='') as f:
-                    writer = csv.DictWriter(f, fieldnames=['name', 'set', 'number', 'type', 'rarity', 'image_url', 'international_prints'])
-                    writer.writeheader()
-                    writer.writerows(cards)
-                print("✓ Saved!")
-                print()
-            
-            # Restart browser every 1000 cards to prevent session issues
-            if (i + 1) % 1000 == 0:
-                print()
-                print(f"🔄 Preventive browser restart after {i+1} cards...")
-                try:
-                    driver.quit()
-                except:
-                    pass
-                driver = create_browser()
-                print("✓ Browser restarted!")
-                print()
-            
-            # Small delay to be nice to Limitless servers
-            time.sleep(0.5)
-
-    finally:
-        driver.quit()
+    for done, item in enumerate(enrichment.run(todo), 1):
+        card = item.card
+        print(f"[{done}/{len(todo)}] {card['name']} ({card['set']} {card['number']})...", end='', flush=True)
+        if not item.ok:
+            # Fallback: current card only
+            print(f"\n    ERROR: {item.error}")
+
+        # Show result if multiple prints found
+        if ',' in card['international_prints']:
+            print(f" → {card['international_prints']}")
+        else:
+            print(f" (only {card['international_prints']})")
+
+        # Progressive save every 100 cards
+        if done % 100 == 0:
+            print()
+            print(f"CHECKPOINT: Saving progress ({done} cards updated)...")
+            save_cards(csv_path, cards)
+            print("✓ Saved!")
+            print()
+
+    print()
+    print(f"Card pages: {enrichment.summary()}")
 
     # Final save
     print()
     print("="*60)
     print("FINAL SAVE")
     print("="*60)
-    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['name', 'set', 'number', 'type', 'rarity', 'image_url', 'international_prints'])
-        writer.writeheader()
-        writer.writerows(cards)
+    save_cards(csv_path, cards)
 
     print(f"✓ Updated {len(cards)} cards")
     print()